@@ -0,0 +1,21 @@
+# Benchmarks
+"""
+Benchmarks dos caminhos de dados do sistema com dados sintéticos.
+
+Um banco SQLite temporário é preenchido com pessoas, demandas, contratos
+(com a distribuição de modalidades e status vista em produção), aditivos,
+produtos e a hierarquia de custeio, na escala pedida; em seguida são
+cronometradas as funções usadas pelas telas (listagens, buscas, totais,
+dashboard, cascatas de custeio) e os scripts de migração da planilha.
+
+Uso:
+    python -m benchmarks --pessoas 5000 --saida resultados.json
+    python -m benchmarks --pessoas 5000 --comparar resultados_anteriores.json
+
+O resultado é gravado em JSON (ver benchmarks.medicao) para que execuções
+de versões diferentes possam ser comparadas.
+
+Os orçamentos de idas ao banco das ações das telas (ver
+benchmarks.orcamentos) são verificados com:
+    python -m benchmarks.orcamentos
+"""
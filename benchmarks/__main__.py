@@ -0,0 +1,167 @@
+# __Main__.Py
+"""
+Executa os benchmarks: python -m benchmarks --help
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import random
+import tempfile
+
+from models.database import configurar, get_connection, init_db
+from models.db_manager import fechar_conexoes
+
+
+def _argumentos():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmarks dos caminhos de dados com dados sintéticos (SQLite)",
+    )
+    parser.add_argument("--pessoas", type=int, default=1000, help="pessoas físicas geradas")
+    parser.add_argument(
+        "--contratos-por-pessoa", type=float, default=1.5, help="média de contratos por pessoa"
+    )
+    parser.add_argument(
+        "--aditivos-por-contrato", type=float, default=0.6, help="média de aditivos por contrato"
+    )
+    parser.add_argument(
+        "--produtos-por-contrato", type=int, default=4, help="máximo de produtos por contrato"
+    )
+    parser.add_argument("--repeticoes", type=int, default=5, help="execuções cronometradas")
+    parser.add_argument("--semente", type=int, default=42, help="semente dos dados")
+    parser.add_argument(
+        "--cenarios", nargs="*", help="nomes dos cenários a executar (padrão: todos)"
+    )
+    parser.add_argument(
+        "--sem-migracao", action="store_true", help="não executa os scripts de migração"
+    )
+    parser.add_argument("--saida", help="arquivo JSON onde gravar os resultados")
+    parser.add_argument("--comparar", help="arquivo JSON de uma execução anterior")
+    parser.add_argument(
+        "--tolerancia",
+        type=float,
+        default=0.10,
+        help="variação relativa considerada ruído na comparação (padrão: 0.10)",
+    )
+    return parser.parse_args()
+
+
+def _preparar_banco(caminho, escala, semente):
+    from benchmarks.dados import preencher_banco
+
+    configurar("sqlite", caminho)
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_db()
+    return preencher_banco(escala, semente)
+
+
+def _amostra_contratos(quantidade, semente):
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id FROM contrato_pf")
+        ids = [linha[0] for linha in cursor.fetchall()]
+    finally:
+        conn.close()
+    return random.Random(semente).sample(ids, min(quantidade, len(ids)))
+
+
+def _preparar_migracao(pasta, escala, semente):
+    """Planilha e banco vazio para os scripts de migração"""
+    from benchmarks.dados import gerar_planilha
+
+    gerar_planilha(os.path.join(pasta, "dados_migrar.xlsx"), escala, semente)
+    configurar("sqlite", os.path.join(pasta, "sisproj_pf.db"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_db()
+
+
+def _imprimir(cenarios):
+    print(f"{'cenário':<32}{'mediana':>12}{'p95':>12}{'mínimo':>12}")
+    for nome, medida in cenarios.items():
+        print(
+            f"{nome:<32}{medida['mediana'] * 1000:>10.1f}ms"
+            f"{medida['p95'] * 1000:>10.1f}ms{medida['minimo'] * 1000:>10.1f}ms"
+        )
+
+
+def _imprimir_comparacao(linhas):
+    print(f"\n{'cenário':<32}{'anterior':>12}{'atual':>12}{'variação':>10}  situação")
+    for nome, anterior, atual, variacao, situacao in linhas:
+        anterior = f"{anterior * 1000:.1f}ms" if anterior is not None else "-"
+        variacao = f"{variacao:+.0%}" if variacao is not None else "-"
+        print(f"{nome:<32}{anterior:>12}{atual * 1000:>10.1f}ms{variacao:>10}  {situacao}")
+
+
+def main():
+    args = _argumentos()
+
+    from benchmarks.dados import Escala
+    from benchmarks.medicao import carregar, comparar, gravar, medir, montar_resultado
+
+    escala = Escala(
+        pessoas=args.pessoas,
+        contratos_por_pessoa=args.contratos_por_pessoa,
+        aditivos_por_contrato=args.aditivos_por_contrato,
+        produtos_por_contrato=args.produtos_por_contrato,
+    )
+    selecionados = set(args.cenarios) if args.cenarios else None
+    pasta_original = os.getcwd()
+    saida = os.path.abspath(args.saida) if args.saida else None
+    referencia = os.path.abspath(args.comparar) if args.comparar else None
+
+    medidas = {}
+    with tempfile.TemporaryDirectory(prefix="sisproj_bench_") as pasta:
+        print(f"Gerando dados sintéticos ({args.pessoas} pessoas)...")
+        linhas = _preparar_banco(os.path.join(pasta, "benchmark.db"), escala, args.semente)
+        print(", ".join(f"{tabela}: {n}" for tabela, n in linhas.items()))
+
+        # Importado depois de configurar o banco: os controllers criam
+        # instâncias que guardam a conexão configurada
+        from benchmarks.cenarios import cenarios_aplicacao, cenarios_migracao
+
+        cenarios = cenarios_aplicacao(_amostra_contratos(50, args.semente))
+
+        pasta_migracao = os.path.join(pasta, "migracao")
+        if not args.sem_migracao:
+            if importlib.util.find_spec("pandas") is None:
+                print("pandas não instalado: cenários de migração ignorados")
+            else:
+                os.makedirs(pasta_migracao)
+                cenarios += cenarios_migracao(pasta_migracao)
+
+        try:
+            for cenario in cenarios:
+                if selecionados is not None and cenario.nome not in selecionados:
+                    continue
+                if cenario.nome.startswith("migracao_") and not os.path.exists(
+                    os.path.join(pasta_migracao, "sisproj_pf.db")
+                ):
+                    print("Preparando a planilha de migração...")
+                    _preparar_migracao(pasta_migracao, escala, args.semente)
+
+                medidas[cenario.nome] = medir(
+                    cenario.funcao, args.repeticoes, cenario.preparar
+                )
+                print(f"  {cenario.nome}: {medidas[cenario.nome]['mediana'] * 1000:.1f}ms")
+        finally:
+            # No Windows a pasta temporária só pode ser removida sem arquivos abertos
+            os.chdir(pasta_original)
+            fechar_conexoes()
+
+    print()
+    _imprimir(medidas)
+    resultado = montar_resultado(escala, linhas, medidas)
+
+    if saida:
+        gravar(resultado, saida)
+        print(f"\nResultados gravados em {saida}")
+
+    if referencia:
+        _imprimir_comparacao(comparar(resultado, carregar(referencia), args.tolerancia))
+
+
+if __name__ == "__main__":
+    main()
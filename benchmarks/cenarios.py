@@ -0,0 +1,182 @@
+# Cenarios.Py
+"""
+Cenários cronometrados: os caminhos de dados usados pelas telas.
+
+Funções com cache aparecem em duas versões: "frio" (o cache é descartado
+antes de cada execução, como na primeira abertura da tela) e "quente".
+"""
+import contextlib
+import io
+import itertools
+import os
+import sys
+from collections import namedtuple
+
+from controllers.contrato_pf_controller import (
+    ConsultaContratos,
+    atualizar_total_contrato,
+    buscar_contrato_por_id,
+    buscar_contratos,
+    listar_contratos,
+    recalcular_totais,
+)
+from controllers.custeio_controller import CusteioController
+from controllers.dashboard_controller import invalidar_estatisticas, obter_estatisticas
+from controllers.pessoa_fisica_controller import buscar_pessoas, pesquisar_pessoas
+from controllers.produto_pf_controller import listar_produtos
+from models.cache import cache_leituras
+from models.indice_pessoas import IndicePessoas, indice_pessoas
+from utils.custeio_utils import CusteioIndex
+from views.contrato_pf.main_view import CAMPOS_GRADE, PROJECAO_GRADE
+
+# Termos digitados nas pesquisas, do mais genérico ao mais específico
+TERMOS_PESQUISA = ("a", "jo", "silva", "maria sou", "000.000.1")
+
+Cenario = namedtuple("Cenario", ("nome", "funcao", "preparar"))
+
+
+def _em_silencio(funcao):
+    """Executa funcao sem exibir as mensagens que ela imprime"""
+
+    def executar():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return funcao()
+
+    return executar
+
+
+def _rodada(funcao, argumentos):
+    """Função que chama funcao com o próximo argumento da lista a cada execução"""
+    proximos = itertools.cycle(argumentos)
+    return lambda: funcao(next(proximos))
+
+
+def _todas(funcao, argumentos):
+    return lambda: [funcao(argumento) for argumento in argumentos]
+
+
+def _cascata_custeio(controller):
+    """Percorre a cascata de custeio como o formulário: cada nível filtra o seguinte"""
+
+    def executar():
+        for instituicao in controller.get_institutions():
+            for projeto in controller.get_projects(instituicao):
+                for ta in controller.get_tas(instituicao, projeto):
+                    for resultado in controller.get_results(instituicao, projeto, ta):
+                        controller.get_subprojects(instituicao, projeto, ta, resultado)
+
+    return executar
+
+
+def cenarios_aplicacao(ids_contratos):
+    """
+    Cenários das telas do sistema, no banco configurado
+
+    Args:
+        ids_contratos (list): Amostra de IDs de contratos para as consultas por ID
+
+    Returns:
+        list: Cenários a cronometrar
+    """
+    custeio = CusteioController()
+
+    def novo_indice_custeio():
+        custeio.manager.index = CusteioIndex(custeio.manager.get_connection)
+
+    def novo_indice_pessoas():
+        return IndicePessoas().carregar()
+
+    grade = listar_contratos(CAMPOS_GRADE)
+
+    return [
+        Cenario("listar_contratos", listar_contratos, None),
+        Cenario("listar_contratos_grade", lambda: listar_contratos(CAMPOS_GRADE), None),
+        # Formatação de até 5000 linhas da grade, sem e com as linhas já projetadas
+        Cenario(
+            "projecao_grade_fria",
+            lambda: PROJECAO_GRADE.linhas(grade[:5000]),
+            PROJECAO_GRADE.invalidar,
+        ),
+        Cenario("projecao_grade_quente", lambda: PROJECAO_GRADE.linhas(grade[:5000]), None),
+        Cenario(
+            "consulta_contratos_pagina",
+            lambda: ConsultaContratos().texto("silva").pagina(0, 100, CAMPOS_GRADE),
+            None,
+        ),
+        Cenario(
+            "consulta_contratos_contar",
+            lambda: ConsultaContratos().texto("silva").status("vigente").contar(),
+            None,
+        ),
+        Cenario("buscar_contratos", _todas(buscar_contratos, TERMOS_PESQUISA), None),
+        Cenario("buscar_pessoas_sql", _todas(buscar_pessoas, TERMOS_PESQUISA), None),
+        Cenario("indice_pessoas_carga", novo_indice_pessoas, None),
+        Cenario(
+            "indice_pessoas_pesquisa",
+            _todas(pesquisar_pessoas, TERMOS_PESQUISA),
+            indice_pessoas.carregar,
+        ),
+        Cenario(
+            "buscar_contrato_por_id_frio",
+            _todas(buscar_contrato_por_id, ids_contratos),
+            cache_leituras.limpar,
+        ),
+        Cenario(
+            "buscar_contrato_por_id_quente",
+            _todas(buscar_contrato_por_id, ids_contratos),
+            None,
+        ),
+        Cenario(
+            "atualizar_total_contrato",
+            _rodada(atualizar_total_contrato, ids_contratos),
+            None,
+        ),
+        Cenario("recalcular_totais", recalcular_totais, None),
+        Cenario("dashboard_frio", obter_estatisticas, invalidar_estatisticas),
+        Cenario("dashboard_quente", obter_estatisticas, None),
+        Cenario("listar_produtos", listar_produtos, None),
+        Cenario("custeio_cascata_frio", _cascata_custeio(custeio), novo_indice_custeio),
+        Cenario("custeio_cascata_quente", _cascata_custeio(custeio), None),
+    ]
+
+
+def cenarios_migracao(pasta):
+    """
+    Cenários dos scripts de migração da planilha (scripts_public)
+
+    Os scripts usam dados_migrar.xlsx e sisproj_pf.db da pasta atual; os
+    cenários mudam para `pasta`, que já deve conter os dois arquivos.
+
+    Args:
+        pasta (str): Pasta com a planilha e o banco de destino
+
+    Returns:
+        list: Cenários a cronometrar
+    """
+    raiz = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    scripts = os.path.join(raiz, "scripts_public")
+    if scripts not in sys.path:
+        sys.path.insert(0, scripts)
+
+    import migrate_dados_planilha as planilha
+    import migrate_produtos_pf as produtos
+
+    def limpar_banco():
+        os.chdir(pasta)
+        _em_silencio(planilha.clean_database)()
+
+    def limpar_produtos():
+        os.chdir(pasta)
+        _em_silencio(produtos.clean_produtos_table)()
+
+    def migrar_cadastros():
+        rejeitados = planilha.RejectCollector()
+        planilha.migrate_pessoa_fisica(rejeitados)
+        planilha.migrate_demanda(rejeitados)
+        planilha.migrate_contrato_pf(rejeitados)
+
+    return [
+        Cenario("migracao_planilha", _em_silencio(migrar_cadastros), limpar_banco),
+        # Executado depois de migracao_planilha, que deixa os contratos no banco
+        Cenario("migracao_produtos", _em_silencio(produtos.migrate_produtos_pf), limpar_produtos),
+    ]
@@ -0,0 +1,438 @@
+# Dados.Py
+"""
+Geração de dados sintéticos para os benchmarks.
+
+Os dados são gravados diretamente com executemany (sem passar pelos
+models), para que a preparação de bancos grandes seja rápida. A geração é
+determinística para uma mesma semente.
+"""
+import random
+from datetime import date, timedelta
+
+from models.database import get_connection
+
+PRIMEIROS_NOMES = [
+    "Ana", "João", "Maria", "José", "Antônio", "Francisca", "Carlos", "Paulo",
+    "Lúcia", "Pedro", "Luís", "Márcia", "Fernanda", "Rafael", "Juliana",
+    "Sérgio", "Patrícia", "André", "Cláudia", "Rogério", "Beatriz", "Thiago",
+    "Letícia", "Gustavo", "Vânia", "Márcio", "Renata", "Fábio", "Aline", "Caio",
+]
+
+SOBRENOMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Lima", "Pereira", "Ferreira",
+    "Alves", "Rodrigues", "Gomes", "Ribeiro", "Martins", "Carvalho", "Araújo",
+    "Melo", "Barbosa", "Conceição", "Rocha", "Dias", "Nascimento", "Andrade",
+    "Moreira", "Nunes", "Marques", "Machado", "Mendes", "Freitas", "Cardoso",
+]
+
+# Distribuições observadas na base de produção: (valor, peso)
+MODALIDADES = [("BOLSA", 45), ("PRODUTO", 30), ("RPA", 15), ("CLT", 10)]
+
+STATUS_CONTRATO = [
+    ("vigente", 35),
+    ("concluido", 25),
+    ("pendente_assinatura", 10),
+    ("em_tramitacao", 10),
+    ("aguardando_autorizacao", 7),
+    ("cancelado", 5),
+    ("rescindido", 5),
+    ("nao_autorizado", 3),
+]
+
+STATUS_PRODUTO = [("programado", 40), ("em_execucao", 20), ("entregue", 35), ("cancelado", 5)]
+
+TIPOS_ADITIVO = [("TEMPO", 50), ("VALOR", 20), ("TEMPO E VALOR", 30)]
+
+# Modalidades que admitem produtos
+MODALIDADES_COM_PRODUTO = ("BOLSA", "PRODUTO", "RPA")
+
+# Linhas por chamada de executemany
+TAMANHO_LOTE = 5000
+
+
+class Escala:
+    """Tamanho do conjunto de dados sintético"""
+
+    def __init__(
+        self,
+        pessoas=1000,
+        contratos_por_pessoa=1.5,
+        aditivos_por_contrato=0.6,
+        produtos_por_contrato=4,
+        instituicoes=8,
+        projetos_por_instituicao=5,
+        tas_por_projeto=4,
+        resultados_por_ta=3,
+        subprojetos_por_resultado=3,
+    ):
+        """
+        Args:
+            pessoas (int): Quantidade de pessoas físicas
+            contratos_por_pessoa (float): Média de contratos por pessoa
+            aditivos_por_contrato (float): Média de aditivos por contrato
+            produtos_por_contrato (int): Máximo de produtos por contrato que
+                admite produtos (cada um recebe de 1 até este valor)
+            instituicoes, projetos_por_instituicao, tas_por_projeto,
+            resultados_por_ta, subprojetos_por_resultado (int): Largura de
+                cada nível da hierarquia de custeio
+        """
+        self.pessoas = pessoas
+        self.contratos_por_pessoa = contratos_por_pessoa
+        self.aditivos_por_contrato = aditivos_por_contrato
+        self.produtos_por_contrato = produtos_por_contrato
+        self.instituicoes = instituicoes
+        self.projetos_por_instituicao = projetos_por_instituicao
+        self.tas_por_projeto = tas_por_projeto
+        self.resultados_por_ta = resultados_por_ta
+        self.subprojetos_por_resultado = subprojetos_por_resultado
+
+    def como_dict(self):
+        """Parâmetros da escala (gravados junto com os resultados)"""
+        return dict(vars(self))
+
+
+def _escolher(aleatorio, distribuicao):
+    valores, pesos = zip(*distribuicao)
+    return aleatorio.choices(valores, weights=pesos)[0]
+
+
+def _quantidade(aleatorio, media):
+    """Quantidade inteira com a média pedida (parte inteira + sorteio da fração)"""
+    inteiro = int(media)
+    return inteiro + (1 if aleatorio.random() < media - inteiro else 0)
+
+
+def _inserir(cursor, sql, linhas):
+    for inicio in range(0, len(linhas), TAMANHO_LOTE):
+        cursor.executemany(sql, linhas[inicio : inicio + TAMANHO_LOTE])
+
+
+def gerar_pessoas(aleatorio, quantidade):
+    """Linhas (nome_completo, cpf, email, telefone, data_cadastro)"""
+    linhas = []
+    for i in range(1, quantidade + 1):
+        nome = " ".join(
+            [aleatorio.choice(PRIMEIROS_NOMES)]
+            + aleatorio.sample(SOBRENOMES, aleatorio.choice((1, 2, 2, 3)))
+        )
+        cpf = f"{i:011d}"
+        cpf = f"{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}"
+        usuario = nome.split()[0].lower() + str(i)
+        telefone = f"(61) 9{aleatorio.randint(1000, 9999)}-{aleatorio.randint(1000, 9999)}"
+        cadastro = date(2020, 1, 1) + timedelta(days=aleatorio.randint(0, 1800))
+        linhas.append((nome, cpf, f"{usuario}@exemplo.gov.br", telefone, cadastro.isoformat()))
+    return linhas
+
+
+def gerar_custeio(escala):
+    """Linhas da hierarquia de custeio (instituição, projeto, TA, resultado, subprojeto)"""
+    linhas = []
+    for i in range(1, escala.instituicoes + 1):
+        instituicao = f"Instituição {i:02d}"
+        for p in range(1, escala.projetos_por_instituicao + 1):
+            projeto = f"PRJ-{i:02d}{p:02d}"
+            for t in range(1, escala.tas_por_projeto + 1):
+                ta = f"TA-{i:02d}{p:02d}{t:02d}"
+                for r in range(1, escala.resultados_por_ta + 1):
+                    resultado = f"Resultado {r}"
+                    for s in range(1, escala.subprojetos_por_resultado + 1):
+                        linhas.append((instituicao, projeto, ta, resultado, f"Subprojeto {r}.{s}"))
+    return linhas
+
+
+def preencher_banco(escala, semente=42):
+    """
+    Preenche o banco configurado (já inicializado com init_db) com dados sintéticos
+
+    Args:
+        escala (Escala): Tamanho do conjunto de dados
+        semente (int): Semente do gerador aleatório
+
+    Returns:
+        dict: Quantidade de linhas gravadas em cada tabela
+    """
+    aleatorio = random.Random(semente)
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        pessoas = gerar_pessoas(aleatorio, escala.pessoas)
+        _inserir(
+            cursor,
+            "INSERT INTO pessoa_fisica (nome_completo, cpf, email, telefone, data_cadastro) "
+            "VALUES (?, ?, ?, ?, ?)",
+            pessoas,
+        )
+
+        custeio = gerar_custeio(escala)
+        _inserir(
+            cursor,
+            "INSERT INTO custeio (instituicao_parceira, cod_projeto, cod_ta, resultado, subprojeto) "
+            "VALUES (?, ?, ?, ?, ?)",
+            custeio,
+        )
+
+        contratos = []
+        demandas = []
+        for id_pessoa in range(1, escala.pessoas + 1):
+            for _ in range(_quantidade(aleatorio, escala.contratos_por_pessoa)):
+                inicio = date(2019, 1, 1) + timedelta(days=aleatorio.randint(0, 2200))
+                meses = aleatorio.choice((6, 12, 12, 12, 24, 36))
+                fim = inicio + timedelta(days=30 * meses)
+                remuneracao = float(aleatorio.randrange(2000, 15000, 50))
+                intersticio = 1 if aleatorio.random() < 0.2 else 0
+                valor_intersticio = remuneracao * 0.1 * intersticio
+                valor_complementar = float(aleatorio.choice((0, 0, 0, 500, 1000)))
+                instituicao, projeto, ta, resultado, subprojeto = aleatorio.choice(custeio)
+
+                demandas.append(
+                    (
+                        (inicio - timedelta(days=aleatorio.randint(15, 90))).isoformat(),
+                        aleatorio.choice(("DPG", "DEX", "GAB", "CGTI")),
+                        (inicio - timedelta(days=aleatorio.randint(1, 15))).isoformat(),
+                        f"OF-{len(demandas) + 1:06d}",
+                        f"00000.{len(demandas) + 1:06d}/2024-00",
+                    )
+                )
+                contratos.append(
+                    (
+                        len(demandas),
+                        id_pessoa,
+                        instituicao,
+                        "TED",
+                        subprojeto,
+                        ta,
+                        projeto,
+                        "Ação 1",
+                        resultado,
+                        "Meta 1",
+                        _escolher(aleatorio, MODALIDADES),
+                        aleatorio.choice(("novo", "novo", "renovacao")),
+                        f"CT-{len(contratos) + 1:06d}/{inicio.year}",
+                        inicio.isoformat(),
+                        fim.isoformat(),
+                        meses,
+                        _escolher(aleatorio, STATUS_CONTRATO),
+                        remuneracao,
+                        intersticio,
+                        valor_intersticio,
+                        valor_complementar,
+                        (remuneracao + valor_intersticio + valor_complementar) * meses,
+                        "Contrato gerado para benchmark. " * aleatorio.randint(0, 20),
+                        aleatorio.choice(("Brasília", "Goiânia", "Recife", "Porto Alegre")),
+                        str(inicio.year),
+                    )
+                )
+
+        _inserir(
+            cursor,
+            "INSERT INTO demanda (data_entrada, solicitante, data_protocolo, oficio, nup_sei) "
+            "VALUES (?, ?, ?, ?, ?)",
+            demandas,
+        )
+        _inserir(
+            cursor,
+            """
+            INSERT INTO contrato_pf (
+                codigo_demanda, id_pessoa_fisica, instituicao, instrumento, subprojeto,
+                ta, pta, acao, resultado, meta, modalidade, natureza_demanda,
+                numero_contrato, vigencia_inicial, vigencia_final, meses, status_contrato,
+                remuneracao, intersticio, valor_intersticio, valor_complementar,
+                total_contrato, observacoes, lotacao, exercicio
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            contratos,
+        )
+
+        aditivos = []
+        produtos = []
+        for id_contrato, contrato in enumerate(contratos, start=1):
+            remuneracao = contrato[17]
+            for _ in range(_quantidade(aleatorio, escala.aditivos_por_contrato)):
+                meses = aleatorio.choice((3, 6, 12))
+                valor = remuneracao * meses
+                aditivos.append(
+                    (
+                        id_contrato,
+                        _escolher(aleatorio, TIPOS_ADITIVO),
+                        f"OF-AD-{len(aditivos) + 1:06d}",
+                        meses,
+                        valor,
+                        remuneracao,
+                        valor,
+                        "Gestor",
+                    )
+                )
+
+            if contrato[10] in MODALIDADES_COM_PRODUTO:
+                quantidade = aleatorio.randint(1, escala.produtos_por_contrato)
+                for numero in range(1, quantidade + 1):
+                    produtos.append(
+                        (
+                            id_contrato,
+                            str(numero),
+                            contrato[13],
+                            "TED",
+                            contrato[14],
+                            _escolher(aleatorio, STATUS_PRODUTO),
+                            f"Produto {numero} do contrato {contrato[12]}",
+                            round(contrato[21] / quantidade, 2),
+                        )
+                    )
+
+        _inserir(
+            cursor,
+            """
+            INSERT INTO aditivo_pf (
+                id_contrato, tipo_aditivo, oficio, meses, valor_aditivo,
+                nova_remuneracao, valor_total_aditivo, responsavel
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            aditivos,
+        )
+        _inserir(
+            cursor,
+            """
+            INSERT INTO produto_pf (
+                id_contrato, numero, data_programada, instrumento,
+                data_entrega, status, titulo, valor
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            produtos,
+        )
+
+        # Valores válidos dos campos de lista (uma coluna por lista)
+        listas = {
+            "exercicio": [str(ano) for ano in range(2019, 2027)],
+            "lotacao": ["Brasília", "Goiânia", "Recife", "Porto Alegre"],
+            "solicitante": ["DPG", "DEX", "GAB", "CGTI"],
+            "modalidade_contrato": [valor for valor, _ in MODALIDADES],
+            "natureza_demanda": ["novo", "renovacao"],
+            "status_contrato": [valor for valor, _ in STATUS_CONTRATO],
+        }
+        colunas = list(listas)
+        _inserir(
+            cursor,
+            f"INSERT INTO lists ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))})",
+            [
+                tuple(listas[coluna][i] if i < len(listas[coluna]) else None for coluna in colunas)
+                for i in range(max(map(len, listas.values())))
+            ],
+        )
+        _inserir(
+            cursor,
+            "INSERT INTO modalidade_contrato (modalidade) VALUES (?)",
+            [(valor,) for valor, _ in MODALIDADES],
+        )
+
+        # Somas dos aditivos mantidas incrementalmente pelo sistema
+        cursor.execute(
+            """
+            INSERT INTO contrato_totals (id_contrato, total_aditivos, qtd_aditivos)
+            SELECT id_contrato, SUM(valor_total_aditivo), COUNT(*)
+            FROM aditivo_pf GROUP BY id_contrato
+            """
+        )
+
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        "pessoa_fisica": len(pessoas),
+        "demanda": len(demandas),
+        "contrato_pf": len(contratos),
+        "aditivo_pf": len(aditivos),
+        "produto_pf": len(produtos),
+        "custeio": len(custeio),
+    }
+
+
+def gerar_planilha(caminho, escala, semente=42):
+    """
+    Grava uma planilha no formato de dados_migrar.xlsx para os scripts de migração
+
+    Tem as abas pessoa_fisica, demanda, contrato_pf e Produto_PF, com
+    variações de grafia nas colunas normalizadas pelos scripts.
+
+    Args:
+        caminho (str): Arquivo .xlsx a gravar
+        escala (Escala): Tamanho do conjunto de dados
+        semente (int): Semente do gerador aleatório
+    """
+    import pandas as pd
+
+    aleatorio = random.Random(semente)
+
+    pessoas = gerar_pessoas(aleatorio, escala.pessoas)
+    abas = {
+        "pessoa_fisica": pd.DataFrame(
+            [(i, *pessoa) for i, pessoa in enumerate(pessoas, start=1)],
+            columns=["id", "nome_completo", "cpf", "email", "telefone", "data_cadastro"],
+        )
+    }
+
+    demandas = []
+    contratos = []
+    produtos = []
+    for id_pessoa in range(1, escala.pessoas + 1):
+        for _ in range(_quantidade(aleatorio, escala.contratos_por_pessoa)):
+            inicio = date(2019, 1, 1) + timedelta(days=aleatorio.randint(0, 2200))
+            meses = aleatorio.choice((6, 12, 24))
+            codigo = len(demandas) + 1
+            demandas.append(
+                (codigo, inicio.strftime("%d/%m/%Y"), "DPG", inicio.isoformat(), f"OF-{codigo}", "")
+            )
+            modalidade = _escolher(aleatorio, MODALIDADES)
+            remuneracao = float(aleatorio.randrange(2000, 15000, 50))
+            contratos.append(
+                (
+                    len(contratos) + 1, codigo, id_pessoa, "Instituição 01", "TED",
+                    "Subprojeto 1.1", "TA-010101", "PRJ-0101", "Ação 1", "Resultado 1",
+                    "Meta 1",
+                    # Grafias variadas, como nas planilhas reais
+                    aleatorio.choice((modalidade, modalidade.lower(), modalidade + "S")),
+                    aleatorio.choice(("Novo", "renovação", "nova")),
+                    f"CT-{len(contratos) + 1:06d}",
+                    inicio.strftime("%d/%m/%Y"),
+                    (inicio + timedelta(days=30 * meses)).strftime("%d/%m/%Y"),
+                    meses,
+                    aleatorio.choice(("Vigente", "concluído", "em tramitação", "pendente")),
+                    remuneracao, 0, 0, 0, remuneracao * meses, "",
+                )
+            )
+            if modalidade in MODALIDADES_COM_PRODUTO:
+                for _ in range(aleatorio.randint(1, escala.produtos_por_contrato)):
+                    produtos.append(
+                        (
+                            len(contratos), inicio.strftime("%d/%m/%Y"), "TED", "",
+                            aleatorio.choice(("Programado", "entregue", "em execução")),
+                            "Produto", remuneracao,
+                        )
+                    )
+
+    abas["demanda"] = pd.DataFrame(
+        demandas,
+        columns=["codigo", "data_entrada", "solicitante", "data_protocolo", "oficio", "nup_sei"],
+    )
+    abas["contrato_pf"] = pd.DataFrame(
+        contratos,
+        columns=[
+            "id", "codigo_demanda", "id_pessoa_fisica", "instituicao", "instrumento",
+            "subprojeto", "ta", "pta", "acao", "resultado", "meta", "modalidade",
+            "natureza_demanda", "numero_contrato", "vigencia_inicial", "vigencia_final",
+            "meses", "status_contrato", "remuneracao", "intersticio", "valor_intersticio",
+            "valor_complementar", "total_contrato", "observacoes",
+        ],
+    )
+    abas["Produto_PF"] = pd.DataFrame(
+        produtos,
+        columns=[
+            "id_contrato", "data_programada", "instrumento", "data_entrega", "status",
+            "titulo", "VALOR DAS PARCELAS",
+        ],
+    )
+
+    with pd.ExcelWriter(caminho) as planilha:
+        for nome, df in abas.items():
+            df.to_excel(planilha, sheet_name=nome, index=False)
@@ -0,0 +1,149 @@
+# Medicao.Py
+"""
+Cronometragem dos cenários e gravação/comparação dos resultados em JSON.
+
+Formato do arquivo de resultados:
+    {
+        "executado_em": "2025-06-08T10:00:00",
+        "ambiente": {"python": ..., "plataforma": ..., "commit": ...},
+        "escala": {...},          # parâmetros de benchmarks.dados.Escala
+        "linhas": {...},          # linhas geradas por tabela
+        "cenarios": {
+            "<nome>": {"repeticoes": n, "minimo": s, "mediana": s,
+                       "media": s, "p95": s, "maximo": s},
+            ...
+        }
+    }
+
+Os tempos estão em segundos.
+"""
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime
+
+
+def percentil(valores, fracao):
+    """Percentil por interpolação linear (fracao entre 0 e 1)"""
+    ordenados = sorted(valores)
+    if not ordenados:
+        return 0.0
+    posicao = (len(ordenados) - 1) * fracao
+    abaixo = int(posicao)
+    acima = min(abaixo + 1, len(ordenados) - 1)
+    return ordenados[abaixo] + (ordenados[acima] - ordenados[abaixo]) * (posicao - abaixo)
+
+
+def medir(funcao, repeticoes=5, preparar=None, aquecimento=1):
+    """
+    Cronometra funcao() várias vezes
+
+    Args:
+        funcao: Função a cronometrar (sem argumentos)
+        repeticoes (int): Execuções cronometradas
+        preparar: Função chamada antes de cada execução, fora da cronometragem
+            (ex.: limpar um cache para medir o caminho frio)
+        aquecimento (int): Execuções descartadas antes da cronometragem
+
+    Returns:
+        dict: repeticoes, minimo, mediana, media, p95 e maximo (segundos)
+    """
+    for _ in range(aquecimento):
+        if preparar is not None:
+            preparar()
+        funcao()
+
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    return {
+        "repeticoes": repeticoes,
+        "minimo": min(tempos),
+        "mediana": statistics.median(tempos),
+        "media": statistics.fmean(tempos),
+        "p95": percentil(tempos, 0.95),
+        "maximo": max(tempos),
+    }
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def montar_resultado(escala, linhas, cenarios):
+    """Monta o documento de resultados (ver formato no início do módulo)"""
+    return {
+        "executado_em": datetime.now().replace(microsecond=0).isoformat(),
+        "ambiente": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "commit": _commit_atual(),
+        },
+        "escala": escala.como_dict(),
+        "linhas": linhas,
+        "cenarios": cenarios,
+    }
+
+
+def gravar(resultado, caminho):
+    """Grava os resultados em JSON"""
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+
+
+def carregar(caminho):
+    """Lê um arquivo de resultados gravado por gravar()"""
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def comparar(atual, anterior, tolerancia=0.10):
+    """
+    Compara as medianas de duas execuções
+
+    Args:
+        atual (dict): Resultado desta execução
+        anterior (dict): Resultado de referência
+        tolerancia (float): Variação relativa abaixo da qual a diferença é
+            considerada ruído
+
+    Returns:
+        list: Tuplas (cenário, mediana anterior, mediana atual, variação,
+            situação), onde situação é "regressão", "melhoria", "estável"
+            ou "novo"
+    """
+    if anterior.get("escala") != atual.get("escala"):
+        print("Aviso: as execuções comparadas usaram escalas diferentes.")
+
+    linhas = []
+    for nome, medida in atual["cenarios"].items():
+        referencia = anterior.get("cenarios", {}).get(nome)
+        if referencia is None or not referencia.get("mediana"):
+            linhas.append((nome, None, medida["mediana"], None, "novo"))
+            continue
+
+        variacao = medida["mediana"] / referencia["mediana"] - 1
+        if variacao > tolerancia:
+            situacao = "regressão"
+        elif variacao < -tolerancia:
+            situacao = "melhoria"
+        else:
+            situacao = "estável"
+        linhas.append((nome, referencia["mediana"], medida["mediana"], variacao, situacao))
+
+    return linhas
@@ -0,0 +1,174 @@
+# Orcamentos.Py
+"""
+Orçamentos de idas ao banco das ações das telas.
+
+Cada ação simula o que a tela faz (as mesmas chamadas de controller, na
+mesma ordem) e tem um máximo de idas ao banco. Uma ação que passa do
+máximo indica um N+1 ou uma consulta nova no caminho de dados; o
+relatório mostra as instruções repetidas e de onde vieram.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.orcamentos
+    python -m benchmarks.orcamentos --detalhar
+
+Sai com código 1 se algum orçamento for excedido.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+from collections import namedtuple
+
+from models.database import configurar, init_db
+from models.db_manager import fechar_conexoes
+from models.orcamento import OrcamentoExcedido, orcamento_consultas
+
+# (nome, máximo de idas ao banco, função, preparar)
+Acao = namedtuple("Acao", ("nome", "maximo", "funcao", "preparar"))
+
+
+def _primeiro_contrato(modalidade):
+    from controllers.contrato_pf_controller import ConsultaContratos
+
+    contratos = ConsultaContratos().modalidade(modalidade).pagina(0, 1, ["id"])
+    return contratos[0].id
+
+
+def acoes():
+    """
+    Ações das telas com os respectivos orçamentos, no banco configurado
+
+    Returns:
+        list: Ações a verificar
+    """
+    from controllers.aditivo_pf_controller import adicionar_aditivo, listar_aditivos_por_contrato
+    from controllers.contrato_pf_controller import (
+        adicionar_contrato,
+        buscar_contrato_por_id,
+        listar_contratos,
+    )
+    from controllers.dashboard_controller import invalidar_estatisticas, obter_estatisticas
+    from controllers.demanda_controller import buscar_demanda_por_id
+    from controllers.pessoa_fisica_controller import buscar_pessoa_por_id
+    from controllers.produto_pf_controller import adicionar_produto, listar_produtos_por_contrato
+    from models.cache import cache_leituras
+    from views.contrato_pf.main_view import CAMPOS_GRADE
+
+    id_produto = _primeiro_contrato("PRODUTO")
+    id_clt = _primeiro_contrato("CLT")
+
+    def abrir_formulario():
+        # ContratoPFForm em modo de edição: contrato, pessoa, demanda,
+        # produtos e aditivos
+        contrato = buscar_contrato_por_id(id_produto)
+        buscar_pessoa_por_id(contrato.id_pessoa_fisica)
+        buscar_demanda_por_id(contrato.codigo_demanda)
+        listar_produtos_por_contrato(id_produto)
+        listar_aditivos_por_contrato(id_produto)
+
+    def salvar_contrato():
+        adicionar_contrato(
+            1, 1, "Instituição 01", "TED", "Subprojeto 1.1", "TA-010101", "PRJ-0101",
+            "", "Resultado 1", "", "BOLSA", "novo", "CT-ORC", "01/01/2025", "31/12/2025",
+            12, "vigente", 5000.0, 0, 0, 0, 0, "", "Brasília", "2025",
+        )
+
+    def salvar_produto():
+        adicionar_produto(id_produto, None, "01/03/2025", "TED", None, "programado", "Relatório", 1500.0)
+
+    def salvar_aditivo():
+        adicionar_aditivo(id_clt, "TEMPO E VALOR", meses=6, valor_total_aditivo=12000.0)
+
+    return [
+        # A grade é carregada numa única consulta, com ou sem cache
+        Acao("carregar_grade_contratos", 1, lambda: listar_contratos(CAMPOS_GRADE), None),
+        Acao("abrir_formulario_contrato", 5, abrir_formulario, cache_leituras.limpar),
+        # Contrato e pessoa saem do cache de leituras; a demanda (sem cache)
+        # e as listas de produtos e aditivos vão ao banco
+        Acao("abrir_formulario_contrato_cache", 3, abrir_formulario, None),
+        Acao("tabela_produtos", 1, lambda: listar_produtos_por_contrato(id_produto), None),
+        # Assinatura e carga das listas (uma vez por versão) + INSERT
+        Acao("salvar_contrato", 3, salvar_contrato, None),
+        Acao("salvar_contrato_listas_em_cache", 1, salvar_contrato, None),
+        # Número do produto pela sequência do contrato (a primeira
+        # reserva cria a linha da sequência)
+        Acao("salvar_produto_primeiro", 6, salvar_produto, None),
+        Acao("salvar_produto", 4, salvar_produto, None),
+        # INSERT, soma incremental e total do contrato (o primeiro aditivo
+        # cria a linha de contrato_totals)
+        Acao("salvar_aditivo_primeiro", 6, salvar_aditivo, None),
+        Acao("salvar_aditivo", 4, salvar_aditivo, None),
+        Acao("dashboard", 3, obter_estatisticas, invalidar_estatisticas),
+        Acao("dashboard_cache", 0, obter_estatisticas, None),
+    ]
+
+
+def verificar(lista, detalhar=False):
+    """
+    Executa as ações e compara com os orçamentos
+
+    Args:
+        lista (list): Ações (ver acoes())
+        detalhar (bool): Imprime a sequência de instruções de todas as ações
+
+    Returns:
+        list: Relatórios dos orçamentos excedidos
+    """
+    excedidos = []
+    for acao in lista:
+        if acao.preparar:
+            acao.preparar()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                with orcamento_consultas(acao.maximo, acao.nome) as contagem:
+                    acao.funcao()
+        except OrcamentoExcedido as erro:
+            excedidos.append(str(erro))
+            situacao = "EXCEDIDO"
+        else:
+            situacao = "ok"
+
+        print(f"{acao.nome:<36}{contagem.total:>4} / {acao.maximo:<4}{situacao}")
+        if detalhar:
+            print(contagem.relatorio(acao.maximo))
+            print()
+    return excedidos
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.orcamentos",
+        description="Verifica os orçamentos de idas ao banco das ações das telas",
+    )
+    parser.add_argument("--pessoas", type=int, default=200, help="pessoas físicas geradas")
+    parser.add_argument("--semente", type=int, default=42, help="semente dos dados")
+    parser.add_argument(
+        "--detalhar", action="store_true", help="imprime as instruções de todas as ações"
+    )
+    args = parser.parse_args()
+
+    from benchmarks.dados import Escala, preencher_banco
+
+    with tempfile.TemporaryDirectory(prefix="sisproj_orc_") as pasta:
+        configurar("sqlite", os.path.join(pasta, "orcamentos.db"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            init_db()
+        preencher_banco(Escala(pessoas=args.pessoas), args.semente)
+
+        try:
+            print(f"{'ação':<36}{'idas / máximo':<15}")
+            excedidos = verificar(acoes(), args.detalhar)
+        finally:
+            fechar_conexoes()
+
+    for relatorio in excedidos:
+        print()
+        print(relatorio)
+
+    return 1 if excedidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
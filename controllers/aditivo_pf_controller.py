@@ -7,8 +7,11 @@ from models.aditivo_pf_model import (
     update_aditivo_pf,
     delete_aditivo_pf,
 )
+from models.contrato_pf_model import update_total_contrato
+from models.database import transacao
 from utils.session import Session
 from utils.logger import log_action
+from controllers.dashboard_controller import invalidar_estatisticas
 
 
 def adicionar_aditivo(
@@ -82,38 +85,45 @@ def adicionar_aditivo(
         if meses:
             meses = int(meses)
 
-        id_aditivo = create_aditivo_pf(
-            id_contrato,
-            tipo_aditivo,
-            oficio,
-            data_entrada,
-            data_protocolo,
-            instituicao,
-            instrumento,
-            subprojeto,
-            ta,
-            pta,
-            acao,
-            resultado,
-            meta,
-            vigencia_final,
-            meses,
-            valor_aditivo,
-            vigencia_inicial,
-            nova_remuneracao,
-            diferenca_remuneracao,
-            valor_complementar,
-            valor_total_aditivo,
-            responsavel,
-        )
-
-        # Registrar a ação no log
-        usuario = Session.get_user()
-        if usuario:
-            log_action(
-                usuario[1], f"Cadastro de Aditivo PF para Contrato ID: {id_contrato}"
+        # Aditivo, recálculo do total do contrato e log em um único commit
+        with transacao():
+            id_aditivo = create_aditivo_pf(
+                id_contrato,
+                tipo_aditivo,
+                oficio,
+                data_entrada,
+                data_protocolo,
+                instituicao,
+                instrumento,
+                subprojeto,
+                ta,
+                pta,
+                acao,
+                resultado,
+                meta,
+                vigencia_final,
+                meses,
+                valor_aditivo,
+                vigencia_inicial,
+                nova_remuneracao,
+                diferenca_remuneracao,
+                valor_complementar,
+                valor_total_aditivo,
+                responsavel,
             )
 
+            # Recalcular o total do contrato com o novo aditivo
+            update_total_contrato(id_contrato)
+
+            # Registrar a ação no log
+            usuario = Session.get_user()
+            if usuario:
+                log_action(
+                    usuario[1], f"Cadastro de Aditivo PF para Contrato ID: {id_contrato}"
+                )
+
+        invalidar_estatisticas()
+
         return id_aditivo
 
     except Exception as e:
@@ -121,27 +131,31 @@ def adicionar_aditivo(
         raise Exception(f"Erro ao adicionar aditivo: {str(e)}")
 
 
-def listar_aditivos():
+def listar_aditivos(campos=None):
     """
     Lista todos os aditivos
 
+    Args:
+        campos (iterable, optional): Campos que a tela exibe (padrão: todos)
+
     Returns:
         list: Lista de aditivos
     """
-    return get_all_aditivos_pf()
+    return get_all_aditivos_pf(campos)
 
 
-def listar_aditivos_por_contrato(id_contrato):
+def listar_aditivos_por_contrato(id_contrato, campos=None):
     """
     Lista os aditivos de um contrato específico
 
     Args:
         id_contrato (int): ID do contrato
+        campos (iterable, optional): Campos que a tela exibe (padrão: todos)
 
     Returns:
         list: Lista de aditivos do contrato
     """
-    return get_aditivos_by_contrato(id_contrato)
+    return get_aditivos_by_contrato(id_contrato, campos)
 
 
 def buscar_aditivo_por_id(id_aditivo):
@@ -205,35 +219,42 @@ def editar_aditivo(
         if meses:
             meses = int(meses)
 
-        update_aditivo_pf(
-            id_aditivo,
-            tipo_aditivo,
-            oficio,
-            data_entrada,
-            data_protocolo,
-            instituicao,
-            instrumento,
-            subprojeto,
-            ta,
-            pta,
-            acao,
-            resultado,
-            meta,
-            vigencia_final,
-            meses,
-            valor_aditivo,
-            vigencia_inicial,
-            nova_remuneracao,
-            diferenca_remuneracao,
-            valor_complementar,
-            valor_total_aditivo,
-            responsavel,
-        )
-
-        # Registrar a ação no log
-        usuario = Session.get_user()
-        if usuario:
-            log_action(usuario[1], f"Edição de Aditivo PF ID: {id_aditivo}")
+        # Aditivo, recálculo do total do contrato e log em um único commit
+        with transacao():
+            id_contrato = update_aditivo_pf(
+                id_aditivo,
+                tipo_aditivo,
+                oficio,
+                data_entrada,
+                data_protocolo,
+                instituicao,
+                instrumento,
+                subprojeto,
+                ta,
+                pta,
+                acao,
+                resultado,
+                meta,
+                vigencia_final,
+                meses,
+                valor_aditivo,
+                vigencia_inicial,
+                nova_remuneracao,
+                diferenca_remuneracao,
+                valor_complementar,
+                valor_total_aditivo,
+                responsavel,
+            )
+
+            # Recalcular o total do contrato com o aditivo alterado
+            update_total_contrato(id_contrato)
+
+            # Registrar a ação no log
+            usuario = Session.get_user()
+            if usuario:
+                log_action(usuario[1], f"Edição de Aditivo PF ID: {id_aditivo}")
+
+        invalidar_estatisticas()
 
     except ValueError as e:
         # Repassar a exceção para ser tratada na view
@@ -248,12 +269,19 @@ def excluir_aditivo(id_aditivo):
         id_aditivo (int): ID do aditivo
     """
     try:
-        delete_aditivo_pf(id_aditivo)
+        # Exclusão, recálculo do total do contrato e log em um único commit
+        with transacao():
+            id_contrato = delete_aditivo_pf(id_aditivo)
+
+            # Recalcular o total do contrato sem o aditivo excluído
+            update_total_contrato(id_contrato)
+
+            # Registrar a ação no log
+            usuario = Session.get_user()
+            if usuario:
+                log_action(usuario[1], f"Exclusão de Aditivo PF ID: {id_aditivo}")
 
-        # Registrar a ação no log
-        usuario = Session.get_user()
-        if usuario:
-            log_action(usuario[1], f"Exclusão de Aditivo PF ID: {id_aditivo}")
+        invalidar_estatisticas()
 
     except ValueError as e:
         # Repassar a exceção para ser tratada na view
@@ -9,10 +9,16 @@ from models.contrato_pf_model import (
     delete_contrato_pf,
     search_contratos_pf,
     update_total_contrato,
+    recalcular_todos_totais,
+    carregar_observacoes,
+    EXPRESSOES,
 )
-from models.db_manager_access import get_connection
+from models.database import get_connection, get_dialeto
+from models.datas import data_iso
+from models.registros import ContratoPF, projecao, registros
 from utils.session import Session
 from utils.logger import log_action
+from controllers.dashboard_controller import invalidar_estatisticas
 
 
 def adicionar_contrato(
@@ -126,6 +132,7 @@ def adicionar_contrato(
             lotacao,
             exercicio,
         )
+        invalidar_estatisticas()
 
         # Registrar a ação no log
         usuario = Session.get_user()
@@ -142,48 +149,180 @@ def adicionar_contrato(
         raise Exception(f"Erro ao adicionar contrato: {str(e)}")
 
 
-def listar_contratos():
+# Colunas de texto percorridas pela pesquisa livre
+_COLUNAS_PESQUISA = (
+    "p.nome_completo",
+    "c.numero_contrato",
+    "c.modalidade",
+    "c.status_contrato",
+    "c.natureza_demanda",
+    "c.instituicao",
+    "c.instrumento",
+    "c.subprojeto",
+    "c.ta",
+    "c.pta",
+    "c.acao",
+    "c.resultado",
+    "c.meta",
+    "c.vigencia_inicial",
+    "c.vigencia_final",
+    "c.lotacao",
+    "c.exercicio",
+)
+
+
+class ConsultaContratos:
+    """
+    Monta a listagem de contratos com filtros e paginação executados no banco
+
+    Cada filtro vira uma condição WHERE parametrizada; valores vazios ou
+    "Todos" são ignorados. Exemplo:
+
+        consulta = ConsultaContratos().modalidade("BOLSA").valor_minimo(1000)
+        total = consulta.contar()
+        contratos = consulta.pagina(0, 100)
+    """
+
+    def __init__(self):
+        self._condicoes = []
+        self._params = []
+
+    def _adicionar(self, condicao, *params):
+        self._condicoes.append(condicao)
+        self._params.extend(params)
+        return self
+
+    def texto(self, termo):
+        """Filtra pelo termo em qualquer coluna de texto do contrato ou no nome"""
+        termo = (termo or "").strip()
+        if not termo:
+            return self
+
+        condicao = " OR ".join(f"{coluna} LIKE ?" for coluna in _COLUNAS_PESQUISA)
+        return self._adicionar(
+            f"({condicao})", *([f"%{termo}%"] * len(_COLUNAS_PESQUISA))
+        )
+
+    def modalidade(self, modalidade):
+        """Filtra pela modalidade exata"""
+        if not modalidade or modalidade == "Todos":
+            return self
+        return self._adicionar("c.modalidade = ?", modalidade)
+
+    def status(self, status):
+        """Filtra pelo status exato"""
+        if not status or status == "Todos":
+            return self
+        return self._adicionar("c.status_contrato = ?", status)
+
+    def vigencia(self, inicio=None, fim=None):
+        """
+        Filtra pelo período de vigência
+
+        Args:
+            inicio (str, optional): Vigência inicial mínima (DD/MM/AAAA ou AAAA-MM-DD)
+            fim (str, optional): Vigência final máxima (DD/MM/AAAA ou AAAA-MM-DD)
+
+        Raises:
+            ValueError: Se uma das datas for inválida
+        """
+        inicio = data_iso(inicio)
+        if inicio:
+            self._adicionar("c.vigencia_inicial >= ?", inicio)
+
+        fim = data_iso(fim)
+        if fim:
+            self._adicionar("c.vigencia_final <= ?", fim)
+
+        return self
+
+    def valor_minimo(self, valor):
+        """Filtra contratos com valor total maior ou igual ao informado"""
+        if valor is None or valor == "":
+            return self
+
+        total = get_dialeto().coalesce("c.total_contrato", 0)
+        return self._adicionar(f"{total} >= ?", float(valor))
+
+    def _from_where(self):
+        clausula = get_dialeto().juntar(
+            "contrato_pf AS c",
+            [("LEFT JOIN", "pessoa_fisica AS p", "c.id_pessoa_fisica = p.id")],
+        )
+        consulta = f"FROM {clausula}"
+        if self._condicoes:
+            consulta += " WHERE " + " AND ".join(self._condicoes)
+        return consulta
+
+    def contar(self):
+        """
+        Returns:
+            int: Quantidade de contratos que atendem aos filtros
+        """
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(f"SELECT COUNT(*) {self._from_where()}", self._params)
+            return int(cursor.fetchone()[0])
+        except Exception as e:
+            raise Exception(f"Erro ao contar contratos: {str(e)}")
+        finally:
+            conn.close()
+
+    def pagina(self, numero, tamanho, campos=None):
+        """
+        Busca uma página de contratos ordenados por ID
+
+        Args:
+            numero (int): Número da página, começando em 0
+            tamanho (int): Quantidade de contratos por página
+            campos (iterable, optional): Campos que a tela exibe (padrão: todos)
+
+        Returns:
+            list: Contratos da página (mesmo formato de listar_contratos)
+        """
+        tipo, selecao = projecao(ContratoPF, EXPRESSOES, campos)
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        try:
+            consulta = f"SELECT {selecao} {self._from_where()} ORDER BY c.id"
+            contratos = get_dialeto().paginar(
+                cursor, consulta, self._params, tamanho, numero * tamanho
+            )
+            return registros(tipo, contratos)
+        except Exception as e:
+            raise Exception(f"Erro ao listar contratos: {str(e)}")
+        finally:
+            conn.close()
+
+
+def listar_contratos(campos=None):
     """
     Lista todos os contratos
 
+    Args:
+        campos (iterable, optional): Campos que a tela exibe (padrão: todos)
+
     Returns:
-        list: Lista de tuplas com os contratos
+        list: Registros ContratoPF (parciais, se campos for informado)
     """
+    tipo, selecao = projecao(ContratoPF, EXPRESSOES, campos)
     conn = get_connection()
     cursor = conn.cursor()
 
     try:
         # Buscar contratos com nome da pessoa
         cursor.execute(
-            """
-            SELECT c.id, c.codigo_demanda, c.id_pessoa_fisica, c.instituicao, c.instrumento, 
-                   c.subprojeto, c.ta, c.pta, c.acao, c.resultado, c.meta, c.modalidade, 
-                   c.natureza_demanda, c.numero_contrato, c.vigencia_inicial, c.vigencia_final, 
-                   c.meses, c.status_contrato, c.remuneracao, c.intersticio, c.valor_intersticio, 
-                   c.valor_complementar, c.total_contrato, c.observacoes, c.lotacao, c.exercicio,
-                   p.nome_completo
+            f"""
+            SELECT {selecao}
             FROM contrato_pf c
             LEFT JOIN pessoa_fisica p ON c.id_pessoa_fisica = p.id
             ORDER BY c.id DESC
             """
         )
-        contratos = cursor.fetchall()
-
-        # Converter para lista para poder modificar
-        contratos = [list(contrato) for contrato in contratos]
-
-        # Formatar valores monetários
-        for contrato in contratos:
-            if contrato[18] is not None:  # remuneracao
-                contrato[18] = float(contrato[18])
-            if contrato[20] is not None:  # valor_intersticio
-                contrato[20] = float(contrato[20])
-            if contrato[21] is not None:  # valor_complementar
-                contrato[21] = float(contrato[21])
-            if contrato[22] is not None:  # total_contrato
-                contrato[22] = float(contrato[22])
-
-        return contratos
+        return registros(tipo, cursor.fetchall())
 
     except Exception as e:
         raise Exception(f"Erro ao listar contratos: {str(e)}")
@@ -191,30 +330,32 @@ def listar_contratos():
         conn.close()
 
 
-def listar_contratos_por_pessoa(id_pessoa_fisica):
+def listar_contratos_por_pessoa(id_pessoa_fisica, campos=None):
     """
     Lista os contratos de uma pessoa física específica
 
     Args:
         id_pessoa_fisica (int): ID da pessoa física
+        campos (iterable, optional): Campos que a tela exibe (padrão: todos)
 
     Returns:
         list: Lista de contratos da pessoa
     """
-    return get_contratos_by_pessoa(id_pessoa_fisica)
+    return get_contratos_by_pessoa(id_pessoa_fisica, campos)
 
 
-def listar_contratos_por_demanda(codigo_demanda):
+def listar_contratos_por_demanda(codigo_demanda, campos=None):
     """
     Lista os contratos vinculados a uma demanda específica
 
     Args:
         codigo_demanda (int): Código da demanda
+        campos (iterable, optional): Campos que a tela exibe (padrão: todos)
 
     Returns:
         list: Lista de contratos da demanda
     """
-    return get_contratos_by_demanda(codigo_demanda)
+    return get_contratos_by_demanda(codigo_demanda, campos)
 
 
 def buscar_contrato_por_id(id_contrato):
@@ -225,49 +366,28 @@ def buscar_contrato_por_id(id_contrato):
         id_contrato (int): ID do contrato
 
     Returns:
-        tuple: Dados do contrato ou None se não encontrado
+        ContratoPF: Dados do contrato ou None se não encontrado
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-
     try:
-        # Buscar contrato com nome da pessoa
-        cursor.execute(
-            """
-            SELECT c.id, c.codigo_demanda, c.id_pessoa_fisica, c.instituicao, c.instrumento, 
-                   c.subprojeto, c.ta, c.pta, c.acao, c.resultado, c.meta, c.modalidade, 
-                   c.natureza_demanda, c.numero_contrato, c.vigencia_inicial, c.vigencia_final, 
-                   c.meses, c.status_contrato, c.remuneracao, c.intersticio, c.valor_intersticio, 
-                   c.valor_complementar, c.total_contrato, c.observacoes, c.lotacao, c.exercicio,
-                   p.nome_completo
-            FROM contrato_pf c
-            LEFT JOIN pessoa_fisica p ON c.id_pessoa_fisica = p.id
-            WHERE c.id = ?
-            """,
-            (id_contrato,),
-        )
-        contrato = cursor.fetchone()
-
-        if contrato:
-            # Converter para lista para poder modificar
-            contrato = list(contrato)
-            
-            # Formatar valores monetários
-            if contrato[18] is not None:  # remuneracao
-                contrato[18] = float(contrato[18])
-            if contrato[20] is not None:  # valor_intersticio
-                contrato[20] = float(contrato[20])
-            if contrato[21] is not None:  # valor_complementar
-                contrato[21] = float(contrato[21])
-            if contrato[22] is not None:  # total_contrato
-                contrato[22] = float(contrato[22])
-
-        return contrato
-
+        return get_contrato_by_id(id_contrato)
     except Exception as e:
         raise Exception(f"Erro ao buscar contrato: {str(e)}")
-    finally:
-        conn.close()
+
+
+def buscar_observacoes_contrato(id_contrato):
+    """
+    Busca as observações de um contrato (carregadas sob demanda pelos formulários)
+
+    Args:
+        id_contrato (int): ID do contrato
+
+    Returns:
+        str: Observações do contrato
+    """
+    try:
+        return carregar_observacoes(id_contrato)
+    except Exception as e:
+        raise Exception(f"Erro ao buscar observações do contrato: {str(e)}")
 
 
 def editar_contrato(
@@ -384,6 +504,7 @@ def editar_contrato(
             lotacao,
             exercicio,
         )
+        invalidar_estatisticas()
 
         # Registrar a ação no log
         usuario = Session.get_user()
@@ -410,11 +531,10 @@ def excluir_contrato(id_contrato):
     try:
         # Buscar o número do contrato antes de excluir (para o log)
         contrato = get_contrato_by_id(id_contrato)
-        numero_contrato = (
-            contrato[13] if contrato and len(contrato) > 13 else f"ID: {id_contrato}"
-        )
+        numero_contrato = contrato.numero_contrato if contrato else f"ID: {id_contrato}"
 
         delete_contrato_pf(id_contrato)
+        invalidar_estatisticas()
 
         # Registrar a ação no log
         usuario = Session.get_user()
@@ -447,6 +567,7 @@ def atualizar_total_contrato(id_contrato):
         id_contrato (int): ID do contrato
     """
     update_total_contrato(id_contrato)
+    invalidar_estatisticas()
 
     # Registrar a ação no log
     usuario = Session.get_user()
@@ -454,3 +575,25 @@ def atualizar_total_contrato(id_contrato):
         log_action(
             usuario[1], f"Atualização de valor total do Contrato PF (ID: {id_contrato})"
         )
+
+
+def recalcular_totais():
+    """
+    Recalcula os totais de todos os contratos e corrige divergências
+
+    Returns:
+        dict: Relatório de divergências (ver recalcular_todos_totais)
+    """
+    relatorio = recalcular_todos_totais()
+    invalidar_estatisticas()
+
+    # Registrar a ação no log
+    usuario = Session.get_user()
+    if usuario:
+        log_action(
+            usuario[1],
+            f"Recálculo de totais de contratos: {len(relatorio['contratos_corrigidos'])} "
+            f"de {relatorio['contratos']} corrigidos",
+        )
+
+    return relatorio
@@ -0,0 +1,113 @@
+# Dashboard Controller.Py
+import threading
+import time
+
+from models.database import get_connection, get_dialeto
+
+# Segundos durante os quais as estatísticas do dashboard são reaproveitadas
+TEMPO_CACHE = 30
+
+_cache = {"instante": None, "estatisticas": None}
+_lock = threading.Lock()
+
+
+def invalidar_estatisticas():
+    """Descarta as estatísticas em cache (chamado após gravações nos controllers)"""
+    with _lock:
+        _cache["instante"] = None
+        _cache["estatisticas"] = None
+
+
+def obter_estatisticas():
+    """
+    Retorna os totais e os registros recentes exibidos no dashboard
+
+    Tudo é calculado no banco (COUNT e TOP 5) usando uma única conexão,
+    e o resultado fica em cache por TEMPO_CACHE segundos.
+
+    Returns:
+        dict: pessoas, contratos, produtos (quantidades), contratos_recentes
+            e produtos_recentes (listas de tuplas com os 5 registros de maior ID)
+    """
+    with _lock:
+        instante = _cache["instante"]
+        if instante is not None and time.monotonic() - instante < TEMPO_CACHE:
+            return _cache["estatisticas"]
+
+    estatisticas = _consultar_estatisticas()
+
+    with _lock:
+        _cache["instante"] = time.monotonic()
+        _cache["estatisticas"] = estatisticas
+
+    return estatisticas
+
+
+def _consultar_estatisticas():
+    dialeto = get_dialeto()
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        # Todos os totais em uma única instrução
+        cursor.execute(
+            dialeto.escalares(
+                [
+                    ("COUNT(*)", "pessoa_fisica"),
+                    ("COUNT(*)", "contrato_pf"),
+                    ("COUNT(*)", "produto_pf"),
+                ]
+            )
+        )
+        pessoas, contratos, produtos = cursor.fetchone()
+
+        # Contratos recentes: id, nome, modalidade, status, total
+        cursor.execute(
+            dialeto.limitar(
+                f"""
+                SELECT c.id, p.nome_completo, c.modalidade, c.status_contrato,
+                       c.total_contrato
+                FROM {dialeto.juntar("contrato_pf AS c", [
+                    ("LEFT JOIN", "pessoa_fisica AS p", "c.id_pessoa_fisica = p.id"),
+                ])}
+                ORDER BY c.id DESC
+                """,
+                5,
+            )
+        )
+        contratos_recentes = [
+            (c[0], c[1], c[2], c[3], float(c[4]) if c[4] is not None else None)
+            for c in cursor.fetchall()
+        ]
+
+        # Produtos recentes: id, nome do contratado, título, status, valor
+        cursor.execute(
+            dialeto.limitar(
+                f"""
+                SELECT pr.id, pf.nome_completo, pr.titulo, pr.status, pr.valor
+                FROM {dialeto.juntar("produto_pf AS pr", [
+                    ("INNER JOIN", "contrato_pf AS c", "pr.id_contrato = c.id"),
+                    ("INNER JOIN", "pessoa_fisica AS pf", "c.id_pessoa_fisica = pf.id"),
+                ])}
+                ORDER BY pr.id DESC
+                """,
+                5,
+            )
+        )
+        produtos_recentes = [
+            (p[0], p[1], p[2], p[3], float(p[4]) if p[4] is not None else None)
+            for p in cursor.fetchall()
+        ]
+
+        return {
+            "pessoas": int(pessoas),
+            "contratos": int(contratos),
+            "produtos": int(produtos),
+            "contratos_recentes": contratos_recentes,
+            "produtos_recentes": produtos_recentes,
+        }
+
+    except Exception as e:
+        raise Exception(f"Erro ao obter estatísticas do dashboard: {str(e)}")
+    finally:
+        conn.close()
@@ -6,7 +6,7 @@ from models.demanda_model import (
     update_demanda,
     delete_demanda,
 )
-from models.db_manager_access import get_connection
+from models.database import get_connection, get_dialeto
 from utils.session import Session
 from utils.logger import log_action
 
@@ -47,8 +47,7 @@ def adicionar_demanda(
         )
 
         # Obter o ID da demanda inserida
-        cursor.execute("SELECT @@IDENTITY")
-        id_demanda = cursor.fetchone()[0]
+        id_demanda = get_dialeto().ultimo_id(cursor)
 
         conn.commit()
         return id_demanda
@@ -8,8 +8,10 @@ from models.pessoa_fisica_model import (
     update_pessoa_fisica,
     delete_pessoa_fisica,
 )
+from models.indice_pessoas import indice_pessoas
 from utils.session import Session
 from utils.logger import log_action
+from controllers.dashboard_controller import invalidar_estatisticas
 
 
 def adicionar_pessoa_fisica(nome_completo, cpf=None, email=None, telefone=None):
@@ -27,6 +29,8 @@ def adicionar_pessoa_fisica(nome_completo, cpf=None, email=None, telefone=None):
     """
     try:
         id_pessoa = create_pessoa_fisica(nome_completo, cpf, email, telefone)
+        indice_pessoas.atualizar(id_pessoa)
+        invalidar_estatisticas()
 
         # Registrar a ação no log
         usuario = Session.get_user()
@@ -89,6 +93,52 @@ def buscar_pessoas(termo_busca):
     return search_pessoas_fisicas(termo_busca)
 
 
+def pesquisar_pessoas(termo, limite=20):
+    """
+    Busca pessoas pelo início das palavras do nome ou do CPF (índice em memória)
+
+    Args:
+        termo (str): Texto digitado
+        limite (int, optional): Quantidade máxima de resultados (None para todos)
+
+    Returns:
+        list: IDs das pessoas encontradas
+    """
+    return indice_pessoas.buscar(termo, limite)
+
+
+def pessoas_indexadas(ids):
+    """
+    Dados das pessoas a partir do índice em memória (sem consultar o banco)
+
+    Args:
+        ids (list): IDs retornados por pesquisar_pessoas
+
+    Returns:
+        list: Registros PessoaFisica, na mesma ordem dos IDs
+    """
+    pessoas = (indice_pessoas.obter(id_pessoa) for id_pessoa in ids)
+    return [pessoa for pessoa in pessoas if pessoa is not None]
+
+
+def rotulo_pessoa(id_pessoa):
+    """
+    Texto de exibição da pessoa em listas de seleção (nome e CPF ou ID)
+
+    Args:
+        id_pessoa (int): ID da pessoa física
+
+    Returns:
+        str: Rótulo da pessoa ("" se não existir)
+    """
+    return indice_pessoas.rotulo(id_pessoa)
+
+
+def carregar_indice_pessoas():
+    """Carrega o índice de pessoas (para ser chamado em segundo plano)"""
+    indice_pessoas.carregar()
+
+
 def editar_pessoa_fisica(id_pessoa, nome_completo, cpf=None, email=None, telefone=None):
     """
     Edita os dados de uma pessoa física
@@ -102,6 +152,8 @@ def editar_pessoa_fisica(id_pessoa, nome_completo, cpf=None, email=None, telefon
     """
     try:
         update_pessoa_fisica(id_pessoa, nome_completo, cpf, email, telefone)
+        indice_pessoas.atualizar(id_pessoa)
+        invalidar_estatisticas()
 
         # Registrar a ação no log
         usuario = Session.get_user()
@@ -126,9 +178,11 @@ def excluir_pessoa_fisica(id_pessoa):
     try:
         # Buscar o nome da pessoa antes de excluir (para o log)
         pessoa = get_pessoa_fisica_by_id(id_pessoa)
-        nome = pessoa[1] if pessoa else f"ID: {id_pessoa}"
+        nome = pessoa.nome_completo if pessoa else f"ID: {id_pessoa}"
 
         delete_pessoa_fisica(id_pessoa)
+        indice_pessoas.remover(id_pessoa)
+        invalidar_estatisticas()
 
         # Registrar a ação no log
         usuario = Session.get_user()
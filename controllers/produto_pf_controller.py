@@ -2,13 +2,17 @@
 from models.produto_pf_model import (
     create_produto_pf,
     get_all_produtos_pf,
+    get_proximo_numero_produto,
+    reservar_numeros_produto as reservar_numeros,
     get_produtos_by_contrato,
     get_produto_by_id,
     update_produto_pf,
     delete_produto_pf,
 )
+from models.datas import data_iso
 from utils.session import Session
 from utils.logger import log_action
+from controllers.dashboard_controller import invalidar_estatisticas
 from utils.custeio_utils import CusteioManager
 
 # Instância do CusteioManager para reutilização
@@ -30,7 +34,8 @@ def adicionar_produto(
 
     Args:
         id_contrato (int): ID do contrato
-        numero (str): Número ou identificação do produto
+        numero (str): Número ou identificação do produto; None para usar o
+            próximo número da sequência do contrato
         data_programada (str, optional): Data programada
         instrumento (str, optional): Instrumento
         data_entrega (str, optional): Data de entrega
@@ -61,6 +66,7 @@ def adicionar_produto(
             titulo,
             valor_float,
         )
+        invalidar_estatisticas()
 
         # Registrar a ação no log
         usuario = Session.get_user()
@@ -76,27 +82,57 @@ def adicionar_produto(
         raise ValueError(str(e))
 
 
-def listar_produtos():
+def listar_produtos(campos=None, programada=None, entrega=None):
     """
     Lista todos os produtos
 
+    Args:
+        campos (iterable, optional): Campos que a tela exibe (padrão: todos)
+        programada (tuple, optional): Período (início, fim) da data programada,
+            filtrado no banco
+        entrega (tuple, optional): Período (início, fim) da data de entrega
+
     Returns:
         list: Lista de produtos
     """
-    return get_all_produtos_pf()
+    return get_all_produtos_pf(campos, programada, entrega)
 
 
-def listar_produtos_por_contrato(id_contrato):
+def listar_produtos_por_contrato(id_contrato, campos=None, programada=None, entrega=None):
     """
     Lista os produtos de um contrato específico
 
     Args:
         id_contrato (int): ID do contrato
+        campos (iterable, optional): Campos que a tela exibe (padrão: todos)
+        programada (tuple, optional): Período (início, fim) da data programada
+        entrega (tuple, optional): Período (início, fim) da data de entrega
 
     Returns:
         list: Lista de produtos do contrato
     """
-    return get_produtos_by_contrato(id_contrato)
+    return get_produtos_by_contrato(id_contrato, campos, programada, entrega)
+
+
+def validar_periodo(inicio=None, fim=None):
+    """
+    Confere as datas de um filtro de período antes da consulta
+
+    Args:
+        inicio (str, optional): Data inicial (DD/MM/AAAA)
+        fim (str, optional): Data final (DD/MM/AAAA)
+
+    Returns:
+        tuple | None: Período (início, fim) no formato do banco, ou None
+            se as duas datas estiverem vazias
+
+    Raises:
+        ValueError: Se uma das datas for inválida
+    """
+    inicio, fim = data_iso(inicio), data_iso(fim)
+    if inicio is None and fim is None:
+        return None
+    return inicio, fim
 
 
 def buscar_produto_por_id(id_produto):
@@ -149,6 +185,7 @@ def editar_produto(
             titulo,
             valor_float,
         )
+        invalidar_estatisticas()
 
         # Registrar a ação no log
         usuario = Session.get_user()
@@ -164,6 +201,9 @@ def obter_proximo_numero_produto(id_contrato):
     """
     Obtém o próximo número sequencial para um produto do contrato
 
+    O número é apenas exibido; ele só é reservado quando o produto é
+    cadastrado com numero=None (ver adicionar_produto).
+
     Args:
         id_contrato (int): ID do contrato
 
@@ -171,38 +211,28 @@ def obter_proximo_numero_produto(id_contrato):
         int: Próximo número sequencial para o produto
     """
     try:
-        # Obter produtos do contrato
-        produtos = get_produtos_by_contrato(id_contrato)
-        
-        # Se não houver produtos, retorna 1
-        if not produtos:
-            return 1
-        
-        # Tenta extrair o número de cada produto e encontrar o maior
-        numeros = []
-        for produto in produtos:
-            numero_str = produto[2]  # Índice 2 é o campo 'numero'
-            try:
-                # Tenta converter para inteiro
-                numero = int(numero_str)
-                numeros.append(numero)
-            except (ValueError, TypeError):
-                # Se não for um número inteiro, ignora
-                pass
-        
-        # Se não conseguiu extrair nenhum número válido, retorna 1
-        if not numeros:
-            return 1
-        
-        # Retorna o próximo número após o maior encontrado
-        return max(numeros) + 1
-        
+        return get_proximo_numero_produto(id_contrato)
+
     except Exception as e:
         # Em caso de erro, retorna 1 como valor padrão
         print(f"Erro ao obter próximo número de produto: {e}")
         return 1
 
 
+def reservar_numeros_produto(id_contrato, quantidade):
+    """
+    Reserva um bloco de números de produto para cadastro em lote
+
+    Args:
+        id_contrato (int): ID do contrato
+        quantidade (int): Quantidade de produtos que serão cadastrados
+
+    Returns:
+        list: Números reservados, em ordem crescente
+    """
+    return reservar_numeros(id_contrato, quantidade)
+
+
 def obter_instrumentos():
     """
     Obtém a lista de instrumentos únicos da tabela de custeio
@@ -228,6 +258,7 @@ def excluir_produto(id_produto):
     """
     try:
         delete_produto_pf(id_produto)
+        invalidar_estatisticas()
 
         # Registrar a ação no log
         usuario = Session.get_user()
@@ -1,9 +1,10 @@
 # Main.Py
+from utils.inicializacao import inicializacao
+
 import tkinter as tk
-from models.db_manager_access import init_db
+from models.database import preparar_banco
 from views.login_view import LoginView
 from controllers.auth_controller import login
-from views.dashboard_view import DashboardView
 from utils.ui_utils import mostrar_mensagem, Estilos, Cores
 
 
@@ -13,6 +14,16 @@ def on_login_success():
     main_app()
 
 
+def on_login(username, password):
+    """Callback do botão de login: espera o banco ficar pronto e autentica"""
+    try:
+        banco.result()
+    except Exception as e:
+        mostrar_mensagem("Erro", f"Erro ao acessar o banco de dados: {e}", tipo="erro")
+        return
+    login(username, password, on_login_success, on_login_failure)
+
+
 def on_login_failure():
     """Callback quando o login falha"""
     mostrar_mensagem("Erro", "Usuário ou senha inválidos.", tipo="erro")
@@ -28,22 +39,35 @@ def main_app():
     app.configure(background=Cores.BACKGROUND_CLARO)
     Estilos.configurar()
 
-    # Carrega o dashboard
+    # Carrega o dashboard (importado só depois do login, com as telas
+    # que ele abre importadas na primeira navegação)
+    with inicializacao.etapa("importação do dashboard"):
+        from views.dashboard_view import DashboardView
     DashboardView(app)
 
+    app.after(0, exibido, "dashboard exibido")
     app.mainloop()
 
 
+def exibido(marco):
+    """Marca a exibição de uma janela e imprime os tempos de inicialização"""
+    inicializacao.marcar(marco)
+    print(inicializacao.relatorio())
+
+
 if __name__ == "__main__":
-    # Inicializa o banco de dados
-    init_db()
+    inicializacao.marcar("módulos da tela de login importados")
+
+    # Confere o esquema (e deixa uma conexão aberta no pool) enquanto a
+    # janela de login é montada
+    banco = inicializacao.em_segundo_plano("banco de dados pronto", preparar_banco)
 
     # Inicia a tela de login
     root = tk.Tk()
     root.configure(background=Cores.BACKGROUND_CLARO)
     Estilos.configurar()
 
-    LoginView(root, lambda u, p: login(u, p, on_login_success, on_login_failure))
+    LoginView(root, on_login)
 
     # Centraliza a janela de login
     window_width = 400
@@ -54,4 +78,6 @@ if __name__ == "__main__":
     y_cordinate = int((screen_height / 2) - (window_height / 2))
     root.geometry(f"{window_width}x{window_height}+{x_cordinate}+{y_cordinate}")
 
+    root.after(0, exibido, "janela de login exibida")
+
     root.mainloop()
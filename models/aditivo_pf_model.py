@@ -1,7 +1,18 @@
 # Aditivo Pf Model.Py
-from .db_manager_access import get_connection
+from .cache import cache_leituras
+from .database import get_connection, get_dialeto
+from .datas import data_iso
+from .contrato_pf_model import ajustar_totais_aditivos
+from .registros import CAMPOS_ADITIVO_PF, AditivoPF, projecao, registro, registros
 from datetime import datetime
 
+# Expressão SQL de cada campo de AditivoPF (a = aditivo_pf, c = contrato_pf, p = pessoa_fisica)
+EXPRESSOES = {campo: f"a.{campo}" for campo in CAMPOS_ADITIVO_PF}
+EXPRESSOES["numero_contrato"] = "c.numero_contrato"
+EXPRESSOES["nome_completo"] = "p.nome_completo"
+
+_COLUNAS = projecao(AditivoPF, EXPRESSOES)[1]
+
 
 def create_aditivo_pf(
     id_contrato,
@@ -57,6 +68,12 @@ def create_aditivo_pf(
     Returns:
         int: ID do aditivo criado
     """
+    # Datas no formato do banco (AAAA-MM-DD)
+    data_entrada = data_iso(data_entrada)
+    data_protocolo = data_iso(data_protocolo)
+    vigencia_inicial = data_iso(vigencia_inicial)
+    vigencia_final = data_iso(vigencia_final)
+
     conn = get_connection()
     cursor = conn.cursor()
 
@@ -117,9 +134,11 @@ def create_aditivo_pf(
         ),
     )
 
-    # Obter o ID do aditivo inserido usando SELECT @@IDENTITY
-    cursor.execute("SELECT @@IDENTITY")
-    aditivo_id = cursor.fetchone()[0]
+    # Obter o ID do aditivo inserido
+    aditivo_id = get_dialeto().ultimo_id(cursor)
+
+    # Somar o novo aditivo aos totais materializados do contrato
+    ajustar_totais_aditivos(cursor, id_contrato, valor_total_aditivo, 1)
 
     # Atualizar o contrato conforme o tipo de aditivo
     if tipo_aditivo in ["prorrogacao", "ambos", "tempo", "TEMPO", "tempo e valor", "TEMPO E VALOR"]:
@@ -152,27 +171,32 @@ def create_aditivo_pf(
                 (nova_remuneracao, id_contrato),
             )
 
-    # Nota: O valor total do contrato será recalculado pela função atualizar_total_contrato()
-    # Removemos a atualização automática para evitar cálculos incorretos
+    # Nota: O valor total do contrato é recalculado pelo controller com
+    # update_total_contrato(), na mesma transação (ver models.database.transacao)
 
     conn.commit()
     conn.close()
+    cache_leituras.invalidar("contrato", id_contrato)
 
     return aditivo_id
 
 
-def get_all_aditivos_pf():
+def get_all_aditivos_pf(campos=None):
     """
     Retorna todos os aditivos de contratos PF
 
+    Args:
+        campos (iterable, optional): Campos a buscar (ver models.registros.projecao)
+
     Returns:
-        list: Lista de tuplas com os aditivos
+        list: Registros AditivoPF (parciais, se campos for informado) com os aditivos
     """
+    tipo, selecao = projecao(AditivoPF, EXPRESSOES, campos)
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute(
-        """
-        SELECT a.*, c.numero_contrato, p.nome_completo
+        f"""
+        SELECT {selecao}
         FROM ([aditivo_pf] AS a
         INNER JOIN [contrato_pf] AS c ON a.id_contrato = c.id)
         INNER JOIN [pessoa_fisica] AS p ON c.id_pessoa_fisica = p.id
@@ -182,24 +206,26 @@ def get_all_aditivos_pf():
     aditivos = cursor.fetchall()
     conn.close()
 
-    return [tuple(aditivo) for aditivo in aditivos]
+    return registros(tipo, aditivos)
 
 
-def get_aditivos_by_contrato(id_contrato):
+def get_aditivos_by_contrato(id_contrato, campos=None):
     """
     Obtém todos os aditivos de um contrato
 
     Args:
         id_contrato (int): ID do contrato
+        campos (iterable, optional): Campos a buscar (ver models.registros.projecao)
 
     Returns:
-        list: Lista de tuplas com os aditivos
+        list: Registros AditivoPF (parciais, se campos for informado) com os aditivos
     """
+    tipo, selecao = projecao(AditivoPF, EXPRESSOES, campos)
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute(
-        """
-        SELECT a.*, c.numero_contrato, p.nome_completo
+        f"""
+        SELECT {selecao}
         FROM ([aditivo_pf] AS a
         INNER JOIN [contrato_pf] AS c ON a.id_contrato = c.id)
         INNER JOIN [pessoa_fisica] AS p ON c.id_pessoa_fisica = p.id
@@ -211,7 +237,7 @@ def get_aditivos_by_contrato(id_contrato):
     aditivos = cursor.fetchall()
     conn.close()
 
-    return [tuple(aditivo) for aditivo in aditivos]
+    return registros(tipo, aditivos)
 
 
 def get_aditivo_by_id(id_aditivo):
@@ -222,13 +248,13 @@ def get_aditivo_by_id(id_aditivo):
         id_aditivo (int): ID do aditivo
 
     Returns:
-        tuple: Dados do aditivo ou None se não encontrado
+        AditivoPF: Dados do aditivo ou None se não encontrado
     """
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute(
-        """
-        SELECT a.*, c.numero_contrato, p.nome_completo
+        f"""
+        SELECT {_COLUNAS}
         FROM ([aditivo_pf] AS a
         INNER JOIN [contrato_pf] AS c ON a.id_contrato = c.id)
         INNER JOIN [pessoa_fisica] AS p ON c.id_pessoa_fisica = p.id
@@ -239,9 +265,7 @@ def get_aditivo_by_id(id_aditivo):
     aditivo = cursor.fetchone()
     conn.close()
 
-    if aditivo:
-        return tuple(aditivo)
-    return None
+    return registro(AditivoPF, aditivo)
 
 
 def update_aditivo_pf(
@@ -274,7 +298,16 @@ def update_aditivo_pf(
     Args:
         id_aditivo (int): ID do aditivo
         [outros parâmetros iguais ao create_aditivo_pf]
+
+    Returns:
+        int: ID do contrato do aditivo
     """
+    # Datas no formato do banco (AAAA-MM-DD)
+    data_entrada = data_iso(data_entrada)
+    data_protocolo = data_iso(data_protocolo)
+    vigencia_inicial = data_iso(vigencia_inicial)
+    vigencia_final = data_iso(vigencia_final)
+
     conn = get_connection()
     cursor = conn.cursor()
 
@@ -347,6 +380,14 @@ def update_aditivo_pf(
         ),
     )
 
+    # Aplicar a diferença de valor aos totais materializados do contrato
+    ajustar_totais_aditivos(
+        cursor,
+        id_contrato,
+        float(valor_total_aditivo or 0) - valor_total_anterior,
+        0,
+    )
+
     # Atualizar o contrato conforme o tipo de aditivo
     if tipo_aditivo in ["prorrogacao", "ambos", "tempo", "TEMPO", "tempo e valor", "TEMPO E VALOR"]:
         # Atualizar a vigência final e meses no contrato
@@ -383,11 +424,14 @@ def update_aditivo_pf(
                 (nova_remuneracao, id_contrato),
             )
 
-    # Nota: O valor total do contrato será recalculado pela função atualizar_total_contrato()
-    # Removemos a atualização automática para evitar cálculos incorretos
+    # Nota: O valor total do contrato é recalculado pelo controller com
+    # update_total_contrato(), na mesma transação (ver models.database.transacao)
 
     conn.commit()
     conn.close()
+    cache_leituras.invalidar("contrato", id_contrato)
+
+    return id_contrato
 
 
 def delete_aditivo_pf(id_aditivo):
@@ -397,6 +441,9 @@ def delete_aditivo_pf(id_aditivo):
     Args:
         id_aditivo (int): ID do aditivo
 
+    Returns:
+        int: ID do contrato do aditivo excluído
+
     Raises:
         ValueError: Se não for o último aditivo do contrato
     """
@@ -419,12 +466,14 @@ def delete_aditivo_pf(id_aditivo):
 
     # Verificar se é o último aditivo do contrato
     cursor.execute(
-        """
+        get_dialeto().limitar(
+            """
         SELECT id FROM aditivo_pf 
         WHERE id_contrato=? 
-        ORDER BY id DESC 
-        LIMIT 1
+        ORDER BY id DESC
     """,
+            1,
+        ),
         (id_contrato,),
     )
 
@@ -437,8 +486,14 @@ def delete_aditivo_pf(id_aditivo):
     # Excluir o aditivo
     cursor.execute("DELETE FROM aditivo_pf WHERE id=?", (id_aditivo,))
 
-    # Nota: O valor total do contrato será recalculado pela função atualizar_total_contrato()
-    # Removemos a atualização automática para evitar cálculos incorretos
+    # Retirar o aditivo dos totais materializados do contrato
+    ajustar_totais_aditivos(cursor, id_contrato, -valor_aditivo, -1)
+
+    # Nota: O valor total do contrato é recalculado pelo controller com
+    # update_total_contrato(), na mesma transação (ver models.database.transacao)
 
     conn.commit()
     conn.close()
+    cache_leituras.invalidar("contrato", id_contrato)
+
+    return id_contrato
@@ -0,0 +1,130 @@
+# Cache.Py
+"""
+Cache de leitura para as consultas por ID dos models.
+
+Os formulários consultam o mesmo contrato, pessoa ou produto várias vezes
+durante uma única interação; o cache guarda o resultado de cada consulta
+por (entidade, id) e as funções de gravação do próprio model o invalidam.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+# Entidades cujas linhas incluem dados de outra (por JOIN): ao gravar a
+# entidade da chave, as entradas das entidades listadas também ficam velhas
+DEPENDENTES = {
+    "pessoa": ("contrato", "produto"),
+    "contrato": ("produto",),
+}
+
+
+class CacheLeituras:
+    """
+    Cache LRU limitado das consultas por ID
+
+    Consultas feitas dentro de transacao() não passam pelo cache, pois podem
+    enxergar dados ainda não confirmados. Uma consulta que termina depois de
+    uma invalidação iniciada durante sua execução não é guardada, para que
+    um valor lido antes da gravação não volte ao cache. As entradas expiram
+    após `validade` segundos, limitando o tempo em que uma alteração feita
+    por outra estação fica invisível.
+    """
+
+    def __init__(self, capacidade=512, validade=60.0):
+        """
+        Args:
+            capacidade (int): Número máximo de entradas
+            validade (float): Segundos que uma entrada permanece válida
+        """
+        self.capacidade = capacidade
+        self.validade = validade
+        self._entradas = OrderedDict()
+        self._geracao = 0
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.invalidacoes = 0
+
+    def obter(self, entidade, id_registro, carregar):
+        """
+        Retorna o registro do cache ou o carrega com carregar(id_registro)
+
+        Resultados None (registro inexistente) não são guardados.
+
+        Args:
+            entidade (str): Nome da entidade ("contrato", "pessoa", "produto")
+            id_registro (int): ID do registro
+            carregar (callable): Função que consulta o banco
+
+        Returns:
+            O valor retornado por carregar
+        """
+        from .database import em_transacao
+
+        if em_transacao():
+            return carregar(id_registro)
+
+        chave = (entidade, id_registro)
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and time.monotonic() - entrada[1] < self.validade:
+                self._entradas.move_to_end(chave)
+                self.acertos += 1
+                return entrada[0]
+            self.falhas += 1
+            geracao = self._geracao
+
+        valor = carregar(id_registro)
+
+        if valor is not None:
+            with self._lock:
+                if geracao == self._geracao:
+                    self._entradas[chave] = (valor, time.monotonic())
+                    self._entradas.move_to_end(chave)
+                    while len(self._entradas) > self.capacidade:
+                        self._entradas.popitem(last=False)
+
+        return valor
+
+    def invalidar(self, entidade, id_registro=None):
+        """
+        Remove um registro (ou todos os da entidade, se id_registro for None)
+
+        As entradas das entidades dependentes (ver DEPENDENTES) também são
+        removidas.
+        """
+        afetadas = set(DEPENDENTES.get(entidade, ()))
+        with self._lock:
+            self._geracao += 1
+            self.invalidacoes += 1
+            for chave in list(self._entradas):
+                if chave[0] in afetadas or (
+                    chave[0] == entidade and id_registro in (None, chave[1])
+                ):
+                    del self._entradas[chave]
+
+    def limpar(self):
+        """Remove todas as entradas"""
+        with self._lock:
+            self._geracao += 1
+            self._entradas.clear()
+
+    def estatisticas(self):
+        """
+        Contadores de uso do cache
+
+        Returns:
+            dict: entradas, acertos, falhas, invalidacoes e taxa_acertos (0 a 1)
+        """
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "entradas": len(self._entradas),
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "invalidacoes": self.invalidacoes,
+                "taxa_acertos": self.acertos / consultas if consultas else 0.0,
+            }
+
+
+cache_leituras = CacheLeituras()
@@ -1,7 +1,16 @@
 # Contrato Pf Model.Py
-from .db_manager_access import get_connection, validate_list_value
+from .cache import cache_leituras
+from .database import get_connection, get_dialeto, validate_list_value
+from .datas import data_iso
+from .registros import CAMPOS_CONTRATO_PF, ContratoPF, projecao, registro, registros
 from datetime import datetime
 
+# Expressão SQL de cada campo de ContratoPF (c = contrato_pf, p = pessoa_fisica)
+EXPRESSOES = {campo: f"c.{campo}" for campo in CAMPOS_CONTRATO_PF}
+EXPRESSOES["nome_completo"] = "p.nome_completo"
+
+_COLUNAS = projecao(ContratoPF, EXPRESSOES)[1]
+
 
 def create_contrato_pf(
     codigo_demanda,
@@ -66,6 +75,10 @@ def create_contrato_pf(
     Raises:
         ValueError: Se modalidade, natureza_demanda, status_contrato, lotacao ou exercicio não existirem na tabela lists
     """
+    # Datas no formato do banco (AAAA-MM-DD)
+    vigencia_inicial = data_iso(vigencia_inicial)
+    vigencia_final = data_iso(vigencia_final)
+
     conn = get_connection()
     cursor = conn.cursor()
 
@@ -125,11 +138,11 @@ def create_contrato_pf(
             ),
         )
 
-        # Obter o ID do contrato inserido usando SELECT @@IDENTITY
-        cursor.execute("SELECT @@IDENTITY")
-        contrato_id = cursor.fetchone()[0]
+        # Obter o ID do contrato inserido
+        contrato_id = get_dialeto().ultimo_id(cursor)
 
         conn.commit()
+        cache_leituras.invalidar("contrato", contrato_id)
         return contrato_id
         
     except Exception as e:
@@ -139,18 +152,22 @@ def create_contrato_pf(
         conn.close()
 
 
-def get_all_contratos_pf():
+def get_all_contratos_pf(campos=None):
     """
     Retorna todos os contratos de pessoa física
 
+    Args:
+        campos (iterable, optional): Campos a buscar (ver models.registros.projecao)
+
     Returns:
-        list: Lista de tuplas com os contratos
+        list: Registros ContratoPF (parciais, se campos for informado) com os contratos
     """
+    tipo, selecao = projecao(ContratoPF, EXPRESSOES, campos)
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute(
-        """
-        SELECT c.*, p.nome_completo 
+        f"""
+        SELECT {selecao}
         FROM [contrato_pf] AS c 
         INNER JOIN [pessoa_fisica] AS p ON c.id_pessoa_fisica = p.id
         ORDER BY c.id DESC
@@ -159,24 +176,26 @@ def get_all_contratos_pf():
     contratos = cursor.fetchall()
     conn.close()
 
-    return [tuple(contrato) for contrato in contratos]
+    return registros(tipo, contratos)
 
 
-def get_contratos_by_pessoa(id_pessoa_fisica):
+def get_contratos_by_pessoa(id_pessoa_fisica, campos=None):
     """
     Retorna os contratos de uma pessoa física específica
 
     Args:
         id_pessoa_fisica (int): ID da pessoa física
+        campos (iterable, optional): Campos a buscar (ver models.registros.projecao)
 
     Returns:
-        list: Lista de tuplas com os contratos
+        list: Registros ContratoPF (parciais, se campos for informado) com os contratos
     """
+    tipo, selecao = projecao(ContratoPF, EXPRESSOES, campos)
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute(
-        """
-        SELECT c.*, p.nome_completo 
+        f"""
+        SELECT {selecao}
         FROM ([contrato_pf] AS c
         INNER JOIN [pessoa_fisica] AS p ON c.id_pessoa_fisica = p.id)
         WHERE c.id_pessoa_fisica = ?
@@ -187,24 +206,26 @@ def get_contratos_by_pessoa(id_pessoa_fisica):
     contratos = cursor.fetchall()
     conn.close()
 
-    return [tuple(contrato) for contrato in contratos]
+    return registros(tipo, contratos)
 
 
-def get_contratos_by_demanda(codigo_demanda):
+def get_contratos_by_demanda(codigo_demanda, campos=None):
     """
     Retorna os contratos vinculados a uma demanda específica
 
     Args:
         codigo_demanda (int): Código da demanda
+        campos (iterable, optional): Campos a buscar (ver models.registros.projecao)
 
     Returns:
-        list: Lista de tuplas com os contratos
+        list: Registros ContratoPF (parciais, se campos for informado) com os contratos
     """
+    tipo, selecao = projecao(ContratoPF, EXPRESSOES, campos)
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute(
-        """
-        SELECT c.*, p.nome_completo 
+        f"""
+        SELECT {selecao}
         FROM ([contrato_pf] AS c
         INNER JOIN [pessoa_fisica] AS p ON c.id_pessoa_fisica = p.id)
         WHERE c.codigo_demanda = ?
@@ -215,26 +236,30 @@ def get_contratos_by_demanda(codigo_demanda):
     contratos = cursor.fetchall()
     conn.close()
 
-    return [tuple(contrato) for contrato in contratos]
+    return registros(tipo, contratos)
 
 
 def get_contrato_by_id(id_contrato):
     """
-    Obtém um contrato pelo seu ID
+    Obtém um contrato pelo seu ID (com cache de leitura, ver models.cache)
 
     Args:
         id_contrato (int): ID do contrato
 
     Returns:
-        tuple: Dados do contrato ou None se não encontrado
+        ContratoPF: Dados do contrato ou None se não encontrado
     """
+    return cache_leituras.obter("contrato", id_contrato, _consultar_contrato)
+
+
+def _consultar_contrato(id_contrato):
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute(
-        """
-        SELECT c.*, p.nome_completo 
+        f"""
+        SELECT {_COLUNAS}
         FROM ([contrato_pf] AS c
-        INNER JOIN [pessoa_fisica] AS p ON c.id_pessoa_fisica = p.id)
+        LEFT JOIN [pessoa_fisica] AS p ON c.id_pessoa_fisica = p.id)
         WHERE c.id = ?
         """,
         (id_contrato,),
@@ -242,9 +267,29 @@ def get_contrato_by_id(id_contrato):
     contrato = cursor.fetchone()
     conn.close()
 
-    if contrato:
-        return tuple(contrato)
-    return None
+    return registro(ContratoPF, contrato)
+
+
+def carregar_observacoes(id_contrato):
+    """
+    Obtém apenas as observações (campo memo) de um contrato
+
+    Usada pelos formulários que recebem um registro parcial da listagem,
+    que não traz o campo.
+
+    Args:
+        id_contrato (int): ID do contrato
+
+    Returns:
+        str: Observações do contrato ("" se vazias ou se o contrato não existir)
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT observacoes FROM contrato_pf WHERE id=?", (id_contrato,))
+    linha = cursor.fetchone()
+    conn.close()
+
+    return (linha[0] or "") if linha else ""
 
 
 def update_contrato_pf(
@@ -285,6 +330,10 @@ def update_contrato_pf(
     Raises:
         ValueError: Se modalidade, natureza_demanda, status_contrato, lotacao ou exercicio não existirem na tabela lists
     """
+    # Datas no formato do banco (AAAA-MM-DD)
+    vigencia_inicial = data_iso(vigencia_inicial)
+    vigencia_final = data_iso(vigencia_final)
+
     conn = get_connection()
     cursor = conn.cursor()
 
@@ -346,6 +395,7 @@ def update_contrato_pf(
         )
 
         conn.commit()
+        cache_leituras.invalidar("contrato", id_contrato)
         
     except Exception as e:
         conn.rollback()
@@ -392,20 +442,25 @@ def delete_contrato_pf(id_contrato):
         )
 
     cursor.execute("DELETE FROM contrato_pf WHERE id=?", (id_contrato,))
+    cursor.execute("DELETE FROM contrato_totals WHERE id_contrato=?", (id_contrato,))
+    cursor.execute("DELETE FROM produto_seq WHERE id_contrato=?", (id_contrato,))
     conn.commit()
     conn.close()
+    cache_leituras.invalidar("contrato", id_contrato)
 
 
-def search_contratos_pf(termo_busca):
+def search_contratos_pf(termo_busca, campos=None):
     """
     Busca contratos por número, nome da pessoa ou modalidade
 
     Args:
         termo_busca (str): Termo a ser buscado
+        campos (iterable, optional): Campos a buscar (ver models.registros.projecao)
 
     Returns:
-        list: Lista de tuplas com os contratos encontrados
+        list: Registros ContratoPF (parciais, se campos for informado) com os contratos encontrados
     """
+    tipo, selecao = projecao(ContratoPF, EXPRESSOES, campos)
     conn = get_connection()
     cursor = conn.cursor()
 
@@ -413,8 +468,8 @@ def search_contratos_pf(termo_busca):
     termo = f"%{termo_busca}%"
 
     cursor.execute(
-        """
-        SELECT c.*, p.nome_completo 
+        f"""
+        SELECT {selecao}
         FROM contrato_pf c
         JOIN pessoa_fisica p ON c.id_pessoa_fisica = p.id
         WHERE c.numero_contrato LIKE ? 
@@ -428,25 +483,92 @@ def search_contratos_pf(termo_busca):
     contratos = cursor.fetchall()
     conn.close()
 
-    return [tuple(contrato) for contrato in contratos]
+    return registros(tipo, contratos)
+
+
+def _calcular_total(intersticio, valor_intersticio, valor_complementar, remuneracao, meses, total_aditivos):
+    """
+    Calcula o total do contrato: valor base atual + soma dos aditivos
+
+    Remuneração e meses são os atuais (possivelmente já alterados por aditivos).
+    """
+    intersticio = int(intersticio) if intersticio else 0
+    valor_intersticio = float(valor_intersticio) if valor_intersticio and intersticio == 1 else 0
+    valor_complementar = float(valor_complementar) if valor_complementar else 0
+    remuneracao = float(remuneracao) if remuneracao else 0
+    meses = int(meses) if meses else 0
+    total_aditivos = float(total_aditivos) if total_aditivos else 0
+
+    total_base = (remuneracao * meses) + valor_intersticio + valor_complementar
+    return total_base + total_aditivos
+
+
+def _semear_totais(cursor, id_contrato):
+    """Cria a linha de contrato_totals a partir dos aditivos gravados e retorna a soma"""
+    soma_aditivos = get_dialeto().coalesce("SUM(valor_total_aditivo)", 0)
+    cursor.execute(
+        f"SELECT {soma_aditivos}, COUNT(*) FROM aditivo_pf WHERE id_contrato=?",
+        (id_contrato,),
+    )
+    total_aditivos, qtd_aditivos = cursor.fetchone()
+    total_aditivos = float(total_aditivos) if total_aditivos else 0
+
+    cursor.execute(
+        "INSERT INTO contrato_totals (id_contrato, total_aditivos, qtd_aditivos) VALUES (?, ?, ?)",
+        (id_contrato, total_aditivos, int(qtd_aditivos)),
+    )
+    return total_aditivos
+
+
+def ajustar_totais_aditivos(cursor, id_contrato, delta_valor, delta_qtd):
+    """
+    Aplica a variação causada por um aditivo à soma mantida em contrato_totals
+
+    Deve ser chamada com o cursor que gravou o aditivo, depois da gravação.
+    Se o contrato ainda não tiver linha em contrato_totals, ela é criada a
+    partir da soma atual dos aditivos (que já inclui a alteração).
+
+    Args:
+        cursor: Cursor da conexão que gravou o aditivo
+        id_contrato (int): ID do contrato
+        delta_valor (float): Variação da soma de valor_total_aditivo
+        delta_qtd (int): Variação da quantidade de aditivos (+1, 0 ou -1)
+    """
+    cursor.execute(
+        """
+        UPDATE contrato_totals
+        SET total_aditivos = total_aditivos + ?, qtd_aditivos = qtd_aditivos + ?
+        WHERE id_contrato=?
+    """,
+        (float(delta_valor or 0), int(delta_qtd), id_contrato),
+    )
+
+    if cursor.rowcount == 0:
+        _semear_totais(cursor, id_contrato)
 
 
 def update_total_contrato(id_contrato):
     """
     Recalcula e atualiza o valor total do contrato incluindo aditivos
 
+    A soma dos aditivos vem de contrato_totals, mantida incrementalmente
+    pelos models de aditivo.
+
     Args:
         id_contrato (int): ID do contrato
     """
     conn = get_connection()
     cursor = conn.cursor()
 
-    # Buscar dados originais do contrato (valores base antes dos aditivos)
-    # Para isso, precisamos recalcular baseado na remuneração e meses originais
+    # Dados do contrato e soma materializada dos aditivos em uma única consulta
     cursor.execute(
-        """
-        SELECT intersticio, valor_intersticio, valor_complementar
-        FROM contrato_pf WHERE id=?
+        f"""
+        SELECT c.intersticio, c.valor_intersticio, c.valor_complementar,
+               c.remuneracao, c.meses, t.total_aditivos
+        FROM {get_dialeto().juntar("contrato_pf AS c", [
+            ("LEFT JOIN", "contrato_totals AS t", "t.id_contrato = c.id"),
+        ])}
+        WHERE c.id=?
     """,
         (id_contrato,),
     )
@@ -454,56 +576,123 @@ def update_total_contrato(id_contrato):
     contrato = cursor.fetchone()
 
     if contrato:
-        # Valores fixos do contrato original
-        intersticio = int(contrato[0]) if contrato[0] else 0
-        valor_intersticio = (
-            float(contrato[1]) if contrato[1] and intersticio == 1 else 0
-        )
-        valor_complementar_original = float(contrato[2]) if contrato[2] else 0
+        total_aditivos = contrato[5]
+        if total_aditivos is None:
+            # Contrato ainda sem linha em contrato_totals
+            total_aditivos = _semear_totais(cursor, id_contrato)
 
-        # Buscar a remuneração e meses originais (antes de qualquer aditivo)
-        # Para isso, vamos buscar o primeiro registro histórico ou usar uma lógica diferente
-        # Por agora, vamos calcular baseado nos dados atuais e somar os aditivos
-        
-        # Primeiro, buscar os dados atuais do contrato
+        total_contrato = _calcular_total(*contrato[:5], total_aditivos)
+
+        # Atualiza o contrato
         cursor.execute(
             """
-            SELECT remuneracao, meses
-            FROM contrato_pf WHERE id=?
+            UPDATE contrato_pf SET total_contrato=? WHERE id=?
         """,
-            (id_contrato,),
+            (total_contrato, id_contrato),
         )
-        
-        dados_atuais = cursor.fetchone()
-        remuneracao_atual = float(dados_atuais[0]) if dados_atuais[0] else 0
-        meses_atual = int(dados_atuais[1]) if dados_atuais[1] else 0
-        
-        # Calcular valor base atual (com remuneração e meses possivelmente já alterados por aditivos)
-        total_base = (remuneracao_atual * meses_atual) + valor_intersticio + valor_complementar_original
 
-        # Buscar e somar todos os valores dos aditivos
+        conn.commit()
+        cache_leituras.invalidar("contrato", id_contrato)
+
+    conn.close()
+
+
+def recalcular_todos_totais(tolerancia=0.005):
+    """
+    Recalcula contrato_totals e total_contrato de todos os contratos
+
+    Uma única consulta agregada traz, para cada contrato, os valores base, a
+    soma real dos aditivos e a soma materializada; só as linhas divergentes
+    são regravadas, em uma transação.
+
+    Args:
+        tolerancia (float): Diferença abaixo da qual os valores são considerados iguais
+
+    Returns:
+        dict: contratos (quantidade verificada), totais_corrigidos (lista de
+            (id_contrato, soma materializada, soma real)), contratos_corrigidos
+            (lista de (id_contrato, total anterior, total recalculado)) e
+            totais_orfaos (linhas removidas de contratos inexistentes)
+    """
+    dialeto = get_dialeto()
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    # Soma e quantidade reais de aditivos por contrato
+    aditivos_por_contrato = """(
+        SELECT id_contrato, SUM(valor_total_aditivo) AS soma, COUNT(*) AS qtd
+        FROM aditivo_pf GROUP BY id_contrato
+    ) AS a"""
+
+    try:
         cursor.execute(
+            f"""
+            SELECT c.id, c.intersticio, c.valor_intersticio, c.valor_complementar,
+                   c.remuneracao, c.meses, c.total_contrato,
+                   a.soma, a.qtd, t.total_aditivos, t.qtd_aditivos
+            FROM {dialeto.juntar("contrato_pf AS c", [
+                ("LEFT JOIN", aditivos_por_contrato, "a.id_contrato = c.id"),
+                ("LEFT JOIN", "contrato_totals AS t", "t.id_contrato = c.id"),
+            ])}
             """
-            SELECT COALESCE(SUM(valor_total_aditivo), 0)
-            FROM aditivo_pf WHERE id_contrato=?
-        """,
-            (id_contrato,),
         )
-        
-        total_aditivos = cursor.fetchone()[0]
-        total_aditivos = float(total_aditivos) if total_aditivos else 0
-
-        # Total final do contrato = valor base + aditivos
-        total_contrato = total_base + total_aditivos
+        linhas = cursor.fetchall()
+
+        totais_corrigidos = []
+        contratos_corrigidos = []
+        for linha in linhas:
+            id_contrato = linha[0]
+            soma = float(linha[7]) if linha[7] else 0
+            qtd = int(linha[8]) if linha[8] else 0
+            soma_materializada = float(linha[9]) if linha[9] is not None else None
+            qtd_materializada = int(linha[10]) if linha[10] is not None else None
+
+            if (
+                soma_materializada is None
+                or abs(soma_materializada - soma) > tolerancia
+                or qtd_materializada != qtd
+            ):
+                totais_corrigidos.append((id_contrato, soma_materializada, soma, qtd))
+
+            total_atual = float(linha[6]) if linha[6] is not None else None
+            total_correto = _calcular_total(*linha[1:6], soma)
+            if total_atual is None or abs(total_atual - total_correto) > tolerancia:
+                contratos_corrigidos.append((id_contrato, total_atual, total_correto))
+
+        if totais_corrigidos:
+            cursor.executemany(
+                "DELETE FROM contrato_totals WHERE id_contrato=?",
+                [(t[0],) for t in totais_corrigidos],
+            )
+            cursor.executemany(
+                "INSERT INTO contrato_totals (id_contrato, total_aditivos, qtd_aditivos) VALUES (?, ?, ?)",
+                [(t[0], t[2], t[3]) for t in totais_corrigidos],
+            )
+
+        if contratos_corrigidos:
+            cursor.executemany(
+                "UPDATE contrato_pf SET total_contrato=? WHERE id=?",
+                [(c[2], c[0]) for c in contratos_corrigidos],
+            )
 
-        # Atualiza o contrato
         cursor.execute(
-            """
-            UPDATE contrato_pf SET total_contrato=? WHERE id=?
-        """,
-            (total_contrato, id_contrato),
+            "DELETE FROM contrato_totals WHERE id_contrato NOT IN (SELECT id FROM contrato_pf)"
         )
+        totais_orfaos = max(cursor.rowcount, 0)
 
         conn.commit()
+        if contratos_corrigidos:
+            cache_leituras.invalidar("contrato")
 
-    conn.close()
+        return {
+            "contratos": len(linhas),
+            "totais_corrigidos": [t[:3] for t in totais_corrigidos],
+            "contratos_corrigidos": contratos_corrigidos,
+            "totais_orfaos": totais_orfaos,
+        }
+
+    except Exception as e:
+        conn.rollback()
+        raise e
+    finally:
+        conn.close()
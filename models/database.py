@@ -0,0 +1,404 @@
+# Database.Py
+"""
+Camada de acesso ao banco independente do motor de armazenamento.
+
+O motor é escolhido pela variável de ambiente SISPROJ_DB_BACKEND
+("access", padrão, ou "sqlite") e o arquivo por SISPROJ_DB_PATH.
+Os models usam get_connection() e get_dialeto() daqui, nunca um
+motor específico, para que o mesmo código rode no Access ou no SQLite.
+"""
+import importlib
+import os
+import re
+import threading
+from contextlib import contextmanager
+
+from .instrumentacao import instrumentacao
+
+BACKEND_PADRAO = "access"
+
+# Módulo que implementa cada motor (get_connection, init_db, DB_PATH)
+_MOTORES = {
+    "access": "models.db_manager_access",
+    "sqlite": "models.db_manager",
+}
+
+
+class DialetoAccess:
+    """Particularidades do SQL do Microsoft Access (Jet/ACE)"""
+
+    nome = "access"
+
+    def quote(self, identificador):
+        """Protege um nome de tabela ou coluna"""
+        return f"[{identificador}]"
+
+    def ultimo_id(self, cursor):
+        """Retorna o ID gerado pelo último INSERT do cursor"""
+        cursor.execute("SELECT @@IDENTITY")
+        return cursor.fetchone()[0]
+
+    def limitar(self, consulta, limite):
+        """Restringe um SELECT às primeiras `limite` linhas (SELECT TOP n)"""
+        return re.sub(
+            r"^\s*SELECT(\s+DISTINCT)?",
+            lambda m: f"SELECT{m.group(1) or ''} TOP {int(limite)}",
+            consulta,
+            count=1,
+            flags=re.IGNORECASE,
+        )
+
+    def paginar(self, cursor, consulta, params, limite, deslocamento=0):
+        """
+        Executa um SELECT ordenado e retorna apenas uma página de linhas
+
+        O Access não tem OFFSET; busca-se TOP (deslocamento + limite) e as
+        linhas anteriores à página são descartadas no cursor.
+        """
+        cursor.execute(self.limitar(consulta, deslocamento + limite), params)
+        if deslocamento:
+            cursor.fetchmany(deslocamento)
+        return cursor.fetchmany(limite)
+
+    def juntar(self, tabela, juncoes):
+        """
+        Monta a cláusula FROM com várias junções
+
+        O Access exige que cada junção além da primeira fique entre parênteses.
+
+        Args:
+            tabela (str): Tabela base, ex.: "[contrato_pf] AS c"
+            juncoes (list): Tuplas (tipo, tabela, condição), ex.:
+                ("INNER JOIN", "[pessoa_fisica] AS p", "c.id_pessoa_fisica = p.id")
+        """
+        clausula = tabela
+        for i, (tipo, outra, condicao) in enumerate(juncoes):
+            if i > 0:
+                clausula = f"({clausula})"
+            clausula = f"{clausula} {tipo} {outra} ON {condicao}"
+        return clausula
+
+    def coalesce(self, expressao, padrao):
+        """Substitui NULL por um valor padrão"""
+        return f"IIf(IsNull({expressao}), {padrao}, {expressao})"
+
+    def comprimento(self, expressao):
+        """Número de caracteres de um texto"""
+        return f"LEN({expressao})"
+
+    def escalares(self, agregados):
+        """
+        SELECT de uma linha com várias agregações, uma por tabela
+
+        O Access não aceita subconsultas em um SELECT sem FROM: cada
+        agregação vira uma tabela derivada de uma linha, e elas são
+        combinadas por produto cartesiano.
+
+        Args:
+            agregados (list): Pares (expressão, tabela), ex.:
+                ("COUNT(*)", "pessoa_fisica")
+        """
+        colunas = ", ".join(f"e{i}.valor" for i in range(len(agregados)))
+        tabelas = ", ".join(
+            f"(SELECT {expressao} AS valor FROM {tabela}) AS e{i}"
+            for i, (expressao, tabela) in enumerate(agregados)
+        )
+        return f"SELECT {colunas} FROM {tabelas}"
+
+    def chave_texto(self, valor):
+        """Forma de um valor usada para compará-lo como o operador = do banco"""
+        # Comparações de texto no Access não diferenciam maiúsculas
+        return str(valor).lower()
+
+    def tabela_existe(self, cursor, tabela):
+        """Indica se a tabela existe (consulta o catálogo do ODBC)"""
+        return cursor.tables(table=tabela, tableType="TABLE").fetchone() is not None
+
+    def colunas(self, cursor, tabela):
+        """Nomes das colunas da tabela"""
+        return [linha[3] for linha in cursor.columns(table=tabela).fetchall()]
+
+    def coluna_indexada(self, cursor, tabela, coluna):
+        """Indica se algum índice da tabela começa pela coluna"""
+        # Linhas de SQLStatistics: ..., INDEX_NAME (5), ..., ORDINAL_POSITION (7), COLUMN_NAME (8)
+        return any(
+            linha[5] and linha[7] == 1 and (linha[8] or "").lower() == coluna.lower()
+            for linha in cursor.statistics(tabela).fetchall()
+        )
+
+
+class DialetoSQLite:
+    """Particularidades do SQL do SQLite"""
+
+    nome = "sqlite"
+
+    def quote(self, identificador):
+        """Protege um nome de tabela ou coluna"""
+        return f'"{identificador}"'
+
+    def ultimo_id(self, cursor):
+        """Retorna o ID gerado pelo último INSERT do cursor"""
+        return cursor.lastrowid
+
+    def limitar(self, consulta, limite):
+        """Restringe um SELECT às primeiras `limite` linhas (LIMIT n)"""
+        return f"{consulta.rstrip().rstrip(';')} LIMIT {int(limite)}"
+
+    def paginar(self, cursor, consulta, params, limite, deslocamento=0):
+        """Executa um SELECT ordenado e retorna apenas uma página de linhas"""
+        cursor.execute(
+            f"{consulta.rstrip().rstrip(';')} LIMIT ? OFFSET ?",
+            tuple(params or ()) + (int(limite), int(deslocamento)),
+        )
+        return cursor.fetchall()
+
+    def juntar(self, tabela, juncoes):
+        """Monta a cláusula FROM com várias junções"""
+        partes = [tabela]
+        for tipo, outra, condicao in juncoes:
+            partes.append(f"{tipo} {outra} ON {condicao}")
+        return " ".join(partes)
+
+    def coalesce(self, expressao, padrao):
+        """Substitui NULL por um valor padrão"""
+        return f"COALESCE({expressao}, {padrao})"
+
+    def comprimento(self, expressao):
+        """Número de caracteres de um texto"""
+        return f"LENGTH({expressao})"
+
+    def escalares(self, agregados):
+        """SELECT de uma linha com várias agregações, uma por tabela"""
+        colunas = ", ".join(
+            f"(SELECT {expressao} FROM {tabela})" for expressao, tabela in agregados
+        )
+        return f"SELECT {colunas}"
+
+    def chave_texto(self, valor):
+        """Forma de um valor usada para compará-lo como o operador = do banco"""
+        return str(valor)
+
+    def tabela_existe(self, cursor, tabela):
+        """Indica se a tabela existe"""
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (tabela,)
+        )
+        return cursor.fetchone() is not None
+
+    def colunas(self, cursor, tabela):
+        """Nomes das colunas da tabela"""
+        cursor.execute(f"PRAGMA table_info({self.quote(tabela)})")
+        return [linha[1] for linha in cursor.fetchall()]
+
+    def coluna_indexada(self, cursor, tabela, coluna):
+        """Indica se algum índice da tabela começa pela coluna"""
+        cursor.execute(f"PRAGMA index_list({self.quote(tabela)})")
+        for indice in [linha[1] for linha in cursor.fetchall()]:
+            cursor.execute(f"PRAGMA index_info({self.quote(indice)})")
+            if any(linha[0] == 0 and linha[2] == coluna for linha in cursor.fetchall()):
+                return True
+        return False
+
+
+_DIALETOS = {
+    "access": DialetoAccess(),
+    "sqlite": DialetoSQLite(),
+}
+
+_backend_nome = None
+_motor = None
+
+# Conexão da unidade de trabalho ativa em cada thread (ver transacao())
+_local = threading.local()
+
+
+class ConexaoTransacao:
+    """
+    Conexão compartilhada por uma unidade de trabalho
+
+    commit(), rollback() e close() chamados pelos models são ignorados:
+    quem decide o desfecho é o bloco transacao() que abriu a conexão.
+    """
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def __getattr__(self, nome):
+        return getattr(self._conn, nome)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def configurar(backend=None, caminho=None):
+    """
+    Seleciona o motor de banco de dados
+
+    Sem argumentos, usa as variáveis de ambiente SISPROJ_DB_BACKEND e
+    SISPROJ_DB_PATH.
+
+    Args:
+        backend (str, optional): "access" ou "sqlite"
+        caminho (str, optional): Caminho do arquivo do banco
+    """
+    global _backend_nome, _motor
+
+    backend = (backend or os.environ.get("SISPROJ_DB_BACKEND") or BACKEND_PADRAO).lower()
+    if backend not in _MOTORES:
+        raise ValueError(
+            f"Backend '{backend}' inválido. Opções: {', '.join(sorted(_MOTORES))}"
+        )
+
+    # Fecha as conexões do motor anterior antes de trocar
+    if _motor is not None and hasattr(_motor, "fechar_conexoes"):
+        _motor.fechar_conexoes()
+
+    motor = importlib.import_module(_MOTORES[backend])
+
+    caminho = caminho or os.environ.get("SISPROJ_DB_PATH")
+    if caminho:
+        motor.DB_PATH = os.path.abspath(caminho)
+        if hasattr(motor, "fechar_conexoes"):
+            motor.fechar_conexoes()
+
+    _backend_nome = backend
+    _motor = motor
+
+
+def _get_motor():
+    if _motor is None:
+        configurar()
+    return _motor
+
+
+def get_backend_nome():
+    """Retorna o nome do motor em uso ("access" ou "sqlite")"""
+    _get_motor()
+    return _backend_nome
+
+
+def get_dialeto():
+    """Retorna o dialeto SQL do motor em uso"""
+    _get_motor()
+    return _DIALETOS[_backend_nome]
+
+
+def get_connection():
+    """
+    Retorna uma conexão com o banco de dados configurado
+
+    Dentro de um bloco transacao() retorna a conexão da unidade de trabalho.
+    Com a instrumentação ativa (ver models.instrumentacao), a conexão mede
+    as consultas executadas.
+    """
+    conexao = getattr(_local, "conexao", None)
+    if conexao is not None:
+        return conexao
+    return instrumentacao.instrumentar(_get_motor().get_connection())
+
+
+def em_transacao():
+    """Indica se a thread atual está dentro de um bloco transacao()"""
+    return getattr(_local, "conexao", None) is not None
+
+
+@contextmanager
+def transacao():
+    """
+    Unidade de trabalho: agrupa várias chamadas aos models em um único commit
+
+    Todas as chamadas a get_connection() feitas no bloco (na mesma thread)
+    recebem a mesma conexão. O commit acontece ao final do bloco e qualquer
+    exceção desfaz tudo. Blocos aninhados participam da transação externa.
+
+    Exemplo:
+        with transacao():
+            id_aditivo = create_aditivo_pf(...)
+            update_total_contrato(id_contrato)
+            log_action(usuario, acao)
+    """
+    conexao = getattr(_local, "conexao", None)
+    if conexao is not None:
+        yield conexao
+        return
+
+    conn = instrumentacao.instrumentar(_get_motor().get_connection())
+    _local.conexao = ConexaoTransacao(conn)
+    try:
+        yield _local.conexao
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        _local.conexao = None
+        conn.close()
+        # Outras threads podem ter guardado no cache valores lidos antes do commit
+        from .cache import cache_leituras
+
+        cache_leituras.limpar()
+
+
+def init_db():
+    """Inicializa o banco de dados configurado e cria tabelas caso não existam"""
+    return _get_motor().init_db()
+
+
+def preparar_banco():
+    """
+    Deixa o banco pronto para uso com o menor custo possível
+
+    No caso normal (esquema já na última versão) basta uma consulta a
+    schema_version; só quando há migrações pendentes init_db() é executado.
+
+    Returns:
+        bool: True se foi preciso aplicar migrações
+    """
+    from .migrations import esquema_atualizado
+
+    conn = get_connection()
+    try:
+        if esquema_atualizado(conn.cursor()):
+            return False
+    finally:
+        conn.close()
+
+    init_db()
+    return True
+
+
+def get_lists_data():
+    """Retorna os dados das tabelas de listas"""
+    from .listas import registro_listas
+
+    try:
+        return registro_listas.dados()
+    except Exception as e:
+        print(f"Erro ao buscar dados da tabela lists: {e}")
+        # Se houver erro, retornar valores padrão
+        return {
+            'exercicios': [],
+            'lotacoes': [],
+            'solicitantes': [],
+            'modalidades': ["BOLSA", "PRODUTO", "RPA", "CLT"],  # valores padrão
+            'naturezas': ["NOVO", "RENOVAÇÃO"],  # valores padrão
+            'status': ["VIGENTE", "PENDENTE_ASSINATURA", "CANCELADO", "CONCLUIDO", "EM_TRAMITACAO", "AGUARDANDO_AUTORIZACAO", "NAO_AUTORIZADO", "RESCINDIDO"]  # valores padrão
+        }
+
+
+def validate_list_value(cursor, column_name, value):
+    """
+    Valida se um valor existe na coluna especificada da tabela lists
+
+    A consulta é feita em memória (ver models.listas.RegistroListas); o
+    cursor só é usado se for preciso conferir se a tabela mudou.
+    """
+    from .listas import registro_listas
+
+    return registro_listas.validar(column_name, value, cursor)
@@ -0,0 +1,159 @@
+# Datas.Py
+"""
+Formato canônico das datas gravadas no banco.
+
+As colunas de data guardam texto AAAA-MM-DD (e AAAA-MM-DD HH:MM:SS nas de
+data e hora), que ordena como a própria data: filtros de período viram
+comparações simples no SQL e usam os índices das colunas. As funções de
+gravação dos models passam as datas por data_iso(), que aceita o formato
+das telas (DD/MM/AAAA), o ISO e objetos date/datetime.
+"""
+import re
+from datetime import date, datetime
+
+# Colunas só de data: (tabela, chave primária, colunas)
+COLUNAS_DATA = [
+    ("demanda", "codigo", ("data_entrada", "data_protocolo")),
+    ("contrato_pf", "id", ("vigencia_inicial", "vigencia_final")),
+    (
+        "aditivo_pf",
+        "id",
+        ("data_entrada", "data_protocolo", "vigencia_inicial", "vigencia_final"),
+    ),
+    ("produto_pf", "id", ("data_programada", "data_entrega")),
+]
+
+# Colunas de data e hora gravadas como texto
+COLUNAS_DATA_HORA = [
+    ("pessoa_fisica", "id", ("data_cadastro",)),
+]
+
+_ISO = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})(?:[ T](\d{1,2}):(\d{2})(?::(\d{2}))?)?")
+_BR = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})(?:\s+(\d{1,2}):(\d{2})(?::(\d{2}))?)?")
+
+
+def _interpretar(valor):
+    """
+    Converte o valor para datetime
+
+    Returns:
+        datetime | None: None se o texto não for uma data reconhecida
+    """
+    if isinstance(valor, datetime):
+        return valor
+    if isinstance(valor, date):
+        return datetime(valor.year, valor.month, valor.day)
+
+    texto = str(valor).strip()
+    encontrado = _ISO.fullmatch(texto)
+    if encontrado:
+        ano, mes, dia, hora, minuto, segundo = encontrado.groups()
+    else:
+        encontrado = _BR.fullmatch(texto)
+        if not encontrado:
+            return None
+        dia, mes, ano, hora, minuto, segundo = encontrado.groups()
+
+    try:
+        return datetime(
+            int(ano), int(mes), int(dia), int(hora or 0), int(minuto or 0), int(segundo or 0)
+        )
+    except ValueError:
+        return None
+
+
+def normalizar(valor, com_hora=False):
+    """
+    Formato canônico de uma data, sem validação
+
+    Args:
+        valor: Data (texto em qualquer formato aceito, date ou datetime)
+        com_hora (bool): Inclui a hora (AAAA-MM-DD HH:MM:SS)
+
+    Returns:
+        O texto canônico, None para valores vazios ou o próprio valor se
+        ele não for uma data reconhecida
+    """
+    if valor is None or (isinstance(valor, str) and not valor.strip()):
+        return None
+
+    momento = _interpretar(valor)
+    if momento is None:
+        return valor
+    if com_hora:
+        return momento.strftime("%Y-%m-%d %H:%M:%S")
+    return momento.strftime("%Y-%m-%d")
+
+
+def data_iso(valor):
+    """
+    Data no formato gravado no banco (AAAA-MM-DD)
+
+    Args:
+        valor: Texto DD/MM/AAAA ou AAAA-MM-DD (com ou sem hora), date,
+            datetime ou vazio
+
+    Returns:
+        str | None: Data canônica (None para valores vazios)
+
+    Raises:
+        ValueError: Se o valor não for uma data válida
+    """
+    canonica = normalizar(valor)
+    if canonica is not None and canonica is valor:
+        raise ValueError(f"Data inválida: '{valor}' (use DD/MM/AAAA)")
+    return canonica
+
+
+def data_hora_iso(valor=None):
+    """
+    Data e hora no formato gravado no banco (AAAA-MM-DD HH:MM:SS)
+
+    Args:
+        valor (optional): Data e hora a converter (padrão: agora)
+
+    Returns:
+        str: Data e hora canônica
+
+    Raises:
+        ValueError: Se o valor não for uma data válida
+    """
+    if valor is None:
+        valor = datetime.now()
+    canonica = normalizar(valor, com_hora=True)
+    if canonica is valor:
+        raise ValueError(f"Data inválida: '{valor}' (use DD/MM/AAAA HH:MM:SS)")
+    return canonica
+
+
+def filtro_periodo(coluna, inicio=None, fim=None, incluir_vazias=False):
+    """
+    Condições SQL de um filtro de período sobre uma coluna de data
+
+    Args:
+        coluna (str): Expressão da coluna (ex.: "p.data_programada")
+        inicio (optional): Data mínima (inclusive); vazio = sem limite
+        fim (optional): Data máxima (inclusive); vazio = sem limite
+        incluir_vazias (bool): Mantém as linhas sem data (coluna NULL)
+
+    Returns:
+        tuple: (condições, parâmetros), para juntar com AND na cláusula WHERE
+
+    Raises:
+        ValueError: Se um dos limites não for uma data válida
+    """
+    condicoes, params = [], []
+    inicio = data_iso(inicio)
+    if inicio:
+        condicoes.append(f"{coluna} >= ?")
+        params.append(inicio)
+
+    fim = data_iso(fim)
+    if fim:
+        condicoes.append(f"{coluna} <= ?")
+        params.append(fim)
+
+    if incluir_vazias and condicoes:
+        condicoes = [f"({coluna} IS NULL OR ({' AND '.join(condicoes)}))"]
+
+    return condicoes, params
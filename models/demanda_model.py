@@ -1,5 +1,9 @@
 # Demanda Model.Py
-from .db_manager_access import get_connection, validate_list_value
+from .database import get_connection, get_dialeto, validate_list_value
+from .datas import data_iso
+from .registros import CAMPOS_DEMANDA, Demanda, colunas, registro, registros
+
+_COLUNAS = colunas(CAMPOS_DEMANDA)
 
 
 def create_demanda(data_entrada, solicitante, data_protocolo, oficio, nup_sei):
@@ -19,6 +23,10 @@ def create_demanda(data_entrada, solicitante, data_protocolo, oficio, nup_sei):
     Raises:
         ValueError: Se o solicitante não existir na tabela lists
     """
+    # Datas no formato do banco (AAAA-MM-DD)
+    data_entrada = data_iso(data_entrada)
+    data_protocolo = data_iso(data_protocolo)
+
     conn = get_connection()
     cursor = conn.cursor()
     
@@ -35,9 +43,8 @@ def create_demanda(data_entrada, solicitante, data_protocolo, oficio, nup_sei):
             (data_entrada, solicitante, data_protocolo, oficio, nup_sei),
         )
 
-        # Obter o ID da demanda inserida usando SELECT @@IDENTITY
-        cursor.execute("SELECT @@IDENTITY")
-        demanda_id = cursor.fetchone()[0]
+        # Obter o ID da demanda inserida
+        demanda_id = get_dialeto().ultimo_id(cursor)
         
         conn.commit()
         return demanda_id
@@ -54,15 +61,15 @@ def get_all_demandas():
     Retorna todas as demandas
 
     Returns:
-        list: Lista de tuplas com as demandas
+        list: Registros Demanda com as demandas
     """
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT * FROM demanda ORDER BY codigo DESC")
+    cursor.execute(f"SELECT {_COLUNAS} FROM demanda ORDER BY codigo DESC")
     demandas = cursor.fetchall()
     conn.close()
 
-    return [tuple(demanda) for demanda in demandas]
+    return registros(Demanda, demandas)
 
 
 def get_demanda_by_id(codigo):
@@ -73,17 +80,15 @@ def get_demanda_by_id(codigo):
         codigo (int): Código da demanda
 
     Returns:
-        tuple: Dados da demanda ou None se não encontrada
+        Demanda: Dados da demanda ou None se não encontrada
     """
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT * FROM demanda WHERE codigo=?", (codigo,))
+    cursor.execute(f"SELECT {_COLUNAS} FROM demanda WHERE codigo=?", (codigo,))
     demanda = cursor.fetchone()
     conn.close()
 
-    if demanda:
-        return tuple(demanda)
-    return None
+    return registro(Demanda, demanda)
 
 
 def update_demanda(codigo, data_entrada, solicitante, data_protocolo, oficio, nup_sei):
@@ -101,6 +106,10 @@ def update_demanda(codigo, data_entrada, solicitante, data_protocolo, oficio, nu
     Raises:
         ValueError: Se o solicitante não existir na tabela lists
     """
+    # Datas no formato do banco (AAAA-MM-DD)
+    data_entrada = data_iso(data_entrada)
+    data_protocolo = data_iso(data_protocolo)
+
     conn = get_connection()
     cursor = conn.cursor()
     
@@ -0,0 +1,316 @@
+# Indice Pessoas.Py
+"""
+Índice em memória das pessoas físicas para busca por nome ou CPF.
+
+Os nomes são quebrados em palavras normalizadas (sem acentos e sem
+diferença entre maiúsculas e minúsculas) mantidas em uma lista ordenada;
+cada palavra digitada é procurada como prefixo por busca binária, e o
+resultado são os IDs das pessoas que têm todas as palavras. Assim a busca
+acompanha a digitação mesmo com dezenas de milhares de pessoas.
+"""
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from functools import lru_cache
+
+from .database import get_connection, get_dialeto
+from .pessoa_fisica_model import get_all_pessoas_fisicas, get_pessoa_fisica_by_id
+
+# Quantidade padrão de resultados retornados por buscar()
+LIMITE_RESULTADOS = 20
+
+# Acima desta quantidade de candidatos, buscar() percorre a ordem alfabética
+# já calculada em vez de ordenar os candidatos
+_LIMITE_ORDENACAO = 2000
+
+# Termos formados só por estes caracteres também são procurados no CPF
+_PADRAO_CPF = re.compile(r"[\d.\-/\s]+")
+
+_PADRAO_PALAVRA = re.compile(r"\w+")
+_PADRAO_NAO_DIGITO = re.compile(r"\D")
+
+
+@lru_cache(maxsize=50000)
+def _normalizar_palavra(palavra):
+    if palavra.isascii():
+        return palavra.casefold()
+    palavra = unicodedata.normalize("NFKD", palavra)
+    return "".join(c for c in palavra if not unicodedata.combining(c)).casefold()
+
+
+def normalizar(texto):
+    """Remove acentos e converte para minúsculas ("José" -> "jose")"""
+    # Nomes e sobrenomes se repetem muito; cada palavra é normalizada uma vez
+    return " ".join(map(_normalizar_palavra, str(texto or "").split()))
+
+
+def _palavras(texto):
+    return _PADRAO_PALAVRA.findall(normalizar(texto))
+
+
+def _digitos(texto):
+    return _PADRAO_NAO_DIGITO.sub("", str(texto or ""))
+
+
+def _ids_com_prefixo(lista, prefixo):
+    """IDs das entradas (chave, id) da lista ordenada cuja chave começa com prefixo"""
+    ids = set()
+    i = bisect_left(lista, (prefixo,))
+    while i < len(lista) and lista[i][0].startswith(prefixo):
+        ids.add(lista[i][1])
+        i += 1
+    return ids
+
+
+class IndicePessoas:
+    """
+    Índice de nomes e CPFs das pessoas físicas
+
+    É carregado na primeira busca e atualizado pelos controllers a cada
+    cadastro, edição ou exclusão. Alterações feitas por outra estação são
+    percebidas pela assinatura da tabela (quantidade de linhas, maior ID e
+    soma dos comprimentos dos nomes), conferida no máximo a cada
+    `intervalo` segundos.
+    """
+
+    def __init__(self, intervalo=60.0):
+        """
+        Args:
+            intervalo (float): Segundos entre conferências da assinatura
+        """
+        self.intervalo = intervalo
+        self._pessoas = None  # id -> registro PessoaFisica
+        self._chaves = {}  # id -> (nome normalizado, id), para ordenação
+        self._palavras = []  # Lista ordenada de (palavra, id)
+        self._cpfs = []  # Lista ordenada de (dígitos do CPF, id)
+        self._ordem = None  # (nome normalizado, id) em ordem alfabética, sob demanda
+        self._assinatura = None
+        self._conferido_em = 0.0
+        self._lock = threading.RLock()
+
+    def carregar(self):
+        """Garante que o índice está carregado e atualizado (pode rodar em segundo plano)"""
+        self._garantir_atual()
+
+    def invalidar(self):
+        """Força a conferência da assinatura na próxima busca"""
+        self._conferido_em = 0.0
+
+    def buscar(self, termo, limite=LIMITE_RESULTADOS):
+        """
+        Busca pessoas pelo início das palavras do nome ou do CPF
+
+        "jo sil" encontra "João da Silva"; "123.4" encontra o CPF 123.456.789-00.
+
+        Args:
+            termo (str): Texto digitado
+            limite (int, optional): Quantidade máxima de resultados (None para todos)
+
+        Returns:
+            list: IDs das pessoas encontradas, as que começam pelo termo
+                primeiro e depois em ordem alfabética (termo vazio: todas,
+                em ordem alfabética)
+        """
+        palavras = _palavras(termo)
+        if not palavras:
+            ids = self.listar()
+            return ids if limite is None else ids[:limite]
+
+        self._garantir_atual()
+
+        with self._lock:
+            candidatos = None
+            # As palavras mais longas são as mais seletivas
+            for palavra in sorted(palavras, key=len, reverse=True):
+                ids = _ids_com_prefixo(self._palavras, palavra)
+                candidatos = ids if candidatos is None else candidatos & ids
+                if not candidatos:
+                    break
+
+            if _PADRAO_CPF.fullmatch(termo.strip()):
+                digitos = _digitos(termo)
+                if digitos:
+                    candidatos |= _ids_com_prefixo(self._cpfs, digitos)
+
+            inicio = " ".join(palavras)
+            chaves = self._chaves
+
+            if limite is not None and len(candidatos) > _LIMITE_ORDENACAO:
+                # Muitos candidatos (termo curto): percorre a ordem alfabética
+                # até completar o limite em vez de ordenar todos
+                return self._primeiros(candidatos, inicio, limite)
+
+            def ordem(id_pessoa):
+                chave = chaves[id_pessoa]
+                return (not chave[0].startswith(inicio), chave)
+
+            if limite is None:
+                return sorted(candidatos, key=ordem)
+            return heapq.nsmallest(limite, candidatos, key=ordem)
+
+    def listar(self):
+        """
+        Returns:
+            list: IDs de todas as pessoas em ordem alfabética
+        """
+        self._garantir_atual()
+        with self._lock:
+            return [id_pessoa for _, id_pessoa in self._ordenados()]
+
+    def _ordenados(self):
+        """Lista de (nome normalizado, id) em ordem alfabética"""
+        if self._ordem is None:
+            self._ordem = sorted(self._chaves.values())
+        return self._ordem
+
+    def _primeiros(self, candidatos, inicio, limite):
+        """Os primeiros candidatos da ordem de buscar(), sem ordenar o conjunto"""
+        ordem = self._ordenados()
+
+        # Os nomes que começam pelo termo formam um bloco contíguo na ordem
+        resultado = []
+        i = bisect_left(ordem, (inicio,))
+        while i < len(ordem) and len(resultado) < limite:
+            nome, id_pessoa = ordem[i]
+            if not nome.startswith(inicio):
+                break
+            if id_pessoa in candidatos:
+                resultado.append(id_pessoa)
+            i += 1
+
+        escolhidos = set(resultado)
+        for _, id_pessoa in ordem:
+            if len(resultado) >= limite:
+                break
+            if id_pessoa in candidatos and id_pessoa not in escolhidos:
+                resultado.append(id_pessoa)
+        return resultado
+
+    def obter(self, id_pessoa):
+        """
+        Returns:
+            PessoaFisica: Registro indexado da pessoa ou None
+        """
+        self._garantir_atual()
+        with self._lock:
+            return self._pessoas.get(int(id_pessoa))
+
+    def rotulo(self, id_pessoa):
+        """
+        Texto que identifica a pessoa em uma lista de seleção
+
+        Inclui o CPF (ou o ID, se não houver CPF) para distinguir homônimos.
+        """
+        pessoa = self.obter(id_pessoa)
+        if pessoa is None:
+            return ""
+        if pessoa.cpf:
+            return f"{pessoa.nome_completo} - CPF {pessoa.cpf}"
+        return f"{pessoa.nome_completo} - ID {pessoa.id}"
+
+    def atualizar(self, id_pessoa):
+        """Reindexa uma pessoa após cadastro ou edição"""
+        with self._lock:
+            if self._pessoas is None:
+                return
+            pessoa = get_pessoa_fisica_by_id(id_pessoa)
+            self._remover(int(id_pessoa))
+            if pessoa is not None:
+                self._adicionar(pessoa, ordenado=True)
+            self._assinatura = None
+
+    def remover(self, id_pessoa):
+        """Retira uma pessoa excluída do índice"""
+        with self._lock:
+            if self._pessoas is None:
+                return
+            self._remover(int(id_pessoa))
+            self._assinatura = None
+
+    def _adicionar(self, pessoa, ordenado):
+        self._ordem = None
+        id_pessoa = pessoa.id
+        nome = normalizar(pessoa.nome_completo)
+        self._pessoas[id_pessoa] = pessoa
+        self._chaves[id_pessoa] = (nome, id_pessoa)
+
+        entradas = [(palavra, id_pessoa) for palavra in set(_PADRAO_PALAVRA.findall(nome))]
+        cpf = _digitos(pessoa.cpf)
+        if ordenado:
+            for entrada in entradas:
+                insort(self._palavras, entrada)
+            if cpf:
+                insort(self._cpfs, (cpf, id_pessoa))
+        else:
+            self._palavras.extend(entradas)
+            if cpf:
+                self._cpfs.append((cpf, id_pessoa))
+
+    def _remover(self, id_pessoa):
+        self._ordem = None
+        pessoa = self._pessoas.pop(id_pessoa, None)
+        self._chaves.pop(id_pessoa, None)
+        if pessoa is None:
+            return
+
+        for palavra in set(_palavras(pessoa.nome_completo)):
+            i = bisect_left(self._palavras, (palavra, id_pessoa))
+            if i < len(self._palavras) and self._palavras[i] == (palavra, id_pessoa):
+                del self._palavras[i]
+
+        cpf = _digitos(pessoa.cpf)
+        if cpf:
+            i = bisect_left(self._cpfs, (cpf, id_pessoa))
+            if i < len(self._cpfs) and self._cpfs[i] == (cpf, id_pessoa):
+                del self._cpfs[i]
+
+    def _atual(self):
+        return (
+            self._pessoas is not None
+            and time.monotonic() - self._conferido_em < self.intervalo
+        )
+
+    def _garantir_atual(self):
+        if self._atual():
+            return
+
+        with self._lock:
+            if self._atual():
+                return
+
+            assinatura = self._ler_assinatura()
+            if self._pessoas is None or (
+                self._assinatura is not None and assinatura != self._assinatura
+            ):
+                self._carregar()
+            self._assinatura = assinatura
+            self._conferido_em = time.monotonic()
+
+    @staticmethod
+    def _ler_assinatura():
+        comprimento = get_dialeto().comprimento("nome_completo")
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT COUNT(*), MAX(id), SUM({comprimento}) FROM pessoa_fisica"
+            )
+            return tuple(cursor.fetchone())
+        finally:
+            conn.close()
+
+    def _carregar(self):
+        self._pessoas = {}
+        self._chaves = {}
+        self._palavras = []
+        self._cpfs = []
+        for pessoa in get_all_pessoas_fisicas():
+            self._adicionar(pessoa, ordenado=False)
+        self._palavras.sort()
+        self._cpfs.sort()
+
+
+indice_pessoas = IndicePessoas()
@@ -0,0 +1,396 @@
+# Instrumentacao.Py
+"""
+Medição das consultas feitas ao banco.
+
+Quando ativada, get_connection() entrega conexões instrumentadas: cada
+instrução executada é cronometrada (execução e leitura das linhas) e
+registrada com o texto SQL, a quantidade de parâmetros, as linhas
+retornadas e a função do controller (ou da tela) que a originou. Os
+models não mudam: a instrumentação fica toda na camada de conexão.
+
+Ativação sem alterar código, pelas variáveis de ambiente:
+    SISPROJ_INSTRUMENTACAO=1           ativa a medição
+    SISPROJ_CONSULTA_LENTA_MS=200      limite do log de consultas lentas
+    SISPROJ_LOG_CONSULTAS=arquivo.log  arquivo do log (rotativo)
+
+ou em tempo de execução com ativar() e desativar().
+
+Os agregados por formato de instrução (o SQL com os literais trocados por
+"?") ficam em memória no processo: ver estatisticas() e relatorio().
+"""
+import atexit
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+
+LIMITE_LENTA_PADRAO_MS = 200
+
+ARQUIVO_LOG_PADRAO = os.path.join(
+    os.path.dirname(__file__), "..", "consultas_lentas.log"
+)
+
+# Rotação do log de consultas lentas
+TAMANHO_MAXIMO_LOG = 1024 * 1024
+ARQUIVOS_LOG_ANTIGOS = 5
+
+# Durações guardadas por formato de instrução para os percentis
+AMOSTRAS_POR_FORMATO = 1000
+
+# Módulos cujas funções são apontadas como origem da consulta, em ordem de
+# preferência: o controller que atende a tela e, sem controller, a própria tela
+_ORIGENS = ("controllers.", "views.", "utils.", "benchmarks.", "__main__")
+
+_PADRAO_TEXTO = re.compile(r"'(?:[^']|'')*'")
+_PADRAO_NUMERO = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PADRAO_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_PADRAO_ESPACOS = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def formato(sql):
+    """
+    Forma canônica de uma instrução, usada para agrupar as medições
+
+    Literais viram "?", listas IN (?, ?, ...) viram "(?...)" e os espaços
+    são normalizados.
+    """
+    sql = _PADRAO_TEXTO.sub("?", sql)
+    sql = _PADRAO_NUMERO.sub("?", sql)
+    sql = _PADRAO_LISTA.sub("(?...)", sql)
+    return _PADRAO_ESPACOS.sub(" ", sql).strip()
+
+
+def _origem():
+    """Função (modulo.funcao) que originou a consulta"""
+    quadro = sys._getframe(2)
+    for prefixo in _ORIGENS:
+        atual = quadro
+        while atual is not None:
+            modulo = atual.f_globals.get("__name__", "")
+            if modulo.startswith(prefixo):
+                return f"{modulo}.{atual.f_code.co_name}"
+            atual = atual.f_back
+    return "?"
+
+
+class Medicao:
+    """Uma instrução executada"""
+
+    __slots__ = ("sql", "parametros", "valores", "linhas", "duracao", "origem", "inicio")
+
+    def __init__(self, sql, parametros, origem, valores=None):
+        self.sql = sql
+        self.parametros = parametros
+        self.valores = valores
+        self.origem = origem
+        self.linhas = 0
+        self.duracao = 0.0
+        self.inicio = time.time()
+
+
+class Instrumentacao:
+    """
+    Coletor das medições do processo
+
+    Mantém, por formato de instrução, a quantidade de execuções, o tempo
+    total, o máximo de linhas e as últimas durações (para p50/p95), e grava
+    as instruções acima do limite no log rotativo de consultas lentas.
+    """
+
+    def __init__(self):
+        self.ativa = False
+        self.limite_lenta = LIMITE_LENTA_PADRAO_MS / 1000
+        self._formatos = {}
+        self._ouvintes = []
+        self._lock = threading.Lock()
+        self._log = logging.getLogger("sisproj.consultas_lentas")
+        self._log.propagate = False
+        self._arquivo_log = None
+
+    def configurar_ambiente(self):
+        """Lê as variáveis de ambiente SISPROJ_INSTRUMENTACAO e afins"""
+        if os.environ.get("SISPROJ_INSTRUMENTACAO", "").lower() in ("1", "sim", "true"):
+            limite = os.environ.get("SISPROJ_CONSULTA_LENTA_MS")
+            self.ativar(
+                float(limite) if limite else None,
+                os.environ.get("SISPROJ_LOG_CONSULTAS"),
+            )
+            # Os agregados do processo vão para o log ao encerrar
+            atexit.register(self._gravar_relatorio)
+
+    def ativar(self, limite_lenta_ms=None, arquivo_log=None):
+        """
+        Passa a instrumentar as conexões obtidas a partir de agora
+
+        Args:
+            limite_lenta_ms (float, optional): Duração a partir da qual a
+                instrução vai para o log de consultas lentas
+            arquivo_log (str, optional): Arquivo do log de consultas lentas
+        """
+        if limite_lenta_ms is not None:
+            self.limite_lenta = limite_lenta_ms / 1000
+
+        arquivo_log = os.path.abspath(arquivo_log or self._arquivo_log or ARQUIVO_LOG_PADRAO)
+        if arquivo_log != self._arquivo_log:
+            for handler in list(self._log.handlers):
+                self._log.removeHandler(handler)
+                handler.close()
+            handler = RotatingFileHandler(
+                arquivo_log,
+                maxBytes=TAMANHO_MAXIMO_LOG,
+                backupCount=ARQUIVOS_LOG_ANTIGOS,
+                encoding="utf-8",
+                delay=True,
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self._log.addHandler(handler)
+            self._log.setLevel(logging.INFO)
+            self._arquivo_log = arquivo_log
+
+        self.ativa = True
+
+    def desativar(self):
+        """Conexões obtidas a partir de agora não são mais instrumentadas"""
+        self.ativa = False
+
+    def instrumentar(self, conn):
+        """Envolve a conexão se a instrumentação estiver ativa"""
+        if not self.ativa or isinstance(conn, ConexaoInstrumentada):
+            return conn
+        return ConexaoInstrumentada(conn, self)
+
+    def adicionar_ouvinte(self, ouvinte):
+        """
+        Registra uma função chamada com a Medicao de cada instrução executada
+
+        A função é chamada na thread que executou a instrução, logo após a
+        execução (antes da leitura das linhas).
+        """
+        with self._lock:
+            self._ouvintes.append(ouvinte)
+
+    def remover_ouvinte(self, ouvinte):
+        with self._lock:
+            if ouvinte in self._ouvintes:
+                self._ouvintes.remove(ouvinte)
+
+    def registrar(self, medicao):
+        """Contabiliza uma instrução concluída"""
+        chave = formato(medicao.sql)
+        with self._lock:
+            agregado = self._formatos.get(chave)
+            if agregado is None:
+                agregado = self._formatos[chave] = {
+                    "execucoes": 0,
+                    "tempo_total": 0.0,
+                    "linhas_max": 0,
+                    "duracoes": deque(maxlen=AMOSTRAS_POR_FORMATO),
+                    "origens": set(),
+                }
+            agregado["execucoes"] += 1
+            agregado["tempo_total"] += medicao.duracao
+            agregado["linhas_max"] = max(agregado["linhas_max"], medicao.linhas)
+            agregado["duracoes"].append(medicao.duracao)
+            agregado["origens"].add(medicao.origem)
+
+        if medicao.duracao >= self.limite_lenta:
+            self._log.info(
+                "%.1fms linhas=%d parametros=%d origem=%s sql=%s",
+                medicao.duracao * 1000,
+                medicao.linhas,
+                medicao.parametros,
+                medicao.origem,
+                _PADRAO_ESPACOS.sub(" ", medicao.sql).strip(),
+            )
+
+    def notificar(self, medicao):
+        """Repassa uma instrução recém-executada aos ouvintes"""
+        if self._ouvintes:
+            for ouvinte in list(self._ouvintes):
+                ouvinte(medicao)
+
+    def estatisticas(self):
+        """
+        Agregados por formato de instrução
+
+        Returns:
+            list: Dicionários com formato, execucoes, tempo_total, p50, p95
+                (segundos), linhas_max e origens, do maior tempo total para o menor
+        """
+        from statistics import quantiles
+
+        with self._lock:
+            itens = [
+                (chave, dict(agregado, duracoes=list(agregado["duracoes"])))
+                for chave, agregado in self._formatos.items()
+            ]
+
+        resultado = []
+        for chave, agregado in itens:
+            duracoes = agregado["duracoes"]
+            if len(duracoes) > 1:
+                percentis = quantiles(duracoes, n=100, method="inclusive")
+                p50, p95 = percentis[49], percentis[94]
+            else:
+                p50 = p95 = duracoes[0]
+            resultado.append(
+                {
+                    "formato": chave,
+                    "execucoes": agregado["execucoes"],
+                    "tempo_total": agregado["tempo_total"],
+                    "p50": p50,
+                    "p95": p95,
+                    "linhas_max": agregado["linhas_max"],
+                    "origens": sorted(agregado["origens"]),
+                }
+            )
+
+        resultado.sort(key=lambda item: item["tempo_total"], reverse=True)
+        return resultado
+
+    def relatorio(self, limite=20):
+        """Texto com as instruções de maior tempo total"""
+        linhas = [f"{'total':>10} {'exec':>6} {'p50':>9} {'p95':>9}  instrução"]
+        for item in self.estatisticas()[:limite]:
+            linhas.append(
+                f"{item['tempo_total'] * 1000:>8.1f}ms {item['execucoes']:>6} "
+                f"{item['p50'] * 1000:>7.2f}ms {item['p95'] * 1000:>7.2f}ms  "
+                f"{item['formato'][:120]}"
+            )
+            linhas.append(f"{'':>38}origem: {', '.join(item['origens'])}")
+        return "\n".join(linhas)
+
+    def _gravar_relatorio(self):
+        if self._formatos:
+            self._log.info("Resumo das consultas do processo:\n%s", self.relatorio())
+
+    def zerar(self):
+        """Descarta os agregados acumulados"""
+        with self._lock:
+            self._formatos.clear()
+
+
+class CursorInstrumentado:
+    """
+    Cursor que cronometra cada instrução
+
+    A medição de uma instrução inclui a leitura das linhas e é concluída
+    na próxima execução, ao fechar o cursor ou ao fechar a conexão.
+    """
+
+    def __init__(self, cursor, instrumentacao):
+        self._cursor = cursor
+        self._instrumentacao = instrumentacao
+        self._medicao = None
+
+    def __getattr__(self, nome):
+        return getattr(self._cursor, nome)
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def _executar(self, metodo, sql, parametros, quantidade, valores):
+        self.concluir()
+        medicao = Medicao(sql, quantidade, _origem(), valores)
+        inicio = time.perf_counter()
+        try:
+            metodo(sql, *parametros)
+        finally:
+            medicao.duracao = time.perf_counter() - inicio
+            self._medicao = medicao
+            self._instrumentacao.notificar(medicao)
+        return self
+
+    def execute(self, sql, *parametros):
+        if len(parametros) == 1 and isinstance(parametros[0], (tuple, list)):
+            valores = tuple(parametros[0])
+        else:
+            valores = parametros
+        return self._executar(self._cursor.execute, sql, parametros, len(valores), valores)
+
+    def executemany(self, sql, sequencia):
+        sequencia = list(sequencia)
+        quantidade = sum(len(linha) for linha in sequencia)
+        return self._executar(self._cursor.executemany, sql, (sequencia,), quantidade, None)
+
+    def _ler(self, metodo, *args):
+        inicio = time.perf_counter()
+        resultado = metodo(*args)
+        if self._medicao is not None:
+            self._medicao.duracao += time.perf_counter() - inicio
+            if isinstance(resultado, list):
+                self._medicao.linhas += len(resultado)
+            elif resultado is not None:
+                self._medicao.linhas += 1
+        return resultado
+
+    def fetchone(self):
+        return self._ler(self._cursor.fetchone)
+
+    def fetchall(self):
+        return self._ler(self._cursor.fetchall)
+
+    def fetchmany(self, *args):
+        return self._ler(self._cursor.fetchmany, *args)
+
+    def concluir(self):
+        """Registra a medição da última instrução, se houver"""
+        medicao, self._medicao = self._medicao, None
+        if medicao is not None:
+            self._instrumentacao.registrar(medicao)
+
+    def close(self):
+        self.concluir()
+        self._cursor.close()
+
+
+class ConexaoInstrumentada:
+    """Conexão cujos cursores são instrumentados"""
+
+    def __init__(self, conn, instrumentacao):
+        self._conn = conn
+        self._instrumentacao = instrumentacao
+        self._cursores = []
+
+    def __getattr__(self, nome):
+        return getattr(self.__dict__["_conn"], nome)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._concluir_cursores()
+        return self._conn.__exit__(exc_type, exc, tb)
+
+    def cursor(self, *args):
+        cursor = CursorInstrumentado(self._conn.cursor(*args), self._instrumentacao)
+        self._cursores.append(cursor)
+        return cursor
+
+    def execute(self, sql, *parametros):
+        """Atalho do sqlite3 (conn.execute) passando pelo cursor instrumentado"""
+        return self.cursor().execute(sql, *parametros)
+
+    def _concluir_cursores(self):
+        cursores, self._cursores = self._cursores, []
+        for cursor in cursores:
+            cursor.concluir()
+
+    def commit(self):
+        self._concluir_cursores()
+        self._conn.commit()
+
+    def close(self):
+        self._concluir_cursores()
+        self._conn.close()
+
+
+instrumentacao = Instrumentacao()
+instrumentacao.configurar_ambiente()
@@ -0,0 +1,143 @@
+# Listas.Py
+"""
+Registro em memória dos valores válidos da tabela lists.
+
+Cada coluna de lists é carregada uma vez em um frozenset, de modo que
+validar um campo não exige consulta ao banco.
+"""
+import threading
+import time
+
+from .database import get_connection, get_dialeto
+
+# Colunas da tabela lists e a chave usada por get_lists_data() para cada uma
+COLUNAS_LISTS = {
+    "exercicio": "exercicios",
+    "lotacao": "lotacoes",
+    "solicitante": "solicitantes",
+    "modalidade_contrato": "modalidades",
+    "natureza_demanda": "naturezas",
+    "status_contrato": "status",
+}
+
+
+class RegistroListas:
+    """
+    Domínios de valores válidos carregados da tabela lists
+
+    Os valores são recarregados apenas quando a assinatura da tabela
+    (quantidade de linhas, maior ID e soma dos comprimentos dos textos)
+    muda. A assinatura é conferida no máximo a cada `intervalo` segundos e
+    também antes de recusar um valor, para que um item recém-cadastrado por
+    outra estação não seja rejeitado.
+    """
+
+    def __init__(self, intervalo=30.0):
+        """
+        Args:
+            intervalo (float): Segundos entre conferências da assinatura
+        """
+        self.intervalo = intervalo
+        self._assinatura = None
+        self._conferido_em = 0.0
+        self._valores = None
+        self._chaves = None
+        self._lock = threading.Lock()
+
+    def invalidar(self):
+        """Força a conferência da assinatura na próxima consulta"""
+        self._conferido_em = 0.0
+
+    def valores(self, coluna):
+        """Retorna o frozenset de valores de uma coluna da tabela lists"""
+        self._garantir_atual()
+        return self._valores[coluna]
+
+    def dados(self):
+        """Valores de cada coluna de lists, ordenados (formato de get_lists_data)"""
+        self._garantir_atual()
+        return {
+            chave: sorted(self._valores[coluna])
+            for coluna, chave in COLUNAS_LISTS.items()
+        }
+
+    def validar(self, coluna, valor, cursor=None):
+        """
+        Indica se o valor existe na coluna da tabela lists
+
+        Args:
+            coluna (str): Coluna da tabela lists
+            valor: Valor a validar (None é sempre válido)
+            cursor: Cursor opcional usado para conferir a assinatura
+
+        Returns:
+            bool: True se o valor for válido
+        """
+        if valor is None:
+            return True
+
+        if coluna not in COLUNAS_LISTS:
+            raise ValueError(f"Coluna '{coluna}' não existe na tabela lists")
+
+        self._garantir_atual(cursor)
+        chave = get_dialeto().chave_texto(valor)
+        if chave in self._chaves[coluna]:
+            return True
+
+        # Antes de recusar, confere se a tabela mudou desde a última carga
+        self._garantir_atual(cursor, forcar=True)
+        return chave in self._chaves[coluna]
+
+    def _atual(self):
+        return (
+            self._valores is not None
+            and time.monotonic() - self._conferido_em < self.intervalo
+        )
+
+    def _garantir_atual(self, cursor=None, forcar=False):
+        if not forcar and self._atual():
+            return
+
+        with self._lock:
+            if not forcar and self._atual():
+                return
+
+            conn = None
+            if cursor is None:
+                conn = get_connection()
+                cursor = conn.cursor()
+
+            try:
+                assinatura = self._ler_assinatura(cursor)
+                if self._valores is None or assinatura != self._assinatura:
+                    self._carregar(cursor)
+                    self._assinatura = assinatura
+                self._conferido_em = time.monotonic()
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    @staticmethod
+    def _ler_assinatura(cursor):
+        comprimento = get_dialeto().comprimento
+        somas = ", ".join(f"SUM({comprimento(coluna)})" for coluna in COLUNAS_LISTS)
+        cursor.execute(f"SELECT COUNT(*), MAX(id), {somas} FROM lists")
+        return tuple(cursor.fetchone())
+
+    def _carregar(self, cursor):
+        chave_texto = get_dialeto().chave_texto
+        cursor.execute(f"SELECT {', '.join(COLUNAS_LISTS)} FROM lists")
+        linhas = cursor.fetchall()
+
+        valores = {}
+        chaves = {}
+        for i, coluna in enumerate(COLUNAS_LISTS):
+            valores[coluna] = frozenset(linha[i] for linha in linhas if linha[i])
+            chaves[coluna] = frozenset(
+                chave_texto(linha[i]) for linha in linhas if linha[i] is not None
+            )
+        self._valores = valores
+        self._chaves = chaves
+
+
+registro_listas = RegistroListas()
@@ -0,0 +1,231 @@
+# Migrations.Py
+"""
+Migrações versionadas do esquema do banco.
+
+Cada migração tem um número de versão e é aplicada uma única vez; as
+versões aplicadas ficam registradas na tabela schema_version. Os passos
+verificam o catálogo antes de alterar o banco (tabela, coluna ou índice já
+existente), de modo que podem ser repetidos com segurança em bancos
+criados por versões anteriores do sistema.
+
+As definições das tabelas de cada motor ficam no próprio motor
+(TABELAS em db_manager.py e db_manager_access.py).
+"""
+from datetime import datetime
+
+from .datas import COLUNAS_DATA, COLUNAS_DATA_HORA, normalizar
+
+# Índices de chaves estrangeiras e de colunas usadas em filtros:
+# (nome, tabela, coluna)
+INDICES = [
+    ("idx_contrato_pf_pessoa", "contrato_pf", "id_pessoa_fisica"),
+    ("idx_contrato_pf_demanda", "contrato_pf", "codigo_demanda"),
+    ("idx_contrato_pf_status", "contrato_pf", "status_contrato"),
+    ("idx_contrato_pf_modalidade", "contrato_pf", "modalidade"),
+    ("idx_aditivo_pf_contrato", "aditivo_pf", "id_contrato"),
+    ("idx_produto_pf_contrato", "produto_pf", "id_contrato"),
+    ("idx_pessoa_fisica_cpf", "pessoa_fisica", "cpf"),
+    ("idx_contrato_pf_vigencia_inicial", "contrato_pf", "vigencia_inicial"),
+    ("idx_contrato_pf_vigencia_final", "contrato_pf", "vigencia_final"),
+    ("idx_produto_pf_data_programada", "produto_pf", "data_programada"),
+    ("idx_produto_pf_data_entrega", "produto_pf", "data_entrega"),
+]
+
+
+def _criar_tabelas(cursor, dialeto, tabelas):
+    """Cria as tabelas que ainda não existem"""
+    for nome, ddl, posteriores in tabelas:
+        if dialeto.tabela_existe(cursor, nome):
+            continue
+
+        cursor.execute(ddl)
+        for instrucao, params in posteriores:
+            cursor.execute(instrucao, params)
+        print(f"Tabela {nome} criada com sucesso!")
+
+
+def _adicionar_lotacao_exercicio(cursor, dialeto, tabelas):
+    """Adiciona lotacao e exercicio a contratos criados antes dessas colunas"""
+    colunas = {coluna.lower() for coluna in dialeto.colunas(cursor, "contrato_pf")}
+    for coluna, tamanho in (("lotacao", 255), ("exercicio", 50)):
+        if coluna not in colunas:
+            cursor.execute(f"ALTER TABLE contrato_pf ADD COLUMN {coluna} VARCHAR({tamanho})")
+
+
+def _modalidade_maiuscula(cursor, dialeto, tabelas):
+    """
+    Converte as modalidades para maiúsculas
+
+    Bancos SQLite antigos têm um CHECK que só aceita minúsculas; nesse caso
+    a tabela é recriada com a definição atual antes da conversão.
+    """
+    if dialeto.nome == "sqlite":
+        cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type='table' AND name='contrato_pf'"
+        )
+        if "'BOLSA'" not in cursor.fetchone()[0]:
+            _recriar_contrato_pf_sqlite(cursor, dialeto, tabelas)
+
+    for modalidade in ("BOLSA", "PRODUTO", "RPA", "CLT"):
+        cursor.execute(
+            "UPDATE contrato_pf SET modalidade=? WHERE modalidade=?",
+            (modalidade, modalidade.lower()),
+        )
+
+
+def _recriar_contrato_pf_sqlite(cursor, dialeto, tabelas):
+    ddl = next(ddl for nome, ddl, _ in tabelas if nome == "contrato_pf")
+    colunas = dialeto.colunas(cursor, "contrato_pf")
+    selecao = [
+        "CASE WHEN modalidade IN ('bolsa', 'produto', 'rpa', 'clt') "
+        "THEN UPPER(modalidade) ELSE modalidade END"
+        if coluna == "modalidade"
+        else coluna
+        for coluna in colunas
+    ]
+
+    # Uma execução interrompida pode ter deixado a tabela nova para trás
+    cursor.execute("DROP TABLE IF EXISTS contrato_pf_nova")
+    cursor.execute(ddl.replace("CREATE TABLE contrato_pf", "CREATE TABLE contrato_pf_nova", 1))
+    cursor.execute(
+        f"INSERT INTO contrato_pf_nova ({', '.join(colunas)}) "
+        f"SELECT {', '.join(selecao)} FROM contrato_pf"
+    )
+    cursor.execute("DROP TABLE contrato_pf")
+    cursor.execute("ALTER TABLE contrato_pf_nova RENAME TO contrato_pf")
+    print("Tabela contrato_pf recriada com o constraint de modalidade atual.")
+
+
+def _criar_indices(cursor, dialeto, tabelas):
+    """Cria os índices de INDICES cuja coluna ainda não está indexada"""
+    for nome, tabela, coluna in INDICES:
+        if not dialeto.coluna_indexada(cursor, tabela, coluna):
+            cursor.execute(f"CREATE INDEX {nome} ON {tabela} ({coluna})")
+            print(f"Índice {nome} criado.")
+
+
+def _normalizar_datas(cursor, dialeto, tabelas):
+    """
+    Regrava as datas no formato canônico (ver models.datas)
+
+    Datas digitadas nas telas foram gravadas como DD/MM/AAAA e as da
+    migração da planilha como AAAA-MM-DD. Textos que não são datas
+    reconhecidas ficam como estão. Colunas DATETIME do Access devolvem
+    objetos datetime, que não precisam de conversão.
+    """
+    grupos = [(tabela, chave, colunas, False) for tabela, chave, colunas in COLUNAS_DATA]
+    grupos += [(tabela, chave, colunas, True) for tabela, chave, colunas in COLUNAS_DATA_HORA]
+
+    for tabela, chave, colunas, com_hora in grupos:
+        cursor.execute(f"SELECT {chave}, {', '.join(colunas)} FROM {tabela}")
+        alteracoes = []
+        for linha in cursor.fetchall():
+            valores = [
+                normalizar(valor, com_hora) if isinstance(valor, str) else valor
+                for valor in linha[1:]
+            ]
+            if valores != list(linha[1:]):
+                alteracoes.append((*valores, linha[0]))
+
+        if alteracoes:
+            atribuicoes = ", ".join(f"{coluna}=?" for coluna in colunas)
+            cursor.executemany(
+                f"UPDATE {tabela} SET {atribuicoes} WHERE {chave}=?", alteracoes
+            )
+            print(f"Datas de {len(alteracoes)} registros de {tabela} convertidas.")
+
+
+# Migrações em ordem: (versão, descrição, função)
+MIGRACOES = [
+    (1, "Tabelas iniciais", _criar_tabelas),
+    (2, "Colunas lotacao e exercicio em contrato_pf", _adicionar_lotacao_exercicio),
+    (3, "Modalidades de contrato em maiúsculas", _modalidade_maiuscula),
+    (4, "Índices de chaves estrangeiras e filtros", _criar_indices),
+    (5, "Tabela produto_seq (sequência de números de produto)", _criar_tabelas),
+    (6, "Datas no formato AAAA-MM-DD", _normalizar_datas),
+    (7, "Índices das colunas de data", _criar_indices),
+]
+
+
+# Versão do esquema esperada por este código
+VERSAO_ESQUEMA = MIGRACOES[-1][0]
+
+
+def esquema_atualizado(cursor):
+    """
+    Confere em uma única consulta se o banco já está na última versão
+
+    Usada na inicialização para evitar a consulta ao catálogo de migrar();
+    qualquer erro (por exemplo, schema_version ainda não existe) é tratado
+    como esquema desatualizado.
+
+    Returns:
+        bool: True se todas as migrações já foram aplicadas
+    """
+    try:
+        cursor.execute("SELECT MAX(versao) FROM schema_version")
+        versao = cursor.fetchone()[0]
+    except Exception:
+        return False
+    return versao is not None and int(versao) >= VERSAO_ESQUEMA
+
+
+def versao_atual(cursor, dialeto):
+    """Retorna a maior versão aplicada (0 se o banco ainda não tem schema_version)"""
+    if not dialeto.tabela_existe(cursor, "schema_version"):
+        return 0
+
+    cursor.execute("SELECT MAX(versao) FROM schema_version")
+    versao = cursor.fetchone()[0]
+    return int(versao) if versao is not None else 0
+
+
+def migrar(conn, dialeto, tabelas):
+    """
+    Aplica as migrações pendentes, cada uma em sua própria transação
+
+    Args:
+        conn: Conexão com o banco
+        dialeto: Dialeto do motor (ver models.database)
+        tabelas (list): Tuplas (nome, ddl, posteriores) do motor, onde
+            posteriores são instruções (sql, params) executadas após criar a tabela
+
+    Returns:
+        int: Versão do esquema após as migrações
+    """
+    cursor = conn.cursor()
+
+    if not dialeto.tabela_existe(cursor, "schema_version"):
+        cursor.execute(
+            """
+            CREATE TABLE schema_version (
+                versao INTEGER PRIMARY KEY,
+                descricao VARCHAR(255),
+                aplicada_em DATETIME
+            )
+        """
+        )
+        conn.commit()
+
+    versao = versao_atual(cursor, dialeto)
+
+    for numero, descricao, passo in MIGRACOES:
+        if numero <= versao:
+            continue
+
+        try:
+            passo(cursor, dialeto, tabelas)
+            cursor.execute(
+                "INSERT INTO schema_version (versao, descricao, aplicada_em) VALUES (?, ?, ?)",
+                (numero, descricao, datetime.now().replace(microsecond=0)),
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Erro na migração {numero} ({descricao}): {e}")
+            raise e
+
+        print(f"Migração {numero} aplicada: {descricao}")
+        versao = numero
+
+    return versao
@@ -0,0 +1,161 @@
+# Orcamento.Py
+"""
+Orçamento de idas ao banco por ação.
+
+Conta as instruções executadas durante um bloco (uma chamada de
+controller ou uma ação de tela simulada) e falha se passarem do máximo
+combinado, com um relatório das instruções repetidas, que é onde
+costumam aparecer os N+1 (a mesma consulta por ID dentro de um laço).
+
+Exemplo:
+    with orcamento_consultas(2, "salvar contrato"):
+        adicionar_contrato(...)
+
+    with contar_consultas() as contagem:
+        abrir_formulario(id_contrato)
+    print(contagem.relatorio())
+
+Usa a instrumentação da camada de conexão (models.instrumentacao), que é
+ligada durante o bloco se ainda não estiver ativa. Só as conexões obtidas
+dentro do bloco são contadas, e só as da thread que abriu o bloco.
+"""
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+from .instrumentacao import formato, instrumentacao
+
+
+class OrcamentoExcedido(AssertionError):
+    """A ação fez mais idas ao banco do que o orçamento permite"""
+
+
+class ContagemConsultas:
+    """Instruções executadas durante um bloco contar_consultas()"""
+
+    def __init__(self, descricao=None):
+        self.descricao = descricao
+        self.medicoes = []
+        self._thread = threading.get_ident()
+
+    def __call__(self, medicao):
+        if threading.get_ident() == self._thread:
+            self.medicoes.append(medicao)
+
+    @property
+    def total(self):
+        """Quantidade de idas ao banco (cada execute ou executemany conta uma)"""
+        return len(self.medicoes)
+
+    def repetidas(self):
+        """
+        Instruções executadas mais de uma vez, da mais repetida para a menos
+
+        Returns:
+            list: Tuplas (formato, execuções, execuções com os mesmos
+                parâmetros, origens)
+        """
+        por_formato = defaultdict(list)
+        for medicao in self.medicoes:
+            por_formato[formato(medicao.sql)].append(medicao)
+
+        resultado = []
+        for chave, medicoes in por_formato.items():
+            if len(medicoes) < 2:
+                continue
+            valores = Counter(m.valores for m in medicoes if m.valores is not None)
+            identicas = sum(n for n in valores.values() if n > 1)
+            origens = sorted({m.origem for m in medicoes})
+            resultado.append((chave, len(medicoes), identicas, origens))
+
+        resultado.sort(key=lambda item: item[1], reverse=True)
+        return resultado
+
+    def relatorio(self, limite=None):
+        """Texto com o total e as instruções repetidas"""
+        titulo = f"'{self.descricao}': " if self.descricao else ""
+        orcamento = f" (orçamento: {limite})" if limite is not None else ""
+        linhas = [f"{titulo}{self.total} idas ao banco{orcamento}"]
+
+        repetidas = self.repetidas()
+        if repetidas:
+            linhas.append("Instruções repetidas:")
+            for chave, execucoes, identicas, origens in repetidas:
+                detalhe = f", {identicas} com os mesmos parâmetros" if identicas else ""
+                linhas.append(f"  {execucoes}x{detalhe}: {chave[:160]}")
+                linhas.append(f"      origem: {', '.join(origens)}")
+
+        linhas.append("Sequência:")
+        for i, medicao in enumerate(self.medicoes, start=1):
+            linhas.append(f"  {i:>3}. {medicao.origem}: {formato(medicao.sql)[:120]}")
+
+        return "\n".join(linhas)
+
+
+@contextmanager
+def contar_consultas(descricao=None):
+    """
+    Conta as idas ao banco feitas no bloco
+
+    Args:
+        descricao (str, optional): Nome da ação (aparece no relatório)
+
+    Yields:
+        ContagemConsultas: Instruções executadas no bloco
+    """
+    contagem = ContagemConsultas(descricao)
+    ligada = instrumentacao.ativa
+    if not ligada:
+        instrumentacao.ativar()
+
+    instrumentacao.adicionar_ouvinte(contagem)
+    try:
+        yield contagem
+    finally:
+        instrumentacao.remover_ouvinte(contagem)
+        if not ligada:
+            instrumentacao.desativar()
+
+
+@contextmanager
+def orcamento_consultas(maximo, descricao=None):
+    """
+    Falha se o bloco fizer mais de `maximo` idas ao banco
+
+    Args:
+        maximo (int): Idas ao banco permitidas
+        descricao (str, optional): Nome da ação (aparece no relatório)
+
+    Yields:
+        ContagemConsultas: Instruções executadas no bloco
+
+    Raises:
+        OrcamentoExcedido: Ao final do bloco, se o orçamento foi excedido
+            (a mensagem traz o relatório das instruções repetidas)
+    """
+    with contar_consultas(descricao) as contagem:
+        yield contagem
+
+    if contagem.total > maximo:
+        raise OrcamentoExcedido(contagem.relatorio(maximo))
+
+
+def verificar_orcamento(maximo, descricao=None):
+    """
+    Decorador: aplica orcamento_consultas a cada chamada da função
+
+    Exemplo:
+        @verificar_orcamento(3)
+        def abrir_contrato(id_contrato): ...
+    """
+
+    def decorador(funcao):
+        @wraps(funcao)
+        def executar(*args, **kwargs):
+            with orcamento_consultas(maximo, descricao or funcao.__name__):
+                return funcao(*args, **kwargs)
+
+        return executar
+
+    return decorador
@@ -1,6 +1,10 @@
 # Pessoa Fisica Model.Py
-from .db_manager_access import get_connection
-from datetime import datetime
+from .cache import cache_leituras
+from .database import get_connection, get_dialeto
+from .datas import data_hora_iso
+from .registros import CAMPOS_PESSOA_FISICA, PessoaFisica, colunas, registro, registros
+
+_COLUNAS = colunas(CAMPOS_PESSOA_FISICA)
 
 
 def create_pessoa_fisica(nome_completo, cpf=None, email=None, telefone=None):
@@ -26,8 +30,7 @@ def create_pessoa_fisica(nome_completo, cpf=None, email=None, telefone=None):
             if cursor.fetchone():
                 raise ValueError(f"Já existe uma pessoa cadastrada com o CPF {cpf}")
 
-        # Data atual no formato brasileiro
-        data_cadastro = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        data_cadastro = data_hora_iso()
 
         cursor.execute(
             """
@@ -37,18 +40,10 @@ def create_pessoa_fisica(nome_completo, cpf=None, email=None, telefone=None):
             (nome_completo, cpf, email, telefone, data_cadastro),
         )
 
-        # Obter o ID da pessoa inserida usando o CPF ou nome como referência
-        cursor.execute(
-            """
-            SELECT TOP 1 id FROM pessoa_fisica 
-            WHERE nome_completo=? AND (cpf=? OR (cpf IS NULL AND ? IS NULL))
-            ORDER BY id DESC
-        """,
-            (nome_completo, cpf, cpf),
-        )
-        
-        pessoa_id = cursor.fetchone()[0]
+        # Obter o ID da pessoa inserida
+        pessoa_id = get_dialeto().ultimo_id(cursor)
         conn.commit()
+        cache_leituras.invalidar("pessoa", pessoa_id)
         return pessoa_id
 
     except Exception as e:
@@ -63,36 +58,38 @@ def get_all_pessoas_fisicas():
     Retorna todas as pessoas físicas cadastradas
 
     Returns:
-        list: Lista de tuplas com as pessoas físicas
+        list: Registros PessoaFisica com as pessoas físicas
     """
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT * FROM pessoa_fisica ORDER BY nome_completo")
+    cursor.execute(f"SELECT {_COLUNAS} FROM pessoa_fisica ORDER BY nome_completo")
     pessoas = cursor.fetchall()
     conn.close()
 
-    return [tuple(pessoa) for pessoa in pessoas]
+    return registros(PessoaFisica, pessoas)
 
 
 def get_pessoa_fisica_by_id(id_pessoa):
     """
-    Obtém uma pessoa física pelo seu ID
+    Obtém uma pessoa física pelo seu ID (com cache de leitura, ver models.cache)
 
     Args:
         id_pessoa (int): ID da pessoa física
 
     Returns:
-        tuple: Dados da pessoa física ou None se não encontrada
+        PessoaFisica: Dados da pessoa física ou None se não encontrada
     """
+    return cache_leituras.obter("pessoa", id_pessoa, _consultar_pessoa)
+
+
+def _consultar_pessoa(id_pessoa):
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT * FROM pessoa_fisica WHERE id=?", (id_pessoa,))
+    cursor.execute(f"SELECT {_COLUNAS} FROM pessoa_fisica WHERE id=?", (id_pessoa,))
     pessoa = cursor.fetchone()
     conn.close()
 
-    if pessoa:
-        return tuple(pessoa)
-    return None
+    return registro(PessoaFisica, pessoa)
 
 
 def get_pessoa_fisica_by_cpf(cpf):
@@ -103,17 +100,15 @@ def get_pessoa_fisica_by_cpf(cpf):
         cpf (str): CPF da pessoa física
 
     Returns:
-        tuple: Dados da pessoa física ou None se não encontrada
+        PessoaFisica: Dados da pessoa física ou None se não encontrada
     """
     conn = get_connection()
     cursor = conn.cursor()
-    cursor.execute("SELECT * FROM pessoa_fisica WHERE cpf=?", (cpf,))
+    cursor.execute(f"SELECT {_COLUNAS} FROM pessoa_fisica WHERE cpf=?", (cpf,))
     pessoa = cursor.fetchone()
     conn.close()
 
-    if pessoa:
-        return tuple(pessoa)
-    return None
+    return registro(PessoaFisica, pessoa)
 
 
 def search_pessoas_fisicas(termo_busca):
@@ -124,7 +119,7 @@ def search_pessoas_fisicas(termo_busca):
         termo_busca (str): Termo a ser buscado no nome ou CPF
 
     Returns:
-        list: Lista de tuplas com as pessoas físicas encontradas
+        list: Registros PessoaFisica com as pessoas físicas encontradas
     """
     conn = get_connection()
     cursor = conn.cursor()
@@ -133,8 +128,8 @@ def search_pessoas_fisicas(termo_busca):
     termo = f"%{termo_busca}%"
 
     cursor.execute(
-        """
-        SELECT * FROM pessoa_fisica 
+        f"""
+        SELECT {_COLUNAS} FROM pessoa_fisica 
         WHERE nome_completo LIKE ? OR cpf LIKE ?
         ORDER BY nome_completo
     """,
@@ -144,7 +139,7 @@ def search_pessoas_fisicas(termo_busca):
     pessoas = cursor.fetchall()
     conn.close()
 
-    return [tuple(pessoa) for pessoa in pessoas]
+    return registros(PessoaFisica, pessoas)
 
 
 def update_pessoa_fisica(id_pessoa, nome_completo, cpf=None, email=None, telefone=None):
@@ -181,6 +176,7 @@ def update_pessoa_fisica(id_pessoa, nome_completo, cpf=None, email=None, telefon
 
     conn.commit()
     conn.close()
+    cache_leituras.invalidar("pessoa", id_pessoa)
 
 
 def delete_pessoa_fisica(id_pessoa):
@@ -211,3 +207,4 @@ def delete_pessoa_fisica(id_pessoa):
     cursor.execute("DELETE FROM pessoa_fisica WHERE id=?", (id_pessoa,))
     conn.commit()
     conn.close()
+    cache_leituras.invalidar("pessoa", id_pessoa)
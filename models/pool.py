@@ -0,0 +1,195 @@
+# Pool.Py
+import threading
+import time
+
+
+class ConexaoPool:
+    """Conexão emprestada do pool; close() devolve a conexão em vez de fechá-la"""
+
+    def __init__(self, pool, conn):
+        self._pool = pool
+        self._conn = conn
+
+    def __getattr__(self, nome):
+        conn = self.__dict__.get("_conn")
+        if conn is None:
+            raise Exception("Conexão já devolvida ao pool")
+        return getattr(conn, nome)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self._conn.commit()
+        else:
+            self._conn.rollback()
+        return False
+
+    def close(self):
+        """Devolve a conexão ao pool (chamadas repetidas são ignoradas)"""
+        conn = self._conn
+        if conn is None:
+            return
+        self._conn = None
+        self._pool.devolver(conn)
+
+    def __del__(self):
+        # Garante a devolução quando o chamador esquece de fechar (ex.: exceção)
+        if self.__dict__.get("_conn") is not None:
+            self.close()
+
+
+class PoolConexoes:
+    """
+    Pool de conexões com tamanho limitado, verificação de saúde e
+    descarte de conexões ociosas
+    """
+
+    def __init__(
+        self,
+        fabrica,
+        tamanho_maximo=5,
+        tempo_ocioso_maximo=300,
+        intervalo_verificacao=30,
+        consulta_verificacao="SELECT 1",
+        tempo_espera=30,
+    ):
+        """
+        Args:
+            fabrica (callable): Função sem argumentos que abre uma conexão nova
+            tamanho_maximo (int): Quantidade máxima de conexões abertas
+            tempo_ocioso_maximo (float): Segundos até uma conexão ociosa ser descartada
+            intervalo_verificacao (float): Segundos ociosos a partir dos quais a
+                conexão é testada antes de ser reutilizada
+            consulta_verificacao (str): Consulta usada no teste de saúde
+            tempo_espera (float): Segundos aguardando uma conexão livre
+        """
+        self.fabrica = fabrica
+        self.tamanho_maximo = tamanho_maximo
+        self.tempo_ocioso_maximo = tempo_ocioso_maximo
+        self.intervalo_verificacao = intervalo_verificacao
+        self.consulta_verificacao = consulta_verificacao
+        self.tempo_espera = tempo_espera
+
+        self._ociosas = []  # Pilha de (conexão, instante em que foi devolvida)
+        self._abertas = 0
+        self._condicao = threading.Condition()
+
+    def obter(self):
+        """
+        Empresta uma conexão do pool, abrindo uma nova se necessário
+
+        Returns:
+            ConexaoPool: Conexão que volta ao pool ao ser fechada
+        """
+        limite = time.monotonic() + self.tempo_espera
+
+        while True:
+            with self._condicao:
+                self._descartar_expiradas()
+
+                if self._ociosas:
+                    conn, devolvida_em = self._ociosas.pop()
+                elif self._abertas < self.tamanho_maximo:
+                    self._abertas += 1
+                    conn, devolvida_em = None, None
+                else:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        raise Exception(
+                            f"Tempo esgotado aguardando conexão livre "
+                            f"({self.tamanho_maximo} em uso)"
+                        )
+                    self._condicao.wait(restante)
+                    continue
+
+            if conn is None:
+                try:
+                    conn = self.fabrica()
+                except Exception:
+                    self._liberar_vaga()
+                    raise
+                return ConexaoPool(self, conn)
+
+            # Conexões paradas há algum tempo são testadas antes do uso
+            if time.monotonic() - devolvida_em < self.intervalo_verificacao:
+                return ConexaoPool(self, conn)
+            if self._saudavel(conn):
+                return ConexaoPool(self, conn)
+
+            self._fechar(conn)
+            self._liberar_vaga()
+
+    def devolver(self, conn):
+        """Recebe de volta uma conexão emprestada"""
+        try:
+            # Descarta qualquer transação pendente antes de reaproveitar
+            conn.rollback()
+        except Exception:
+            self._fechar(conn)
+            self._liberar_vaga()
+            return
+
+        with self._condicao:
+            self._ociosas.append((conn, time.monotonic()))
+            self._condicao.notify()
+
+    def fechar_todas(self):
+        """Fecha todas as conexões ociosas do pool"""
+        with self._condicao:
+            ociosas, self._ociosas = self._ociosas, []
+            self._abertas -= len(ociosas)
+            self._condicao.notify_all()
+
+        for conn, _ in ociosas:
+            self._fechar(conn)
+
+    def estatisticas(self):
+        """
+        Retorna a situação atual do pool
+
+        Returns:
+            dict: Conexões abertas, ociosas e em uso
+        """
+        with self._condicao:
+            ociosas = len(self._ociosas)
+            return {
+                "abertas": self._abertas,
+                "ociosas": ociosas,
+                "em_uso": self._abertas - ociosas,
+            }
+
+    def _descartar_expiradas(self):
+        """Remove conexões ociosas há mais tempo que o permitido (chamar com o lock)"""
+        agora = time.monotonic()
+        manter = []
+        for conn, devolvida_em in self._ociosas:
+            if agora - devolvida_em > self.tempo_ocioso_maximo:
+                self._fechar(conn)
+                self._abertas -= 1
+            else:
+                manter.append((conn, devolvida_em))
+        self._ociosas = manter
+
+    def _liberar_vaga(self):
+        with self._condicao:
+            self._abertas -= 1
+            self._condicao.notify()
+
+    def _saudavel(self, conn):
+        try:
+            cursor = conn.cursor()
+            cursor.execute(self.consulta_verificacao)
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _fechar(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
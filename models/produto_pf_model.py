@@ -1,10 +1,20 @@
 # Produto Pf Model.Py
-from .db_manager_access import get_connection
+from .cache import cache_leituras
+from .database import get_connection, get_dialeto
+from .datas import data_iso, filtro_periodo
+from .registros import CAMPOS_PRODUTO_PF, ProdutoPF, projecao, registro, registros
+
+# Expressão SQL de cada campo de ProdutoPF (p = produto_pf, c = contrato_pf, pf = pessoa_fisica)
+EXPRESSOES = {campo: f"p.{campo}" for campo in CAMPOS_PRODUTO_PF}
+EXPRESSOES["numero_contrato"] = "c.numero_contrato"
+EXPRESSOES["nome_completo"] = "pf.nome_completo"
+
+_COLUNAS = projecao(ProdutoPF, EXPRESSOES)[1]
 
 
 def create_produto_pf(
     id_contrato,
-    numero,
+    numero=None,
     data_programada=None,
     instrumento=None,
     data_entrega=None,
@@ -17,7 +27,9 @@ def create_produto_pf(
 
     Args:
         id_contrato (int): ID do contrato
-        numero (str): Número ou identificação do produto
+        numero (str, optional): Número ou identificação do produto; se None,
+            recebe o próximo número da sequência do contrato (ver
+            reservar_numeros_produto)
         data_programada (str, optional): Data programada
         instrumento (str, optional): Instrumento
         data_entrega (str, optional): Data de entrega
@@ -28,6 +40,10 @@ def create_produto_pf(
     Returns:
         int: ID do produto criado
     """
+    # Datas no formato do banco (AAAA-MM-DD)
+    data_programada = data_iso(data_programada)
+    data_entrega = data_iso(data_entrega)
+
     conn = get_connection()
     cursor = conn.cursor()
 
@@ -46,6 +62,12 @@ def create_produto_pf(
             f"Produtos só podem ser cadastrados para contratos de modalidade Bolsa, Produto ou RPA"
         )
 
+    # O número é reservado na mesma transação do INSERT
+    if numero is None:
+        numero = str(_reservar_numeros(cursor, id_contrato, 1)[0])
+    else:
+        _acompanhar_numero(cursor, numero, id_contrato=id_contrato)
+
     cursor.execute(
         """
         INSERT INTO produto_pf (
@@ -65,84 +87,117 @@ def create_produto_pf(
         ),
     )
 
-    # Obter o ID do produto inserido usando SELECT @@IDENTITY
-    cursor.execute("SELECT @@IDENTITY")
-    produto_id = cursor.fetchone()[0]
+    # Obter o ID do produto inserido
+    produto_id = get_dialeto().ultimo_id(cursor)
 
     conn.commit()
     conn.close()
+    cache_leituras.invalidar("produto", produto_id)
 
     return produto_id
 
 
-def get_all_produtos_pf():
+def _filtro_datas(condicoes, params, programada=None, entrega=None):
     """
-    Retorna todos os produtos
+    Acrescenta as condições dos períodos de data_programada e data_entrega
 
-    Returns:
-        list: Lista de tuplas com os produtos
+    Produtos sem data programada continuam na listagem (como no filtro que
+    a tela fazia antes); os sem data de entrega ficam fora do período.
     """
+    for coluna, periodo, incluir_vazias in (
+        ("p.data_programada", programada, True),
+        ("p.data_entrega", entrega, False),
+    ):
+        if periodo:
+            novas, valores = filtro_periodo(coluna, *periodo, incluir_vazias=incluir_vazias)
+            condicoes.extend(novas)
+            params.extend(valores)
+
+
+def _consultar_produtos(campos, condicoes, params, ordem):
+    tipo, selecao = projecao(ProdutoPF, EXPRESSOES, campos)
+    where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute(
-        """
-        SELECT p.*, c.numero_contrato, pf.nome_completo
+        f"""
+        SELECT {selecao}
         FROM ([produto_pf] AS p
         INNER JOIN [contrato_pf] AS c ON p.id_contrato = c.id)
         INNER JOIN [pessoa_fisica] AS pf ON c.id_pessoa_fisica = pf.id
-        ORDER BY p.id DESC
-        """
+        {where}
+        ORDER BY {ordem}
+        """,
+        params,
     )
     produtos = cursor.fetchall()
     conn.close()
 
-    return [tuple(produto) for produto in produtos]
+    return registros(tipo, produtos)
+
 
+def get_all_produtos_pf(campos=None, programada=None, entrega=None):
+    """
+    Retorna todos os produtos
+
+    Args:
+        campos (iterable, optional): Campos a buscar (ver models.registros.projecao)
+        programada (tuple, optional): Período (início, fim) de data_programada;
+            qualquer um dos limites pode ser vazio; produtos sem data programada
+            são mantidos
+        entrega (tuple, optional): Período (início, fim) de data_entrega
+
+    Returns:
+        list: Registros ProdutoPF (parciais, se campos for informado) com os produtos
 
-def get_produtos_by_contrato(id_contrato):
+    Raises:
+        ValueError: Se uma das datas dos períodos for inválida
+    """
+    condicoes, params = [], []
+    _filtro_datas(condicoes, params, programada, entrega)
+    return _consultar_produtos(campos, condicoes, params, "p.id DESC")
+
+
+def get_produtos_by_contrato(id_contrato, campos=None, programada=None, entrega=None):
     """
     Retorna os produtos de um contrato específico
 
     Args:
         id_contrato (int): ID do contrato
+        campos (iterable, optional): Campos a buscar (ver models.registros.projecao)
+        programada (tuple, optional): Período (início, fim) de data_programada
+        entrega (tuple, optional): Período (início, fim) de data_entrega
 
     Returns:
-        list: Lista de tuplas com os produtos
-    """
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT p.*, c.numero_contrato, pf.nome_completo
-        FROM ([produto_pf] AS p
-        INNER JOIN [contrato_pf] AS c ON p.id_contrato = c.id)
-        INNER JOIN [pessoa_fisica] AS pf ON c.id_pessoa_fisica = pf.id
-        WHERE p.id_contrato = ?
-        ORDER BY p.numero
-        """,
-        (id_contrato,),
-    )
-    produtos = cursor.fetchall()
-    conn.close()
+        list: Registros ProdutoPF (parciais, se campos for informado) com os produtos
 
-    return [tuple(produto) for produto in produtos]
+    Raises:
+        ValueError: Se uma das datas dos períodos for inválida
+    """
+    condicoes, params = ["p.id_contrato = ?"], [id_contrato]
+    _filtro_datas(condicoes, params, programada, entrega)
+    return _consultar_produtos(campos, condicoes, params, "p.numero")
 
 
 def get_produto_by_id(id_produto):
     """
-    Obtém um produto pelo seu ID
+    Obtém um produto pelo seu ID (com cache de leitura, ver models.cache)
 
     Args:
         id_produto (int): ID do produto
 
     Returns:
-        tuple: Dados do produto ou None se não encontrado
+        ProdutoPF: Dados do produto ou None se não encontrado
     """
+    return cache_leituras.obter("produto", id_produto, _consultar_produto)
+
+
+def _consultar_produto(id_produto):
     conn = get_connection()
     cursor = conn.cursor()
     cursor.execute(
-        """
-        SELECT p.*, c.numero_contrato, pf.nome_completo
+        f"""
+        SELECT {_COLUNAS}
         FROM ([produto_pf] AS p
         INNER JOIN [contrato_pf] AS c ON p.id_contrato = c.id)
         INNER JOIN [pessoa_fisica] AS pf ON c.id_pessoa_fisica = pf.id
@@ -153,9 +208,7 @@ def get_produto_by_id(id_produto):
     produto = cursor.fetchone()
     conn.close()
 
-    if produto:
-        return tuple(produto)
-    return None
+    return registro(ProdutoPF, produto)
 
 
 def update_produto_pf(
@@ -175,9 +228,15 @@ def update_produto_pf(
         id_produto (int): ID do produto
         [outros parâmetros iguais ao create_produto_pf]
     """
+    # Datas no formato do banco (AAAA-MM-DD)
+    data_programada = data_iso(data_programada)
+    data_entrega = data_iso(data_entrega)
+
     conn = get_connection()
     cursor = conn.cursor()
 
+    _acompanhar_numero(cursor, numero, id_produto=id_produto)
+
     cursor.execute(
         """
         UPDATE produto_pf SET
@@ -199,6 +258,7 @@ def update_produto_pf(
 
     conn.commit()
     conn.close()
+    cache_leituras.invalidar("produto", id_produto)
 
 
 def delete_produto_pf(id_produto):
@@ -215,3 +275,137 @@ def delete_produto_pf(id_produto):
 
     conn.commit()
     conn.close()
+    cache_leituras.invalidar("produto", id_produto)
+
+
+def reservar_numeros_produto(id_contrato, quantidade=1):
+    """
+    Reserva os próximos números de produto de um contrato
+
+    Os números saem de produto_seq, que guarda o último número entregue a
+    cada contrato; o incremento é feito por um único UPDATE, de modo que
+    duas estações nunca recebem o mesmo número. Números reservados e não
+    usados não são devolvidos.
+
+    Args:
+        id_contrato (int): ID do contrato
+        quantidade (int, optional): Quantidade de números (para cadastro em lote)
+
+    Returns:
+        list: Números reservados, em ordem crescente
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        numeros = _reservar_numeros(cursor, id_contrato, quantidade)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    return numeros
+
+
+def get_proximo_numero_produto(id_contrato):
+    """
+    Próximo número da sequência do contrato, sem reservá-lo (para exibição)
+
+    Args:
+        id_contrato (int): ID do contrato
+
+    Returns:
+        int: Número que o próximo produto cadastrado sem número receberá
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT ultimo_numero FROM produto_seq WHERE id_contrato=?", (id_contrato,)
+    )
+    linha = cursor.fetchone()
+    if linha is not None:
+        ultimo = int(linha[0])
+    else:
+        # Contrato ainda sem sequência
+        ultimo = _maior_numero(cursor, id_contrato)
+    conn.close()
+
+    return ultimo + 1
+
+
+def _reservar_numeros(cursor, id_contrato, quantidade):
+    """
+    Avança a sequência do contrato em `quantidade` números
+
+    Deve ser chamada com o cursor da transação que usará os números. Se o
+    contrato ainda não tiver linha em produto_seq, ela é criada a partir do
+    maior número inteiro já cadastrado para o contrato.
+    """
+    quantidade = int(quantidade)
+    if quantidade < 1:
+        raise ValueError("A quantidade de números reservados deve ser positiva")
+
+    avancar = "UPDATE produto_seq SET ultimo_numero = ultimo_numero + ? WHERE id_contrato=?"
+    cursor.execute(avancar, (quantidade, id_contrato))
+
+    if cursor.rowcount == 0:
+        try:
+            cursor.execute(
+                "INSERT INTO produto_seq (id_contrato, ultimo_numero) VALUES (?, ?)",
+                (id_contrato, _maior_numero(cursor, id_contrato) + quantidade),
+            )
+        except Exception:
+            # Outra estação criou a sequência ao mesmo tempo
+            cursor.execute(avancar, (quantidade, id_contrato))
+            if cursor.rowcount == 0:
+                raise
+
+    cursor.execute(
+        "SELECT ultimo_numero FROM produto_seq WHERE id_contrato=?", (id_contrato,)
+    )
+    ultimo = int(cursor.fetchone()[0])
+
+    return list(range(ultimo - quantidade + 1, ultimo + 1))
+
+
+def _acompanhar_numero(cursor, numero, id_contrato=None, id_produto=None):
+    """
+    Avança a sequência quando um número inteiro é informado manualmente
+
+    Evita que a sequência entregue depois um número já usado. Contratos sem
+    linha em produto_seq não precisam de ajuste: a linha será criada a
+    partir dos números cadastrados.
+    """
+    try:
+        numero = int(str(numero).strip())
+    except (ValueError, TypeError):
+        return
+
+    if id_contrato is not None:
+        cursor.execute(
+            "UPDATE produto_seq SET ultimo_numero=? WHERE id_contrato=? AND ultimo_numero < ?",
+            (numero, id_contrato, numero),
+        )
+    else:
+        cursor.execute(
+            """
+            UPDATE produto_seq SET ultimo_numero=?
+            WHERE id_contrato IN (SELECT id_contrato FROM produto_pf WHERE id=?)
+            AND ultimo_numero < ?
+        """,
+            (numero, id_produto, numero),
+        )
+
+
+def _maior_numero(cursor, id_contrato):
+    """Maior número inteiro entre os produtos do contrato (0 se não houver)"""
+    cursor.execute("SELECT numero FROM produto_pf WHERE id_contrato=?", (id_contrato,))
+    maior = 0
+    for (numero,) in cursor.fetchall():
+        try:
+            maior = max(maior, int(str(numero).strip()))
+        except (ValueError, TypeError):
+            # Números não inteiros (ex.: "PROD-12-0001") não entram na sequência
+            pass
+    return maior
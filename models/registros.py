@@ -0,0 +1,183 @@
+# Registros.Py
+"""
+Tipos de registro retornados pelos models.
+
+Cada tipo é uma namedtuple (sem __dict__, __slots__ vazio), montada
+diretamente da linha do cursor com _make: ocupa o mesmo espaço de uma
+tupla e continua aceitando acesso por posição, mas os campos também podem
+ser lidos pelo nome (contrato.total_contrato em vez de contrato[22]).
+
+As consultas usam colunas() para listar os campos explicitamente, de modo
+que a ordem não depende da ordem física das colunas no banco. As listagens
+aceitam uma projeção (os campos que a tela realmente exibe) e, nesse caso,
+retornam registros parciais com só esses campos; campos longos como
+observacoes ficam de fora e são carregados quando o formulário é aberto.
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+CAMPOS_PESSOA_FISICA = (
+    "id",
+    "nome_completo",
+    "cpf",
+    "email",
+    "telefone",
+    "data_cadastro",
+)
+
+CAMPOS_CONTRATO_PF = (
+    "id",
+    "codigo_demanda",
+    "id_pessoa_fisica",
+    "instituicao",
+    "instrumento",
+    "subprojeto",
+    "ta",
+    "pta",
+    "acao",
+    "resultado",
+    "meta",
+    "modalidade",
+    "natureza_demanda",
+    "numero_contrato",
+    "vigencia_inicial",
+    "vigencia_final",
+    "meses",
+    "status_contrato",
+    "remuneracao",
+    "intersticio",
+    "valor_intersticio",
+    "valor_complementar",
+    "total_contrato",
+    "observacoes",
+    "lotacao",
+    "exercicio",
+)
+
+CAMPOS_ADITIVO_PF = (
+    "id",
+    "id_contrato",
+    "tipo_aditivo",
+    "oficio",
+    "data_entrada",
+    "data_protocolo",
+    "instituicao",
+    "instrumento",
+    "subprojeto",
+    "ta",
+    "pta",
+    "acao",
+    "resultado",
+    "meta",
+    "vigencia_final",
+    "meses",
+    "valor_aditivo",
+    "vigencia_inicial",
+    "nova_remuneracao",
+    "diferenca_remuneracao",
+    "valor_complementar",
+    "valor_total_aditivo",
+    "responsavel",
+    "data_atualizacao",
+)
+
+CAMPOS_PRODUTO_PF = (
+    "id",
+    "id_contrato",
+    "numero",
+    "data_programada",
+    "instrumento",
+    "data_entrega",
+    "status",
+    "titulo",
+    "valor",
+)
+
+CAMPOS_DEMANDA = (
+    "codigo",
+    "data_entrada",
+    "solicitante",
+    "data_protocolo",
+    "oficio",
+    "nup_sei",
+)
+
+PessoaFisica = namedtuple("PessoaFisica", CAMPOS_PESSOA_FISICA)
+
+# Contratos vêm com o nome da pessoa
+ContratoPF = namedtuple("ContratoPF", CAMPOS_CONTRATO_PF + ("nome_completo",))
+
+# Aditivos e produtos vêm com o número do contrato e o nome da pessoa
+AditivoPF = namedtuple(
+    "AditivoPF", CAMPOS_ADITIVO_PF + ("numero_contrato", "nome_completo")
+)
+ProdutoPF = namedtuple(
+    "ProdutoPF", CAMPOS_PRODUTO_PF + ("numero_contrato", "nome_completo")
+)
+
+Demanda = namedtuple("Demanda", CAMPOS_DEMANDA)
+
+
+def colunas(campos, alias=None):
+    """
+    Lista de colunas para o SELECT, na ordem dos campos do registro
+
+    Args:
+        campos (tuple): Nomes dos campos
+        alias (str, optional): Alias da tabela na consulta
+
+    Returns:
+        str: Ex.: "c.id, c.codigo_demanda, ..."
+    """
+    prefixo = f"{alias}." if alias else ""
+    return ", ".join(prefixo + campo for campo in campos)
+
+
+@lru_cache(maxsize=None)
+def _tipo_parcial(tipo, campos):
+    return namedtuple(f"{tipo.__name__}Parcial", campos)
+
+
+def projecao(tipo, expressoes, campos=None):
+    """
+    Tipo de registro e lista de colunas para uma consulta projetada
+
+    Args:
+        tipo: Tipo de registro completo (ex.: ContratoPF)
+        expressoes (dict): Expressão SQL de cada campo do tipo (ex.:
+            {"id": "c.id", ..., "nome_completo": "p.nome_completo"})
+        campos (iterable, optional): Campos desejados; None para todos
+
+    Returns:
+        tuple: (tipo do registro, colunas para o SELECT)
+
+    Raises:
+        ValueError: Se algum campo não pertencer ao tipo
+    """
+    if campos is None:
+        return tipo, ", ".join(expressoes[campo] for campo in tipo._fields)
+
+    campos = tuple(campos)
+    desconhecidos = [campo for campo in campos if campo not in tipo._fields]
+    if desconhecidos:
+        raise ValueError(
+            f"Campos inexistentes em {tipo.__name__}: {', '.join(desconhecidos)}"
+        )
+
+    if campos == tipo._fields:
+        parcial = tipo
+    else:
+        parcial = _tipo_parcial(tipo, campos)
+    return parcial, ", ".join(expressoes[campo] for campo in campos)
+
+
+def registro(tipo, linha):
+    """Monta um registro a partir de uma linha do cursor (None se não houver linha)"""
+    if linha is None:
+        return None
+    return tipo._make(linha)
+
+
+def registros(tipo, linhas):
+    """Monta os registros de todas as linhas retornadas pelo cursor"""
+    return list(map(tipo._make, linhas))
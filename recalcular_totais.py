@@ -0,0 +1,24 @@
+from controllers.contrato_pf_controller import recalcular_totais
+from utils.logger import descarregar_logs
+
+if __name__ == "__main__":
+    print("Recalculando totais dos contratos...")
+    relatorio = recalcular_totais()
+
+    print(f"Contratos verificados: {relatorio['contratos']}")
+
+    print(f"Somas de aditivos divergentes: {len(relatorio['totais_corrigidos'])}")
+    for id_contrato, anterior, correto in relatorio["totais_corrigidos"]:
+        anterior = "ausente" if anterior is None else f"{anterior:.2f}"
+        print(f"  Contrato {id_contrato}: {anterior} -> {correto:.2f}")
+
+    print(f"Totais de contrato divergentes: {len(relatorio['contratos_corrigidos'])}")
+    for id_contrato, anterior, correto in relatorio["contratos_corrigidos"]:
+        anterior = "ausente" if anterior is None else f"{anterior:.2f}"
+        print(f"  Contrato {id_contrato}: {anterior} -> {correto:.2f}")
+
+    if relatorio["totais_orfaos"]:
+        print(f"Linhas de totais sem contrato removidas: {relatorio['totais_orfaos']}")
+
+    descarregar_logs()
+    print("Processo finalizado!")
@@ -19,6 +19,7 @@ Autor: Sistema de Migração Automática
 Data: 2025-06-08
 """
 
+import numpy as np
 import pandas as pd
 import sqlite3
 import sys
@@ -66,6 +67,22 @@ def clean_database():
             cursor.execute(f"DELETE FROM {table}")
             log_message(f"Tabela {table} limpa")
         
+        # Tabelas derivadas, mantidas pelos models (os contratos voltam com
+        # os mesmos IDs e herdariam os valores antigos). Só existem em bancos
+        # já atualizados pela aplicação.
+        derived_tables = [
+            'contrato_totals',  # Soma dos aditivos por contrato
+            'produto_seq',      # Último número de produto por contrato
+        ]
+        
+        for table in derived_tables:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (table,)
+            )
+            if cursor.fetchone():
+                cursor.execute(f"DELETE FROM {table}")
+                log_message(f"Tabela {table} limpa")
+        
         # Reset dos IDs auto-incrementais
         cursor.execute("DELETE FROM sqlite_sequence WHERE name IN ('pessoa_fisica', 'demanda', 'contrato_pf', 'produto_pf', 'aditivo_pf')")
         
@@ -83,59 +100,112 @@ def clean_database():
         conn.close()
 
 
+# Linhas enviadas ao banco por chamada de executemany
+CHUNK_SIZE = 5000
+
+# Arquivo onde as linhas rejeitadas são registradas (tabela, linha, motivo)
+REJECTS_FILE = "rejeitados_migracao.csv"
+
+# Mapeamento completo para o formato original do sistema (minúsculo com underscores)
+STATUS_CONTRATO_MAP = {
+    # Variações de "concluído"
+    'concluido': 'concluido',
+    'concluído': 'concluido',
+    'concluida': 'concluido',
+    'concluída': 'concluido',
+    
+    # Variações de "cancelado"
+    'cancelado': 'cancelado',
+    'cancelada': 'cancelado',
+    
+    # Variações de "vigente"
+    'vigente': 'vigente',
+    
+    # Variações de "em tramitação"
+    'em tramitação': 'em_tramitacao',
+    'em tramitacao': 'em_tramitacao',
+    'em_tramitacao': 'em_tramitacao',
+    'tramitacao': 'em_tramitacao',
+    'tramitação': 'em_tramitacao',
+    
+    # Variações de "pendente assinatura"
+    'pendente': 'pendente_assinatura',
+    'pendente_assinatura': 'pendente_assinatura',
+    'assinatura pendente': 'pendente_assinatura',
+    'pendente de assinatura': 'pendente_assinatura',
+    
+    # Variações de "aguardando autorização"
+    'aguardando': 'aguardando_autorizacao',
+    'aguardando_autorizacao': 'aguardando_autorizacao',
+    'aguardando autorização': 'aguardando_autorizacao',
+    'aguardando autorizacao': 'aguardando_autorizacao',
+    
+    # Variações de "não autorizado"
+    'não autorizado': 'nao_autorizado',
+    'nao_autorizado': 'nao_autorizado',
+    'nao autorizado': 'nao_autorizado',
+    'não_autorizado': 'nao_autorizado',
+    
+    # Variações de "rescindido"
+    'rescindido': 'rescindido',
+    'rescindida': 'rescindido'
+}
+
+# Mapeamento completo para o formato original do sistema (MAIÚSCULO)
+MODALIDADE_MAP = {
+    # Variações de "BOLSA"
+    'BOLSA': 'BOLSA',
+    'BOLSAS': 'BOLSA',
+    'BOLSISTA': 'BOLSA',
+    'BOLSISTAS': 'BOLSA',
+    
+    # Variações de "PRODUTO"
+    'PRODUTO': 'PRODUTO',
+    'PRODUTOS': 'PRODUTO',
+    'PRODUÇÃO': 'PRODUTO',
+    'PRODUCAO': 'PRODUTO',
+    
+    # Variações de "RPA"
+    'RPA': 'RPA',
+    'RPAS': 'RPA',
+    'R.P.A': 'RPA',
+    'R.P.A.': 'RPA',
+    
+    # Variações de "CLT"
+    'CLT': 'CLT',
+    'CELETISTA': 'CLT',
+    'EMPREGADO': 'CLT',
+    'FUNCIONARIO': 'CLT',
+    'FUNCIONÁRIO': 'CLT'
+}
+
+# Mapeamento para o formato original do sistema (minúsculo)
+NATUREZA_DEMANDA_MAP = {
+    # Variações de "renovação"
+    'renovacao': 'renovacao',
+    'renovação': 'renovacao',
+    'renovacão': 'renovacao',
+    'renovaçao': 'renovacao',
+    'renov': 'renovacao',
+    'renovar': 'renovacao',
+    
+    # Variações de "novo"
+    'novo': 'novo',
+    'nova': 'novo',
+    'novos': 'novo',
+    'novas': 'novo',
+    'inicial': 'novo',
+    'primeiro': 'novo',
+    'primeira': 'novo'
+}
+
+
 def normalize_status_contrato(status):
     """Normaliza o status do contrato para o formato ORIGINAL do sistema (minúsculo com underscores)"""
     if pd.isna(status):
         return 'pendente_assinatura'
     
-    status_str = str(status).strip().lower()
-    
-    # Mapeamento completo para o formato original do sistema
-    status_map = {
-        # Variações de "concluído"
-        'concluido': 'concluido',
-        'concluído': 'concluido',
-        'concluida': 'concluido',
-        'concluída': 'concluido',
-        
-        # Variações de "cancelado"
-        'cancelado': 'cancelado',
-        'cancelada': 'cancelado',
-        
-        # Variações de "vigente"
-        'vigente': 'vigente',
-        
-        # Variações de "em tramitação"
-        'em tramitação': 'em_tramitacao',
-        'em tramitacao': 'em_tramitacao',
-        'em_tramitacao': 'em_tramitacao',
-        'tramitacao': 'em_tramitacao',
-        'tramitação': 'em_tramitacao',
-        
-        # Variações de "pendente assinatura"
-        'pendente': 'pendente_assinatura',
-        'pendente_assinatura': 'pendente_assinatura',
-        'assinatura pendente': 'pendente_assinatura',
-        'pendente de assinatura': 'pendente_assinatura',
-        
-        # Variações de "aguardando autorização"
-        'aguardando': 'aguardando_autorizacao',
-        'aguardando_autorizacao': 'aguardando_autorizacao',
-        'aguardando autorização': 'aguardando_autorizacao',
-        'aguardando autorizacao': 'aguardando_autorizacao',
-        
-        # Variações de "não autorizado"
-        'não autorizado': 'nao_autorizado',
-        'nao_autorizado': 'nao_autorizado',
-        'nao autorizado': 'nao_autorizado',
-        'não_autorizado': 'nao_autorizado',
-        
-        # Variações de "rescindido"
-        'rescindido': 'rescindido',
-        'rescindida': 'rescindido'
-    }
-    
-    return status_map.get(status_str, 'pendente_assinatura')
+    return STATUS_CONTRATO_MAP.get(str(status).strip().lower(), 'pendente_assinatura')
 
 
 def normalize_modalidade(modalidade):
@@ -143,37 +213,7 @@ def normalize_modalidade(modalidade):
     if pd.isna(modalidade):
         return 'PRODUTO'
     
-    modalidade_str = str(modalidade).strip().upper()
-    
-    # Mapeamento completo para o formato original do sistema
-    modalidade_map = {
-        # Variações de "BOLSA"
-        'BOLSA': 'BOLSA',
-        'BOLSAS': 'BOLSA',
-        'BOLSISTA': 'BOLSA',
-        'BOLSISTAS': 'BOLSA',
-        
-        # Variações de "PRODUTO"
-        'PRODUTO': 'PRODUTO',
-        'PRODUTOS': 'PRODUTO',
-        'PRODUÇÃO': 'PRODUTO',
-        'PRODUCAO': 'PRODUTO',
-        
-        # Variações de "RPA"
-        'RPA': 'RPA',
-        'RPAS': 'RPA',
-        'R.P.A': 'RPA',
-        'R.P.A.': 'RPA',
-        
-        # Variações de "CLT"
-        'CLT': 'CLT',
-        'CELETISTA': 'CLT',
-        'EMPREGADO': 'CLT',
-        'FUNCIONARIO': 'CLT',
-        'FUNCIONÁRIO': 'CLT'
-    }
-    
-    return modalidade_map.get(modalidade_str, 'PRODUTO')
+    return MODALIDADE_MAP.get(str(modalidade).strip().upper(), 'PRODUTO')
 
 
 def normalize_natureza_demanda(natureza):
@@ -181,29 +221,7 @@ def normalize_natureza_demanda(natureza):
     if pd.isna(natureza):
         return 'novo'
     
-    natureza_str = str(natureza).strip().lower()
-    
-    # Mapeamento para o formato original do sistema
-    natureza_map = {
-        # Variações de "renovação"
-        'renovacao': 'renovacao',
-        'renovação': 'renovacao',
-        'renovacão': 'renovacao',
-        'renovaçao': 'renovacao',
-        'renov': 'renovacao',
-        'renovar': 'renovacao',
-        
-        # Variações de "novo"
-        'novo': 'novo',
-        'nova': 'novo',
-        'novos': 'novo',
-        'novas': 'novo',
-        'inicial': 'novo',
-        'primeiro': 'novo',
-        'primeira': 'novo'
-    }
-    
-    return natureza_map.get(natureza_str, 'novo')
+    return NATUREZA_DEMANDA_MAP.get(str(natureza).strip().lower(), 'novo')
 
 
 def format_date(date_value):
@@ -227,48 +245,179 @@ def format_date(date_value):
     return None
 
 
-def migrate_pessoa_fisica():
+# ----------------------------------------------------------------------
+# Versões vetorizadas (coluna inteira de uma vez)
+# ----------------------------------------------------------------------
+
+def normalize_column(series, mapping, default, upper=False):
+    """Aplica um dos mapeamentos de normalização a uma coluna inteira"""
+    text = series.astype(str).str.strip()
+    text = text.str.upper() if upper else text.str.lower()
+    return text.map(mapping).where(series.notna()).fillna(default)
+
+
+def text_column(series):
+    """Equivalente vetorizado de str(valor).strip(), com None para células vazias"""
+    return series.astype(str).str.strip().where(series.notna(), None)
+
+
+def format_date_column(series):
+    """Equivalente vetorizado de format_date"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.strftime('%Y-%m-%d').where(series.notna(), None)
+    
+    # Colunas mistas: objetos datetime e textos 'AAAA-MM-DD[ hh:mm:ss]'
+    is_datetime = series.map(lambda value: isinstance(value, datetime))
+    is_text = series.map(lambda value: isinstance(value, str))
+    
+    dates = pd.to_datetime(series.where(is_datetime), errors='coerce')
+    if is_text.any():
+        # Remover possível informação de hora
+        from_text = pd.to_datetime(
+            series.where(is_text).astype(object).str.split(' ').str[0],
+            format='%Y-%m-%d', errors='coerce'
+        )
+        dates = dates.fillna(from_text)
+    return dates.dt.strftime('%Y-%m-%d').where(dates.notna(), None)
+
+
+def number_column(series, integer=False, default=None):
+    """
+    Converte uma coluna para número; valores inválidos viram NaN (ou default)
+    
+    Com integer=True a parte decimal é descartada, como int() fazia na
+    migração linha a linha (1.6 vira 1).
+    """
+    numbers = pd.to_numeric(series, errors='coerce')
+    if default is not None:
+        numbers = numbers.fillna(default)
+    if integer:
+        numbers = np.trunc(numbers.astype(float)).astype('Int64')
+    return numbers
+
+
+class RejectCollector:
+    """Acumula as linhas rejeitadas e as grava no arquivo de rejeitados"""
+    
+    def __init__(self):
+        self.rows = []
+    
+    def add(self, table, lines, reason):
+        """Registra uma ou mais linhas (números de linha da planilha) com o mesmo motivo"""
+        for line in lines:
+            self.rows.append({"tabela": table, "linha": int(line), "motivo": str(reason)})
+    
+    def count(self, table):
+        return sum(1 for row in self.rows if row["tabela"] == table)
+    
+    def save(self, path=REJECTS_FILE):
+        if not self.rows:
+            return None
+        pd.DataFrame(self.rows, columns=["tabela", "linha", "motivo"]).to_csv(
+            path, index=False, encoding="utf-8-sig"
+        )
+        return path
+
+
+def reject_rows(df, mask, table, reason, rejects):
+    """Separa as linhas marcadas em mask, registrando-as como rejeitadas"""
+    if mask.any():
+        rejects.add(table, df.loc[mask, "_linha"], reason)
+        log_message(f"{table}: {int(mask.sum())} linhas rejeitadas ({reason})", "WARNING")
+    return df.loc[~mask]
+
+
+def insert_rows(conn, sql, df, columns, table, rejects):
+    """
+    Insere as linhas de df em lotes de CHUNK_SIZE com executemany
+    
+    Cada lote roda dentro de um SAVEPOINT; se o lote falhar, ele é desfeito e
+    reenviado linha a linha, e só as linhas com erro vão para os rejeitados.
+    
+    Returns:
+        int: Quantidade de linhas inseridas
+    """
+    cursor = conn.cursor()
+    values = df[columns].astype(object)
+    values = values.where(values.notna(), None)
+    rows = list(values.itertuples(index=False, name=None))
+    lines = df["_linha"].tolist()
+    
+    inserted = 0
+    for start in range(0, len(rows), CHUNK_SIZE):
+        chunk = rows[start:start + CHUNK_SIZE]
+        cursor.execute("SAVEPOINT lote")
+        try:
+            cursor.executemany(sql, chunk)
+            cursor.execute("RELEASE SAVEPOINT lote")
+            inserted += len(chunk)
+            continue
+        except sqlite3.Error:
+            cursor.execute("ROLLBACK TO SAVEPOINT lote")
+            cursor.execute("RELEASE SAVEPOINT lote")
+        
+        for line, row in zip(lines[start:start + CHUNK_SIZE], chunk):
+            try:
+                cursor.execute(sql, row)
+                inserted += 1
+            except sqlite3.Error as e:
+                rejects.add(table, [line], e)
+    
+    return inserted
+
+
+def read_sheet(sheet_name):
+    """Lê uma aba da planilha, guardando o número da linha original em _linha"""
+    df = pd.read_excel('dados_migrar.xlsx', sheet_name=sheet_name)
+    df["_linha"] = df.index + 2
+    return df
+
+
+def open_connection():
+    """Abre o banco com uma transação explícita (os lotes usam SAVEPOINT dentro dela)"""
+    conn = sqlite3.connect("sisproj_pf.db")
+    conn.execute("BEGIN")
+    return conn
+
+
+def migrate_pessoa_fisica(rejects):
     """Migra dados da tabela pessoa_fisica"""
     log_message("Iniciando migração de pessoa_fisica...")
     
     # Ler dados da planilha
-    df = pd.read_excel('dados_migrar.xlsx', sheet_name='pessoa_fisica')
+    df = read_sheet('pessoa_fisica')
     
-    conn = sqlite3.connect("sisproj_pf.db")
-    cursor = conn.cursor()
+    # Preparar dados (coluna a coluna)
+    df["id"] = number_column(df["id"], integer=True)
+    for column in ["nome_completo", "cpf", "email", "telefone"]:
+        df[column] = text_column(df[column])
+    df["data_cadastro"] = format_date_column(df["data_cadastro"]).fillna(
+        datetime.now().strftime('%Y-%m-%d')
+    )
+    
+    df = reject_rows(df, df["nome_completo"].isna() | (df["nome_completo"] == ""),
+                     'pessoa_fisica', "Nome completo vazio", rejects)
+    df = reject_rows(df, df["id"].isna(), 'pessoa_fisica', "ID inválido", rejects)
     
-    success_count = 0
-    error_count = 0
+    conn = open_connection()
     
     try:
-        for index, row in df.iterrows():
-            try:
-                # Preparar dados
-                nome_completo = str(row['nome_completo']).strip() if not pd.isna(row['nome_completo']) else None
-                cpf = str(row['cpf']).strip() if not pd.isna(row['cpf']) else None
-                email = str(row['email']).strip() if not pd.isna(row['email']) else None
-                telefone = str(row['telefone']).strip() if not pd.isna(row['telefone']) else None
-                data_cadastro = format_date(row['data_cadastro']) or datetime.now().strftime('%Y-%m-%d')
-                
-                if not nome_completo:
-                    log_message(f"Linha {index + 2}: Nome completo vazio, pulando", "WARNING")
-                    error_count += 1
-                    continue
-                
-                # Inserir no banco usando o ID original da planilha
-                cursor.execute("""
-                    INSERT INTO pessoa_fisica (id, nome_completo, cpf, email, telefone, data_cadastro)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (int(row['id']), nome_completo, cpf, email, telefone, data_cadastro))
-                
-                success_count += 1
-                
-            except Exception as e:
-                error_count += 1
-                log_message(f"Erro na linha {index + 2}: {e}", "ERROR")
+        # Inserir no banco usando o ID original da planilha
+        success_count = insert_rows(
+            conn,
+            """
+            INSERT INTO pessoa_fisica (id, nome_completo, cpf, email, telefone, data_cadastro)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            df,
+            ["id", "nome_completo", "cpf", "email", "telefone", "data_cadastro"],
+            'pessoa_fisica',
+            rejects,
+        )
         
         conn.commit()
-        log_message(f"Migração pessoa_fisica concluída: {success_count} sucessos, {error_count} erros")
+        log_message(f"Migração pessoa_fisica concluída: {success_count} sucessos, "
+                    f"{rejects.count('pessoa_fisica')} erros")
         
     except Exception as e:
         log_message(f"Erro geral na migração pessoa_fisica: {e}", "ERROR")
@@ -278,45 +427,41 @@ def migrate_pessoa_fisica():
         conn.close()
 
 
-def migrate_demanda():
+def migrate_demanda(rejects):
     """Migra dados da tabela demanda"""
     log_message("Iniciando migração de demanda...")
     
     # Ler dados da planilha
-    df = pd.read_excel('dados_migrar.xlsx', sheet_name='demanda')
+    df = read_sheet('demanda')
     
-    conn = sqlite3.connect("sisproj_pf.db")
-    cursor = conn.cursor()
+    # Preparar dados (coluna a coluna)
+    df["codigo"] = number_column(df["codigo"], integer=True)
+    df["data_entrada"] = format_date_column(df["data_entrada"])
+    df["data_protocolo"] = format_date_column(df["data_protocolo"])
+    for column in ["solicitante", "oficio", "nup_sei"]:
+        df[column] = text_column(df[column])
     
-    success_count = 0
-    error_count = 0
+    df = reject_rows(df, df["codigo"].isna(), 'demanda', "Código inválido", rejects)
+    
+    conn = open_connection()
     
     try:
-        for index, row in df.iterrows():
-            try:
-                # Preparar dados
-                codigo = int(row['codigo'])
-                data_entrada = format_date(row['data_entrada'])
-                solicitante = str(row['solicitante']).strip() if not pd.isna(row['solicitante']) else None
-                data_protocolo = format_date(row['data_protocolo'])
-                oficio = str(row['oficio']).strip() if not pd.isna(row['oficio']) else None
-                nup_sei = str(row['nup_sei']).strip() if not pd.isna(row['nup_sei']) else None
-                status = str(row['status']).strip() if not pd.isna(row['status']) else 'Novo'
-                
-                # Inserir no banco usando o código original da planilha
-                cursor.execute("""
-                    INSERT INTO demanda (codigo, data_entrada, solicitante, data_protocolo, oficio, nup_sei)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (codigo, data_entrada, solicitante, data_protocolo, oficio, nup_sei))
-                
-                success_count += 1
-                
-            except Exception as e:
-                error_count += 1
-                log_message(f"Erro na linha {index + 2}: {e}", "ERROR")
+        # Inserir no banco usando o código original da planilha
+        success_count = insert_rows(
+            conn,
+            """
+            INSERT INTO demanda (codigo, data_entrada, solicitante, data_protocolo, oficio, nup_sei)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            df,
+            ["codigo", "data_entrada", "solicitante", "data_protocolo", "oficio", "nup_sei"],
+            'demanda',
+            rejects,
+        )
         
         conn.commit()
-        log_message(f"Migração demanda concluída: {success_count} sucessos, {error_count} erros")
+        log_message(f"Migração demanda concluída: {success_count} sucessos, "
+                    f"{rejects.count('demanda')} erros")
         
     except Exception as e:
         log_message(f"Erro geral na migração demanda: {e}", "ERROR")
@@ -326,84 +471,68 @@ def migrate_demanda():
         conn.close()
 
 
-def migrate_contrato_pf():
+def migrate_contrato_pf(rejects):
     """Migra dados da tabela contrato_pf"""
     log_message("Iniciando migração de contrato_pf...")
     
     # Ler dados da planilha
-    df = pd.read_excel('dados_migrar.xlsx', sheet_name='contrato_pf')
+    df = read_sheet('contrato_pf')
     
-    conn = sqlite3.connect("sisproj_pf.db")
-    cursor = conn.cursor()
+    # Preparar dados (coluna a coluna)
+    for column in ["id", "codigo_demanda", "id_pessoa_fisica"]:
+        df[column] = number_column(df[column], integer=True)
+    for column in ["instituicao", "instrumento", "subprojeto", "ta", "pta", "acao",
+                   "resultado", "meta", "numero_contrato", "observacoes"]:
+        df[column] = text_column(df[column])
+    df["modalidade"] = normalize_column(df["modalidade"], MODALIDADE_MAP, 'PRODUTO', upper=True)
+    df["natureza_demanda"] = normalize_column(df["natureza_demanda"], NATUREZA_DEMANDA_MAP, 'novo')
+    df["status_contrato"] = normalize_column(df["status_contrato"], STATUS_CONTRATO_MAP, 'pendente_assinatura')
+    df["vigencia_inicial"] = format_date_column(df["vigencia_inicial"])
+    df["vigencia_final"] = format_date_column(df["vigencia_final"])
+    df["meses"] = number_column(df["meses"], integer=True, default=0)
+    df["intersticio"] = number_column(df["intersticio"], integer=True, default=0)
+    for column in ["remuneracao", "valor_intersticio", "valor_complementar", "total_contrato"]:
+        df[column] = number_column(df[column], default=0.0)
+    
+    df = reject_rows(df, df["id"].isna(), 'contrato_pf', "ID inválido", rejects)
     
-    success_count = 0
-    error_count = 0
+    conn = open_connection()
     
     try:
-        for index, row in df.iterrows():
-            try:
-                # Verificar se pessoa_fisica e demanda existem
-                cursor.execute("SELECT COUNT(*) FROM pessoa_fisica WHERE id = ?", (int(row['id_pessoa_fisica']),))
-                if cursor.fetchone()[0] == 0:
-                    log_message(f"Linha {index + 2}: Pessoa física ID {row['id_pessoa_fisica']} não encontrada", "WARNING")
-                    error_count += 1
-                    continue
-                
-                cursor.execute("SELECT COUNT(*) FROM demanda WHERE codigo = ?", (int(row['codigo_demanda']),))
-                if cursor.fetchone()[0] == 0:
-                    log_message(f"Linha {index + 2}: Demanda código {row['codigo_demanda']} não encontrada", "WARNING")
-                    error_count += 1
-                    continue
-                
-                # Preparar dados
-                id_contrato = int(row['id'])
-                codigo_demanda = int(row['codigo_demanda'])
-                id_pessoa_fisica = int(row['id_pessoa_fisica'])
-                instituicao = str(row['instituicao']).strip() if not pd.isna(row['instituicao']) else None
-                instrumento = str(row['instrumento']).strip() if not pd.isna(row['instrumento']) else None
-                subprojeto = str(row['subprojeto']).strip() if not pd.isna(row['subprojeto']) else None
-                ta = str(row['ta']).strip() if not pd.isna(row['ta']) else None
-                pta = str(row['pta']).strip() if not pd.isna(row['pta']) else None
-                acao = str(row['acao']).strip() if not pd.isna(row['acao']) else None
-                resultado = str(row['resultado']).strip() if not pd.isna(row['resultado']) else None
-                meta = str(row['meta']).strip() if not pd.isna(row['meta']) else None
-                modalidade = normalize_modalidade(row['modalidade'])
-                natureza_demanda = normalize_natureza_demanda(row['natureza_demanda'])
-                numero_contrato = str(row['numero_contrato']).strip() if not pd.isna(row['numero_contrato']) else None
-                vigencia_inicial = format_date(row['vigencia_inicial'])
-                vigencia_final = format_date(row['vigencia_final'])
-                meses = int(row['meses']) if not pd.isna(row['meses']) else 0
-                status_contrato = normalize_status_contrato(row['status_contrato'])
-                remuneracao = float(row['remuneracao']) if not pd.isna(row['remuneracao']) else 0.0
-                intersticio = int(row['intersticio']) if not pd.isna(row['intersticio']) else 0
-                valor_intersticio = float(row['valor_intersticio']) if not pd.isna(row['valor_intersticio']) else 0.0
-                valor_complementar = float(row['valor_complementar']) if not pd.isna(row['valor_complementar']) else 0.0
-                total_contrato = float(row['total_contrato']) if not pd.isna(row['total_contrato']) else 0.0
-                observacoes = str(row['observacoes']).strip() if not pd.isna(row['observacoes']) else None
-                
-                # Inserir no banco
-                cursor.execute("""
-                    INSERT INTO contrato_pf (
-                        id, codigo_demanda, id_pessoa_fisica, instituicao, instrumento, subprojeto,
-                        ta, pta, acao, resultado, meta, modalidade, natureza_demanda, numero_contrato,
-                        vigencia_inicial, vigencia_final, meses, status_contrato, remuneracao,
-                        intersticio, valor_intersticio, valor_complementar, total_contrato, observacoes
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    id_contrato, codigo_demanda, id_pessoa_fisica, instituicao, instrumento, subprojeto,
-                    ta, pta, acao, resultado, meta, modalidade, natureza_demanda, numero_contrato,
-                    vigencia_inicial, vigencia_final, meses, status_contrato, remuneracao,
-                    intersticio, valor_intersticio, valor_complementar, total_contrato, observacoes
-                ))
-                
-                success_count += 1
-                
-            except Exception as e:
-                error_count += 1
-                log_message(f"Erro na linha {index + 2}: {e}", "ERROR")
+        # Verificar se pessoa_fisica e demanda existem (uma consulta por tabela)
+        pessoas = {row[0] for row in conn.execute("SELECT id FROM pessoa_fisica")}
+        demandas = {row[0] for row in conn.execute("SELECT codigo FROM demanda")}
+        
+        df = reject_rows(df, ~df["id_pessoa_fisica"].isin(pessoas),
+                         'contrato_pf', "Pessoa física não encontrada", rejects)
+        df = reject_rows(df, ~df["codigo_demanda"].isin(demandas),
+                         'contrato_pf', "Demanda não encontrada", rejects)
+        
+        # Inserir no banco
+        success_count = insert_rows(
+            conn,
+            """
+            INSERT INTO contrato_pf (
+                id, codigo_demanda, id_pessoa_fisica, instituicao, instrumento, subprojeto,
+                ta, pta, acao, resultado, meta, modalidade, natureza_demanda, numero_contrato,
+                vigencia_inicial, vigencia_final, meses, status_contrato, remuneracao,
+                intersticio, valor_intersticio, valor_complementar, total_contrato, observacoes
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            df,
+            [
+                "id", "codigo_demanda", "id_pessoa_fisica", "instituicao", "instrumento", "subprojeto",
+                "ta", "pta", "acao", "resultado", "meta", "modalidade", "natureza_demanda", "numero_contrato",
+                "vigencia_inicial", "vigencia_final", "meses", "status_contrato", "remuneracao",
+                "intersticio", "valor_intersticio", "valor_complementar", "total_contrato", "observacoes",
+            ],
+            'contrato_pf',
+            rejects,
+        )
         
         conn.commit()
-        log_message(f"Migração contrato_pf concluída: {success_count} sucessos, {error_count} erros")
+        log_message(f"Migração contrato_pf concluída: {success_count} sucessos, "
+                    f"{rejects.count('contrato_pf')} erros")
         
     except Exception as e:
         log_message(f"Erro geral na migração contrato_pf: {e}", "ERROR")
@@ -493,11 +622,16 @@ def main():
         
         # Executar migração
         clean_database()
-        migrate_pessoa_fisica()
-        migrate_demanda()
-        migrate_contrato_pf()
+        rejects = RejectCollector()
+        migrate_pessoa_fisica(rejects)
+        migrate_demanda(rejects)
+        migrate_contrato_pf(rejects)
         verify_migration()
         
+        rejects_file = rejects.save()
+        if rejects_file:
+            log_message(f"{len(rejects.rows)} linhas rejeitadas registradas em: {rejects_file}", "WARNING")
+        
         print("\n" + "=" * 60)
         log_message("MIGRAÇÃO CONCLUÍDA COM SUCESSO!")
         if backup_file:
@@ -19,6 +19,7 @@ Data: 2025-06-08
 import pandas as pd
 import sqlite3
 import sys
+import time
 from datetime import datetime
 import os
 
@@ -57,6 +58,15 @@ def clean_produtos_table():
         # Reset do ID auto-incremental
         cursor.execute("DELETE FROM sqlite_sequence WHERE name = 'produto_pf'")
         
+        # Sequências de número de produto: a próxima reserva de cada contrato
+        # recria a linha a partir do maior número gravado
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='produto_seq'"
+        )
+        if cursor.fetchone():
+            cursor.execute("DELETE FROM produto_seq")
+            log_message("Tabela produto_seq limpa")
+        
         # Reabilitar chaves estrangeiras
         cursor.execute("PRAGMA foreign_keys = ON")
         
@@ -71,48 +81,53 @@ def clean_produtos_table():
         conn.close()
 
 
+# Linhas enviadas ao banco por chamada de executemany
+CHUNK_SIZE = 5000
+
+# Linhas inseridas entre um commit e o seguinte
+COMMIT_EVERY = 50000
+
+# Mapeamento de status para o formato original do sistema
+STATUS_PRODUTO_MAP = {
+    # Variações de "programado"
+    'programado': 'programado',
+    'programada': 'programado',
+    'pendente': 'programado',
+    'agendado': 'programado',
+    'planejado': 'programado',
+    
+    # Variações de "em execução"
+    'em execução': 'em_execucao',
+    'em execucao': 'em_execucao',
+    'em_execucao': 'em_execucao',
+    'executando': 'em_execucao',
+    'andamento': 'em_execucao',
+    'em andamento': 'em_execucao',
+    
+    # Variações de "entregue"
+    'entregue': 'entregue',
+    'entregues': 'entregue',
+    'finalizado': 'entregue',
+    'concluido': 'entregue',
+    'concluído': 'entregue',
+    'completo': 'entregue',
+    'terminado': 'entregue',
+    
+    # Variações de "cancelado"
+    'cancelado': 'cancelado',
+    'cancelada': 'cancelado',
+    'suspenso': 'cancelado',
+    'interrompido': 'cancelado',
+    'anulado': 'cancelado'
+}
+
+
 def normalize_status_produto(status):
     """Normaliza o status do produto para valores aceitos pelo constraint"""
     if pd.isna(status) or str(status).strip() == '':
         return 'programado'  # Status padrão
     
-    status_str = str(status).strip().lower()
-    
-    # Mapeamento de status para o formato original do sistema
-    status_map = {
-        # Variações de "programado"
-        'programado': 'programado',
-        'programada': 'programado',
-        'pendente': 'programado',
-        'agendado': 'programado',
-        'planejado': 'programado',
-        
-        # Variações de "em execução"
-        'em execução': 'em_execucao',
-        'em execucao': 'em_execucao',
-        'em_execucao': 'em_execucao',
-        'executando': 'em_execucao',
-        'andamento': 'em_execucao',
-        'em andamento': 'em_execucao',
-        
-        # Variações de "entregue"
-        'entregue': 'entregue',
-        'entregues': 'entregue',
-        'finalizado': 'entregue',
-        'concluido': 'entregue',
-        'concluído': 'entregue',
-        'completo': 'entregue',
-        'terminado': 'entregue',
-        
-        # Variações de "cancelado"
-        'cancelado': 'cancelado',
-        'cancelada': 'cancelado',
-        'suspenso': 'cancelado',
-        'interrompido': 'cancelado',
-        'anulado': 'cancelado'
-    }
-    
-    return status_map.get(status_str, 'programado')
+    return STATUS_PRODUTO_MAP.get(str(status).strip().lower(), 'programado')
 
 
 def format_date(date_value):
@@ -141,6 +156,42 @@ def generate_numero_produto(index, id_contrato):
     return f"PROD-{id_contrato}-{index:04d}"
 
 
+def normalize_status_column(series):
+    """Versão vetorizada de normalize_status_produto (coluna inteira)"""
+    status = series.astype(str).str.strip().str.lower()
+    return status.map(STATUS_PRODUTO_MAP).where(series.notna()).fillna('programado')
+
+
+def format_date_column(series):
+    """Versão vetorizada de format_date (coluna inteira)"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.strftime('%Y-%m-%d').where(series.notna(), None)
+    
+    # Colunas mistas: objetos datetime e textos 'AAAA-MM-DD[ hh:mm:ss]'
+    is_datetime = series.map(lambda value: isinstance(value, datetime))
+    is_text = series.map(lambda value: isinstance(value, str))
+    
+    dates = pd.to_datetime(series.where(is_datetime), errors='coerce')
+    if is_text.any():
+        # Remover possível informação de hora
+        from_text = pd.to_datetime(
+            series.where(is_text).astype(object).str.split(' ').str[0],
+            format='%Y-%m-%d', errors='coerce'
+        )
+        dates = dates.fillna(from_text)
+    return dates.dt.strftime('%Y-%m-%d').where(dates.notna(), None)
+
+
+def text_column(series):
+    """Equivalente vetorizado de str(valor).strip(), com None para células vazias"""
+    return series.astype(str).str.strip().where(series.notna(), None)
+
+
+def generate_numero_column(line_numbers, id_contrato):
+    """Versão vetorizada de generate_numero_produto"""
+    return "PROD-" + id_contrato.astype(str) + "-" + line_numbers.astype(str).str.zfill(4)
+
+
 def migrate_produtos_pf():
     """Migra dados da aba Produto_PF para a tabela produto_pf"""
     log_message("Iniciando migração de produtos PF...")
@@ -154,62 +205,101 @@ def migrate_produtos_pf():
     conn = sqlite3.connect("sisproj_pf.db")
     cursor = conn.cursor()
     
-    success_count = 0
     error_count = 0
-    skipped_count = 0  # Contratos inexistentes
     
     try:
-        for index, row in df.iterrows():
+        # Contratos existentes, carregados uma única vez
+        contratos = {row[0] for row in cursor.execute("SELECT id FROM contrato_pf")}
+        
+        # Preparar dados (coluna a coluna)
+        df["_linha"] = df.index + 2
+        df["id_contrato"] = pd.to_numeric(df["id_contrato"], errors='coerce').round().astype('Int64')
+        
+        invalid = df["id_contrato"].isna()
+        for line in df.loc[invalid, "_linha"]:
+            log_message(f"Linha {line}: ID de contrato inválido", "ERROR")
+        error_count += int(invalid.sum())
+        df = df.loc[~invalid]
+        
+        missing = ~df["id_contrato"].isin(contratos)
+        for line, id_contrato in df.loc[missing, ["_linha", "id_contrato"]].itertuples(index=False):
+            log_message(f"Linha {line}: Contrato ID {id_contrato} não encontrado, pulando", "WARNING")
+        skipped_count = int(missing.sum())  # Contratos inexistentes
+        df = df.loc[~missing].copy()
+        
+        df["numero"] = generate_numero_column(df["_linha"] - 1, df["id_contrato"])
+        df["data_programada"] = format_date_column(df["data_programada"])
+        df["instrumento"] = text_column(df["instrumento"])
+        df["data_entrega"] = format_date_column(df["data_entrega"])
+        df["status"] = normalize_status_column(df["status"])
+        df["titulo"] = text_column(df["titulo"])
+        
+        # Valor pode estar na coluna 'VALOR DAS PARCELAS'
+        if 'VALOR DAS PARCELAS' in df.columns:
+            df["valor"] = pd.to_numeric(df['VALOR DAS PARCELAS'], errors='coerce').fillna(0.0)
+        else:
+            df["valor"] = 0.0
+        
+        columns = [
+            "id_contrato", "numero", "data_programada", "instrumento",
+            "data_entrega", "status", "titulo", "valor",
+        ]
+        values = df[columns].astype(object)
+        values = values.where(values.notna(), None)
+        rows = list(values.itertuples(index=False, name=None))
+        lines = df["_linha"].tolist()
+        
+        sql = """
+            INSERT INTO produto_pf (
+                id_contrato, numero, data_programada, instrumento, 
+                data_entrega, status, titulo, valor
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        
+        # Inserir no banco em lotes, com commits periódicos. A transação é
+        # aberta explicitamente para que os SAVEPOINTs dos lotes fiquem
+        # aninhados nela (sem ela, cada RELEASE confirmaria o lote)
+        success_count = 0
+        uncommitted = 0
+        start_time = time.perf_counter()
+        cursor.execute("BEGIN")
+        
+        for start in range(0, len(rows), CHUNK_SIZE):
+            chunk = rows[start:start + CHUNK_SIZE]
+            cursor.execute("SAVEPOINT lote")
             try:
-                # Verificar se o contrato existe
-                id_contrato = int(row['id_contrato'])
-                cursor.execute("SELECT COUNT(*) FROM contrato_pf WHERE id = ?", (id_contrato,))
-                if cursor.fetchone()[0] == 0:
-                    log_message(f"Linha {index + 2}: Contrato ID {id_contrato} não encontrado, pulando", "WARNING")
-                    skipped_count += 1
-                    continue
-                
-                # Preparar dados
-                numero = generate_numero_produto(index + 1, id_contrato)
-                data_programada = format_date(row['data_programada'])
-                instrumento = str(row['instrumento']).strip() if not pd.isna(row['instrumento']) else None
-                data_entrega = format_date(row['data_entrega'])
-                status = normalize_status_produto(row['status'])
-                titulo = str(row['titulo']).strip() if not pd.isna(row['titulo']) else None
-                
-                # Valor pode estar na coluna 'VALOR DAS PARCELAS'
-                valor_raw = row.get('VALOR DAS PARCELAS', 0)
-                if pd.isna(valor_raw):
-                    valor = 0.0
-                else:
+                cursor.executemany(sql, chunk)
+                cursor.execute("RELEASE SAVEPOINT lote")
+                inserted = len(chunk)
+            except sqlite3.Error:
+                # Refazer o lote linha a linha para isolar as linhas com erro
+                cursor.execute("ROLLBACK TO SAVEPOINT lote")
+                cursor.execute("RELEASE SAVEPOINT lote")
+                inserted = 0
+                for line, row in zip(lines[start:start + CHUNK_SIZE], chunk):
                     try:
-                        valor = float(valor_raw)
-                    except (ValueError, TypeError):
-                        valor = 0.0
-                
-                # Inserir no banco
-                cursor.execute("""
-                    INSERT INTO produto_pf (
-                        id_contrato, numero, data_programada, instrumento, 
-                        data_entrega, status, titulo, valor
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    id_contrato, numero, data_programada, instrumento,
-                    data_entrega, status, titulo, valor
-                ))
-                
-                success_count += 1
-                
-                # Log a cada 1000 registros processados
-                if (index + 1) % 1000 == 0:
-                    log_message(f"Processados {index + 1} registros...")
-                
-            except Exception as e:
-                error_count += 1
-                log_message(f"Erro na linha {index + 2}: {e}", "ERROR")
+                        cursor.execute(sql, row)
+                        inserted += 1
+                    except sqlite3.Error as e:
+                        error_count += 1
+                        log_message(f"Erro na linha {line}: {e}", "ERROR")
+            
+            success_count += inserted
+            uncommitted += inserted
+            
+            if uncommitted >= COMMIT_EVERY:
+                conn.commit()
+                cursor.execute("BEGIN")
+                uncommitted = 0
+                elapsed = time.perf_counter() - start_time
+                log_message(f"Inseridos {success_count} registros "
+                            f"({success_count / elapsed:.0f} registros/s)")
         
         conn.commit()
-        log_message(f"Migração produtos PF concluída: {success_count} sucessos, {error_count} erros, {skipped_count} pulados")
+        elapsed = time.perf_counter() - start_time
+        rate = success_count / elapsed if elapsed > 0 else 0
+        log_message(f"Migração produtos PF concluída: {success_count} sucessos, {error_count} erros, "
+                    f"{skipped_count} pulados ({rate:.0f} registros/s)")
         
     except Exception as e:
         log_message(f"Erro geral na migração produtos PF: {e}", "ERROR")
@@ -1,5 +1,135 @@
 import sqlite3
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+from models.database import get_connection
+
+
+# Levels of the custeio hierarchy, from the root of the index to the leaves
+HIERARCHY = ('instituicao_parceira', 'cod_projeto', 'cod_ta', 'resultado', 'subprojeto')
+
+
+class CusteioIndex:
+    """
+    In-memory trie of the custeio hierarchy
+    (instituicao_parceira -> cod_projeto -> cod_ta -> resultado -> subprojeto).
+
+    The trie is built once from the custeio table and rebuilt only when the
+    table signature (row count and highest id) changes. The signature is
+    checked at most every `check_interval` seconds, so cascading lookups are
+    answered from memory; answers are memoized per (column, filters).
+    """
+
+    def __init__(self, connect, check_interval: float = 30.0):
+        """
+        Args:
+            connect: Callable returning a new database connection
+            check_interval: Seconds between table signature checks
+        """
+        self._connect = connect
+        self.check_interval = check_interval
+        self._root: Optional[Dict] = None
+        self._signature = None
+        self._checked_at = 0.0
+        self._memo: Dict[Tuple, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Force the next lookup to check the table signature again."""
+        self._checked_at = 0.0
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._root is not None
+            and time.monotonic() - self._checked_at < self.check_interval
+        )
+
+    def _ensure_fresh(self):
+        """Rebuild the trie if the custeio table changed since it was built."""
+        if self._is_fresh():
+            return
+
+        with self._lock:
+            if self._is_fresh():
+                return
+
+            conn = self._connect()
+            cursor = conn.cursor()
+            try:
+                cursor.execute("SELECT COUNT(*), MAX(id) FROM custeio")
+                signature = tuple(cursor.fetchone())
+
+                if self._root is None or signature != self._signature:
+                    cursor.execute(f"SELECT {', '.join(HIERARCHY)} FROM custeio")
+                    self._root = self._build(cursor.fetchall())
+                    self._signature = signature
+                    self._memo = {}
+
+                self._checked_at = time.monotonic()
+            finally:
+                conn.close()
+
+    @staticmethod
+    def _build(rows) -> Dict:
+        root: Dict = {}
+        for row in rows:
+            node = root
+            for value in row:
+                node = node.setdefault(value, {})
+        return root
+
+    def distinct_values(self, column: str, filters: Optional[Dict[str, str]] = None) -> List[str]:
+        """
+        Same contract as CusteioManager.get_distinct_values, served from memory.
+
+        Args:
+            column: One of HIERARCHY
+            filters: Dictionary of HIERARCHY column-value pairs; empty values are ignored
+
+        Returns:
+            Sorted list of distinct non-empty values
+        """
+        self._ensure_fresh()
+
+        active = tuple(sorted((c, v) for c, v in (filters or {}).items() if v))
+        key = (column, active)
+        result = self._memo.get(key)
+        if result is None:
+            values = set()
+            self._collect(self._root, 0, HIERARCHY.index(column), dict(active), values)
+            result = sorted(values)
+            self._memo[key] = result
+
+        return list(result)
+
+    def _collect(self, node: Dict, depth: int, target: int, filters: Dict[str, str], out: set):
+        wanted = filters.get(HIERARCHY[depth])
+        if wanted:
+            children = [(wanted, node[wanted])] if wanted in node else []
+        else:
+            children = node.items()
+
+        for value, child in children:
+            if depth < target:
+                self._collect(child, depth + 1, target, filters, out)
+            elif value and value not in out and self._matches(child, depth + 1, filters):
+                out.add(value)
+
+    def _matches(self, node: Dict, depth: int, filters: Dict[str, str]) -> bool:
+        """Whether some path below `node` satisfies the filters on deeper levels."""
+        if not any(filters.get(column) for column in HIERARCHY[depth:]):
+            return True
+
+        wanted = filters.get(HIERARCHY[depth])
+        if wanted:
+            return wanted in node and self._matches(node[wanted], depth + 1, filters)
+        return any(self._matches(child, depth + 1, filters) for child in node.values())
+
+
+# One index per database, shared by every CusteioManager
+_indexes: Dict[Optional[str], CusteioIndex] = {}
+_indexes_lock = threading.Lock()
 
 
 class CusteioManager:
@@ -8,17 +138,33 @@ class CusteioManager:
     Provides methods for filtering and retrieving hierarchical data.
     """
     
-    def __init__(self, db_path: str = "sisproj_pf.db"):
-        """Initialize the CusteioManager with database path."""
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the CusteioManager.
+
+        Args:
+            db_path: Optional SQLite file; when omitted the configured
+                application database (models.database) is used.
+        """
         self.db_path = db_path
+
+        with _indexes_lock:
+            if db_path not in _indexes:
+                _indexes[db_path] = CusteioIndex(self.get_connection)
+            self.index = _indexes[db_path]
     
     def get_connection(self):
         """Get database connection."""
+        if self.db_path is None:
+            return get_connection()
         return sqlite3.connect(self.db_path)
     
     def get_distinct_values(self, column: str, filters: Optional[Dict[str, str]] = None) -> List[str]:
         """
         Get distinct values from a specific column, optionally filtered.
+
+        Hierarchy columns are answered by the in-memory index; any other
+        column or filter falls back to a database query.
         
         Args:
             column: The column name to get distinct values from
@@ -27,6 +173,13 @@ class CusteioManager:
         Returns:
             List of distinct values, excluding empty/null values
         """
+        if column in HIERARCHY and all(c in HIERARCHY for c in (filters or {})):
+            return self.index.distinct_values(column, filters)
+
+        return self._query_distinct_values(column, filters)
+
+    def _query_distinct_values(self, column: str, filters: Optional[Dict[str, str]] = None) -> List[str]:
+        """Run the SELECT DISTINCT for get_distinct_values against the database."""
         conn = self.get_connection()
         cursor = conn.cursor()
         
@@ -101,13 +254,7 @@ class CusteioManager:
         Returns:
             Dictionary with field names as keys and lists of distinct values as values
         """
-        return {
-            'instituicao_parceira': self.get_distinct_values('instituicao_parceira'),
-            'cod_projeto': self.get_distinct_values('cod_projeto'),
-            'cod_ta': self.get_distinct_values('cod_ta'),
-            'resultado': self.get_distinct_values('resultado'),
-            'subprojeto': self.get_distinct_values('subprojeto')
-        }
+        return {column: self.index.distinct_values(column) for column in HIERARCHY}
     
     def get_projects_by_institution(self, institution: str) -> List[str]:
         """Get projects filtered by institution."""
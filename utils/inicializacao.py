@@ -0,0 +1,78 @@
+# Inicializacao.Py
+"""
+Medição dos tempos de inicialização da aplicação.
+
+O main.py importa este módulo antes de qualquer outro, marca as etapas
+(banco pronto, janela de login exibida, dashboard exibido) e imprime o
+relatório com o tempo de cada uma desde o início do processo. Também
+executa em segundo plano o que não precisa bloquear a janela de login.
+"""
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+
+class Inicializacao:
+    """Marcos e etapas da inicialização, contados a partir da criação"""
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.marcos = []
+        self._lock = threading.Lock()
+
+    def _agora(self):
+        return time.perf_counter() - self.inicio
+
+    def marcar(self, nome):
+        """Registra um marco (tempo decorrido desde o início)"""
+        with self._lock:
+            self.marcos.append((nome, self._agora(), None))
+
+    @contextmanager
+    def etapa(self, nome):
+        """Registra o início e a duração do bloco"""
+        comeco = self._agora()
+        try:
+            yield
+        finally:
+            duracao = self._agora() - comeco
+            with self._lock:
+                self.marcos.append((nome, comeco, duracao))
+
+    def em_segundo_plano(self, nome, funcao, *args):
+        """
+        Executa a função em uma thread de fundo, registrada como etapa
+
+        Returns:
+            Future: Resultado (ou exceção) da função
+        """
+        future = Future()
+
+        def executar():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                with self.etapa(nome):
+                    resultado = funcao(*args)
+            except BaseException as erro:
+                future.set_exception(erro)
+            else:
+                future.set_result(resultado)
+
+        threading.Thread(target=executar, name=nome, daemon=True).start()
+        return future
+
+    def relatorio(self):
+        """Texto com os marcos e etapas em ordem de início"""
+        with self._lock:
+            marcos = sorted(self.marcos, key=lambda marco: marco[1])
+
+        linhas = ["Tempos de inicialização:"]
+        for nome, momento, duracao in marcos:
+            detalhe = f" (duração {duracao * 1000:.1f}ms)" if duracao is not None else ""
+            linhas.append(f"  {momento * 1000:>8.1f}ms  {nome}{detalhe}")
+        return "\n".join(linhas)
+
+
+inicializacao = Inicializacao()
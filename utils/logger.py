@@ -1,17 +1,233 @@
 # Logger.Py
-from models.db_manager_access import get_connection
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from models.database import get_connection, em_transacao
+
+# Arquivo local que recebe os registros quando o banco está inacessível
+ARQUIVO_PENDENTES = os.path.join(
+    os.path.dirname(__file__), "..", "logs_pendentes.jsonl"
+)
+
+
+class GravadorLogs:
+    """
+    Grava os registros de log em lote, em uma thread de fundo
+
+    Os registros entram em uma fila limitada e são gravados com executemany
+    quando o lote atinge `tamanho_lote` ou quando o registro mais antigo
+    espera `intervalo` segundos. Se o banco falhar (ou a fila encher), os
+    registros vão para um arquivo local, reenviado na próxima gravação bem
+    sucedida.
+    """
+
+    def __init__(
+        self,
+        tamanho_lote=50,
+        intervalo=2.0,
+        capacidade=10000,
+        arquivo_pendentes=ARQUIVO_PENDENTES,
+    ):
+        """
+        Args:
+            tamanho_lote (int): Registros que disparam a gravação imediata
+            intervalo (float): Segundos máximos de espera de um registro na fila
+            capacidade (int): Tamanho máximo da fila em memória
+            arquivo_pendentes (str): Arquivo de reserva (uma linha JSON por registro)
+        """
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.arquivo_pendentes = arquivo_pendentes
+
+        self._fila = queue.Queue(maxsize=capacidade)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._lock_arquivo = threading.Lock()
+
+    def registrar(self, usuario, acao):
+        """Enfileira um registro de log (não bloqueia)"""
+        # A data é a da ação, não a da gravação do lote
+        registro = (usuario, acao, datetime.now().replace(microsecond=0))
+
+        self._iniciar()
+        try:
+            self._fila.put_nowait(registro)
+        except queue.Full:
+            self._gravar_pendentes([registro])
+
+    def descarregar(self, tempo_espera=5.0):
+        """
+        Grava imediatamente os registros enfileirados
+
+        Args:
+            tempo_espera (float): Segundos máximos aguardando a gravação
+
+        Returns:
+            bool: True se a fila foi gravada dentro do tempo
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return True
+
+        concluido = threading.Event()
+        try:
+            self._fila.put(concluido, timeout=tempo_espera)
+        except queue.Full:
+            return False
+        return concluido.wait(tempo_espera)
+
+    def _iniciar(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._executar, name="GravadorLogs", daemon=True
+                )
+                self._thread.start()
+
+    def _executar(self):
+        lote = []
+        limite = None
+
+        while True:
+            espera = None if not lote else max(0.0, limite - time.monotonic())
+            try:
+                item = self._fila.get(timeout=espera)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, threading.Event):
+                # Pedido de descarga: grava o que houver e avisa quem pediu
+                self._gravar(lote)
+                lote = []
+                item.set()
+                continue
+
+            if item is not None:
+                if not lote:
+                    limite = time.monotonic() + self.intervalo
+                lote.append(item)
+                if len(lote) < self.tamanho_lote:
+                    continue
+
+            self._gravar(lote)
+            lote = []
+
+    def _gravar(self, lote):
+        """Grava um lote em uma única transação; em caso de falha, no arquivo local"""
+        if not lote:
+            return
+
+        try:
+            conn = get_connection()
+        except Exception as e:
+            print(f"Erro ao gravar logs no banco, usando arquivo local: {e}")
+            self._gravar_pendentes(lote)
+            return
+
+        try:
+            cursor = conn.cursor()
+            cursor.executemany(
+                "INSERT INTO logs (usuario, acao, data_hora) VALUES (?, ?, ?)", lote
+            )
+            conn.commit()
+        except Exception as e:
+            print(f"Erro ao gravar logs no banco, usando arquivo local: {e}")
+            self._gravar_pendentes(lote)
+            return
+        finally:
+            conn.close()
+
+        self._reenviar_pendentes()
+
+    def _gravar_pendentes(self, registros):
+        """Acrescenta registros ao arquivo local de pendentes"""
+        with self._lock_arquivo:
+            with open(self.arquivo_pendentes, "a", encoding="utf-8") as arquivo:
+                for usuario, acao, data_hora in registros:
+                    arquivo.write(
+                        json.dumps(
+                            {
+                                "usuario": usuario,
+                                "acao": acao,
+                                "data_hora": data_hora.strftime("%Y-%m-%d %H:%M:%S"),
+                            },
+                            ensure_ascii=False,
+                        )
+                        + "\n"
+                    )
+
+    def _reenviar_pendentes(self):
+        """Envia ao banco os registros do arquivo local, se houver"""
+        if not os.path.exists(self.arquivo_pendentes):
+            return
+
+        with self._lock_arquivo:
+            try:
+                with open(self.arquivo_pendentes, encoding="utf-8") as arquivo:
+                    registros = [
+                        (
+                            dado["usuario"],
+                            dado["acao"],
+                            datetime.strptime(dado["data_hora"], "%Y-%m-%d %H:%M:%S"),
+                        )
+                        for dado in map(json.loads, filter(str.strip, arquivo))
+                    ]
+
+                if registros:
+                    conn = get_connection()
+                    try:
+                        cursor = conn.cursor()
+                        cursor.executemany(
+                            "INSERT INTO logs (usuario, acao, data_hora) VALUES (?, ?, ?)",
+                            registros,
+                        )
+                        conn.commit()
+                    finally:
+                        conn.close()
+
+                os.remove(self.arquivo_pendentes)
+            except Exception as e:
+                # O arquivo é mantido e reenviado na próxima gravação
+                print(f"Erro ao reenviar logs pendentes: {e}")
+
+
+_gravador = GravadorLogs()
 
 
 def log_action(usuario, acao):
     """
     Registra uma ação do usuário no log do sistema
 
+    A gravação é feita em lote por uma thread de fundo (ver GravadorLogs).
+    Dentro de um bloco transacao() o registro é gravado na própria
+    transação, junto com a alteração que ele descreve.
+
     Args:
         usuario (str): Nome do usuário
         acao (str): Descrição da ação realizada
     """
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO logs (usuario, acao) VALUES (?, ?)", (usuario, acao))
-    conn.commit()
-    conn.close()
+    if em_transacao():
+        conn = get_connection()
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO logs (usuario, acao, data_hora) VALUES (?, ?, ?)",
+            (usuario, acao, datetime.now().replace(microsecond=0)),
+        )
+        return
+
+    _gravador.registrar(usuario, acao)
+
+
+def descarregar_logs(tempo_espera=5.0):
+    """Grava imediatamente os logs pendentes (usado ao encerrar a aplicação)"""
+    return _gravador.descarregar(tempo_espera)
+
+
+atexit.register(descarregar_logs)
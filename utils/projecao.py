@@ -0,0 +1,176 @@
+# Projecao.Py
+"""
+Projeção dos registros do banco em linhas de exibição das tabelas.
+
+Os rótulos de status, a formatação de valores (R$ 1.234,56) e de datas
+(DD/MM/AAAA) ficam aqui, compartilhados pelas telas. Uma Projecao guarda
+as linhas já formatadas por (id, versão): ao recarregar uma tabela, só os
+registros novos ou alterados são formatados de novo.
+"""
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from operator import attrgetter, itemgetter
+
+# Rótulos dos status para exibição
+STATUS_CONTRATO = {
+    "pendente_assinatura": "Pendente Assinatura",
+    "cancelado": "Cancelado",
+    "concluido": "Concluído",
+    "em_tramitacao": "Em Tramitação",
+    "aguardando_autorizacao": "Aguardando Autorização",
+    "nao_autorizado": "Não Autorizado",
+    "rescindido": "Rescindido",
+    "vigente": "Vigente",
+}
+
+STATUS_PRODUTO = {
+    "programado": "Programado",
+    "em_execucao": "Em Execução",
+    "entregue": "Entregue",
+    "cancelado": "Cancelado",
+}
+
+# Tipos de aditivo (inclusive os nomes antigos) como são exibidos
+TIPO_ADITIVO = {
+    "prorrogacao": "TEMPO",
+    "reajuste": "VALOR",
+    "ambos": "TEMPO E VALOR",
+    "tempo": "TEMPO",
+    "valor": "VALOR",
+    "tempo e valor": "TEMPO E VALOR",
+}
+
+# Troca os separadores do formato americano (1,234.56) em uma única passada
+_SEPARADORES_BR = str.maketrans(",.", ".,")
+
+
+def formatar_moeda(valor, simbolo="R$"):
+    """
+    Formata um valor monetário no padrão R$ 1.234,56
+
+    Args:
+        valor: Número (ou texto numérico); None e valores inválidos viram 0,00
+        simbolo (str): Símbolo da moeda
+
+    Returns:
+        str: Valor formatado
+    """
+    try:
+        valor = float(valor) if valor else 0.0
+    except (ValueError, TypeError):
+        valor = 0.0
+    return f"{simbolo} {valor:,.2f}".translate(_SEPARADORES_BR)
+
+
+@lru_cache(maxsize=8192)
+def formatar_data_br(valor):
+    """
+    Converte uma data AAAA-MM-DD (com ou sem hora) para DD/MM/AAAA
+
+    As datas se repetem muito entre as linhas, por isso o resultado fica
+    em cache. Datas já no formato brasileiro e textos em outro formato são
+    devolvidos como estão.
+
+    Args:
+        valor (str): Data como gravada no banco
+
+    Returns:
+        str: Data no padrão brasileiro ("" para data vazia)
+    """
+    if not valor:
+        return ""
+    valor = str(valor)
+    if len(valor) >= 10 and valor[4] == "-" and valor[7] == "-" and valor[:4].isdigit():
+        return f"{valor[8:10]}/{valor[5:7]}/{valor[:4]}{valor[10:]}"
+    return valor
+
+
+def rotulo(mapa):
+    """Formatador que troca o valor pelo rótulo do mapa (ou o mantém)"""
+    return lambda valor: mapa.get(valor, valor)
+
+
+def ou(padrao, formatador=None):
+    """Formatador que exibe `padrao` para valores vazios"""
+    if formatador is None:
+        return lambda valor: valor or padrao
+    return lambda valor: formatador(valor) if valor else padrao
+
+
+class Projecao:
+    """
+    Converte registros em tuplas de exibição, com cache por (id, versão)
+
+    A versão de um registro é o próprio registro: se qualquer campo mudou
+    desde a última formatação, a linha é formatada de novo. Pode ser usada
+    fora da thread do Tk (as consultas das telas rodam em segundo plano).
+    """
+
+    def __init__(self, colunas, chave="id", capacidade=5000):
+        """
+        Args:
+            colunas (list): Pares (campo, formatador), na ordem das colunas
+                da tabela. O campo é o nome do atributo do registro ou a
+                posição na tupla; o formatador pode ser None (valor exibido
+                como está)
+            chave (str | int): Campo com o ID do registro
+            capacidade (int): Número máximo de linhas guardadas
+        """
+        campos = [campo for campo, _ in colunas]
+        self.campos = tuple(campos)
+        self._valores = self._leitor(campos)
+        self._chave = self._leitor([chave])
+        self._formatadores = tuple(formatador for _, formatador in colunas)
+        self.capacidade = capacidade
+        self._linhas = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _leitor(campos):
+        """Função que devolve a tupla com os campos de um registro"""
+        if all(isinstance(campo, int) for campo in campos):
+            leitor = itemgetter(*campos)
+        else:
+            leitor = attrgetter(*campos)
+        if len(campos) == 1:
+            return lambda registro: (leitor(registro),)
+        return leitor
+
+    def linha(self, registro):
+        """
+        Linha de exibição de um registro
+
+        Returns:
+            tuple: (id, valores na ordem das colunas)
+        """
+        (id_registro,) = self._chave(registro)
+        with self._lock:
+            entrada = self._linhas.get(id_registro)
+            if entrada is not None and entrada[0] == registro:
+                self._linhas.move_to_end(id_registro)
+                return id_registro, entrada[1]
+
+        valores = tuple(
+            formatador(valor) if formatador is not None else valor
+            for formatador, valor in zip(self._formatadores, self._valores(registro))
+        )
+
+        with self._lock:
+            self._linhas[id_registro] = (registro, valores)
+            self._linhas.move_to_end(id_registro)
+            while len(self._linhas) > self.capacidade:
+                self._linhas.popitem(last=False)
+        return id_registro, valores
+
+    def linhas(self, registros):
+        """Linhas de exibição (id, valores) de uma lista de registros"""
+        return [self.linha(registro) for registro in registros]
+
+    def invalidar(self, id_registro=None):
+        """Descarta a linha de um registro (ou todas)"""
+        with self._lock:
+            if id_registro is None:
+                self._linhas.clear()
+            else:
+                self._linhas.pop(id_registro, None)
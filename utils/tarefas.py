@@ -0,0 +1,204 @@
+# Tarefas.Py
+"""
+Execução de consultas fora da thread do Tkinter.
+
+As funções de acesso a dados rodam em um pool de threads; os resultados
+voltam para a thread do Tk por um despachante baseado em `after`, que é o
+único ponto onde os callbacks (que mexem em widgets) são chamados.
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Threads de fundo para consultas ao banco
+MAX_THREADS = 4
+
+# Intervalo (ms) com que o despachante confere os resultados prontos
+INTERVALO_DESPACHO = 30
+
+
+class Tarefa:
+    """Uma consulta submetida ao executor"""
+
+    def __init__(self, widget, ao_concluir, ao_falhar, indicador, canal=None):
+        self.widget = widget
+        self.canal = canal
+        self.ao_concluir = ao_concluir
+        self.ao_falhar = ao_falhar
+        self.indicador = indicador
+        self.future = None
+        self._cancelada = threading.Event()
+
+    @property
+    def cancelada(self):
+        return self._cancelada.is_set()
+
+    def cancelar(self):
+        """Descarta o resultado; a consulta não começa se ainda estiver na fila"""
+        self._cancelada.set()
+        if self.future is not None:
+            self.future.cancel()
+
+
+class ExecutorTarefas:
+    """
+    Pool de threads com entrega dos resultados na thread do Tk
+
+    Tarefas submetidas com o mesmo `canal` se substituem: ao enviar uma nova
+    consulta (por exemplo, uma nova pesquisa), a anterior é cancelada e seu
+    resultado, se chegar, é descartado.
+    """
+
+    def __init__(self, max_threads=MAX_THREADS, intervalo=INTERVALO_DESPACHO):
+        self.intervalo = intervalo
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_threads, thread_name_prefix="Tarefas"
+        )
+        self._prontas = queue.Queue()
+        self._canais = {}
+        self._ativas = set()
+        self._agendado = False
+
+    def executar(
+        self,
+        widget,
+        funcao,
+        *args,
+        ao_concluir=None,
+        ao_falhar=None,
+        canal=None,
+        indicador=None,
+        **kwargs,
+    ):
+        """
+        Executa funcao(*args, **kwargs) em segundo plano
+
+        Deve ser chamado na thread do Tk.
+
+        Args:
+            widget: Widget dono da tarefa; se for destruído antes do fim, o
+                resultado é descartado
+            funcao: Função de acesso a dados (não pode mexer em widgets)
+            ao_concluir: Callback chamado na thread do Tk com o resultado
+            ao_falhar: Callback chamado na thread do Tk com a exceção
+                (padrão: mensagem de erro)
+            canal: Chave que identifica consultas que se substituem
+            indicador: Objeto com mostrar_carregando(bool), exibido enquanto
+                a tarefa roda
+
+        Returns:
+            Tarefa: Tarefa submetida (pode ser cancelada)
+        """
+        if canal is not None:
+            anterior = self._canais.get(canal)
+            if anterior is not None:
+                anterior.cancelar()
+
+        tarefa = Tarefa(widget, ao_concluir, ao_falhar, indicador, canal)
+        if canal is not None:
+            self._canais[canal] = tarefa
+
+        if indicador is not None:
+            indicador.mostrar_carregando(True)
+
+        self._ativas.add(tarefa)
+        tarefa.future = self._pool.submit(self._rodar, tarefa, funcao, args, kwargs)
+        self._agendar(widget)
+        return tarefa
+
+    def _rodar(self, tarefa, funcao, args, kwargs):
+        """Executado na thread de fundo"""
+        if tarefa.cancelada:
+            self._prontas.put((tarefa, None, None))
+            return
+
+        try:
+            resultado = funcao(*args, **kwargs)
+        except Exception as e:
+            self._prontas.put((tarefa, None, e))
+        else:
+            self._prontas.put((tarefa, resultado, None))
+
+    def _agendar(self, widget):
+        if self._agendado:
+            return
+        self._agendado = True
+        widget.after(self.intervalo, lambda: self._despachar(widget))
+
+    def _despachar(self, widget):
+        """Executado na thread do Tk: entrega os resultados prontos"""
+        self._agendado = False
+
+        while True:
+            try:
+                tarefa, resultado, erro = self._prontas.get_nowait()
+            except queue.Empty:
+                break
+
+            self._entregar(tarefa, resultado, erro)
+
+        # Tarefas canceladas antes de começar nunca chegam à fila
+        for tarefa in [t for t in self._ativas if t.future.cancelled()]:
+            self._entregar(tarefa, None, None)
+
+        if self._ativas:
+            if not self._widget_existe(widget):
+                widget = self._widget_ativo()
+            if widget is not None:
+                self._agendar(widget)
+
+    def _entregar(self, tarefa, resultado, erro):
+        if tarefa not in self._ativas:
+            return
+        self._ativas.discard(tarefa)
+
+        if tarefa.canal is not None and self._canais.get(tarefa.canal) is tarefa:
+            del self._canais[tarefa.canal]
+
+        self._finalizar(tarefa)
+
+        if tarefa.cancelada or not self._widget_existe(tarefa.widget):
+            return
+
+        if erro is not None:
+            if tarefa.ao_falhar is not None:
+                tarefa.ao_falhar(erro)
+            else:
+                from utils.ui_utils import mostrar_mensagem
+
+                print(f"Erro ao carregar dados: {erro}")
+                mostrar_mensagem("Erro", f"Erro ao carregar dados: {erro}", tipo="erro")
+        elif tarefa.ao_concluir is not None:
+            tarefa.ao_concluir(resultado)
+
+    def _finalizar(self, tarefa):
+        """Oculta o indicador, a menos que outra tarefa ativa o esteja usando"""
+        indicador = tarefa.indicador
+        if indicador is None or not self._widget_existe(indicador):
+            return
+
+        em_uso = any(outra.indicador is indicador for outra in self._ativas)
+        if not em_uso:
+            indicador.mostrar_carregando(False)
+
+    def _widget_ativo(self):
+        """Algum widget ainda existente para manter o despachante agendado"""
+        for tarefa in self._ativas:
+            if self._widget_existe(tarefa.widget):
+                return tarefa.widget
+        return None
+
+    @staticmethod
+    def _widget_existe(widget):
+        try:
+            return bool(widget.winfo_exists())
+        except Exception:
+            return False
+
+
+_executor = ExecutorTarefas()
+
+
+def executar(widget, funcao, *args, **kwargs):
+    """Atalho para ExecutorTarefas.executar no executor compartilhado"""
+    return _executor.executar(widget, funcao, *args, **kwargs)
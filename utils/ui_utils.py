@@ -2,7 +2,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import tkinter.font as tkFont
-from datetime import datetime
+
+from utils.projecao import formatar_data_br, formatar_moeda
 
 
 class Cores:
@@ -364,8 +365,10 @@ class FormularioBase(ttk.Frame):
             entrada = ttk.Entry(frame, width=40)
             entrada.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
-        # Define valor padrão se fornecido
-        if padrao and tipo not in ["opcoes", "texto_longo", "checkbox"]:
+        # Define valor padrão se fornecido (datas do banco são exibidas como DD/MM/AAAA)
+        if padrao and tipo == "data":
+            entrada.insert(0, formatar_data_br(padrao))
+        elif padrao and tipo not in ["opcoes", "texto_longo", "checkbox"]:
             entrada.insert(0, padrao)
         elif padrao and tipo == "texto_longo":
             entrada.insert("1.0", padrao)
@@ -443,7 +446,15 @@ class FormularioBase(ttk.Frame):
 
 
 class TabelaBase(ttk.Frame):
-    """Classe base para criação de tabelas"""
+    """
+    Classe base para criação de tabelas
+
+    No modo virtual (configurar_virtual) a Treeview contém apenas as linhas
+    visíveis; as demais são pedidas a um provedor conforme a rolagem.
+    """
+
+    # Acima desta quantidade de linhas, carregar() usa o modo virtual
+    LIMITE_MATERIALIZADO = 500
 
     def __init__(self, master, colunas, titulos=None):
         """
@@ -455,6 +466,16 @@ class TabelaBase(ttk.Frame):
         super().__init__(master)
         self.colunas = colunas
         self.titulos = titulos or {col: col for col in colunas}
+
+        # Estado do modo virtual
+        self._virtual = False
+        self._provedor = None
+        self._total_virtual = 0
+        self._buffer = 50
+        self._inicio = 0
+        self._cache = {}  # índice -> (id, valores na ordem das colunas)
+        self._selecionado = None
+
         self.criar_tabela()
 
     def formatar_data_br(self, data_str):
@@ -467,19 +488,7 @@ class TabelaBase(ttk.Frame):
         Returns:
             str: Data formatada no padrão brasileiro
         """
-        if not data_str:
-            return ""
-            
-        try:
-            # Se a data já estiver no formato brasileiro, retorna como está
-            if "/" in data_str:
-                return data_str
-                
-            # Converte a data para o formato brasileiro
-            data = datetime.strptime(data_str, "%Y-%m-%d %H:%M:%S")
-            return data.strftime("%d/%m/%Y %H:%M:%S")
-        except:
-            return data_str
+        return formatar_data_br(data_str)
 
     def criar_tabela(self):
         """Cria a tabela com as colunas especificadas"""
@@ -498,22 +507,57 @@ class TabelaBase(ttk.Frame):
             self.tree.column(col, minwidth=100, width=150)
 
         # Adicionar scrollbars
-        vsb = ttk.Scrollbar(
+        self.vsb = ttk.Scrollbar(
             self.frame_tabela, orient="vertical", command=self.tree.yview
         )
         hsb = ttk.Scrollbar(
             self.frame_tabela, orient="horizontal", command=self.tree.xview
         )
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self.tree.configure(yscrollcommand=self.vsb.set, xscrollcommand=hsb.set)
 
         # Posicionar elementos
         self.tree.grid(column=0, row=0, sticky="nsew")
-        vsb.grid(column=1, row=0, sticky="ns")
+        self.vsb.grid(column=1, row=0, sticky="ns")
         hsb.grid(column=0, row=1, sticky="ew")
 
         self.frame_tabela.grid_columnconfigure(0, weight=1)
         self.frame_tabela.grid_rowconfigure(0, weight=1)
 
+        # Aviso exibido sobre a tabela enquanto uma consulta está em andamento
+        self.lbl_carregando = ttk.Label(self.frame_tabela, text="Carregando...")
+
+        # Rolagem do modo virtual (sem efeito no modo normal)
+        self.tree.bind("<Configure>", self._redimensionar_virtual, add="+")
+        self.tree.bind("<MouseWheel>", self._roda_virtual, add="+")
+        self.tree.bind("<Button-4>", self._roda_virtual, add="+")
+        self.tree.bind("<Button-5>", self._roda_virtual, add="+")
+        self.tree.bind("<Up>", lambda e: self._tecla_virtual(-1), add="+")
+        self.tree.bind("<Down>", lambda e: self._tecla_virtual(1), add="+")
+        self.tree.bind("<Prior>", lambda e: self._tecla_virtual(-self._linhas_visiveis()), add="+")
+        self.tree.bind("<Next>", lambda e: self._tecla_virtual(self._linhas_visiveis()), add="+")
+
+    def mostrar_carregando(self, ativo):
+        """Exibe ou oculta o aviso de carregamento (usado por utils.tarefas)"""
+        if ativo:
+            self.lbl_carregando.place(relx=0.5, rely=0.5, anchor="center")
+            self.lbl_carregando.lift()
+            self.tree.configure(cursor="watch")
+        else:
+            self.lbl_carregando.place_forget()
+            self.tree.configure(cursor="")
+
+    def _valores_lista(self, valores):
+        """Converte os valores de uma linha para a ordem das colunas"""
+        if not isinstance(valores, dict):
+            return list(valores)
+
+        # Formatar valores especiais
+        if "data_cadastro" in valores:
+            valores = dict(valores)
+            valores["data_cadastro"] = self.formatar_data_br(valores["data_cadastro"])
+
+        return [valores.get(col, "") for col in self.colunas]
+
     def adicionar_linha(self, valores, id=None):
         """
         Adiciona uma linha na tabela
@@ -522,13 +566,8 @@ class TabelaBase(ttk.Frame):
             valores (dict): Dicionário com os valores das colunas
             id: Identificador único da linha (opcional)
         """
-        # Formatar valores especiais
-        valores_formatados = valores.copy()
-        if "data_cadastro" in valores_formatados:
-            valores_formatados["data_cadastro"] = self.formatar_data_br(valores_formatados["data_cadastro"])
-
         # Criar lista de valores na ordem das colunas
-        valores_lista = [valores_formatados.get(col, "") for col in self.colunas]
+        valores_lista = self._valores_lista(valores)
 
         # Inserir na tabela
         if id is None:
@@ -544,32 +583,260 @@ class TabelaBase(ttk.Frame):
             valores: dicionário de valores para as colunas
         """
         valores_lista = [valores.get(col, "") for col in self.colunas]
+
+        if self._virtual:
+            for indice, (id_linha, _) in self._cache.items():
+                if id_linha == str(id):
+                    self._cache[indice] = (id_linha, valores_lista)
+                    break
+            if not self.tree.exists(id):
+                return
+
         self.tree.item(id, values=valores_lista)
 
     def remover_linha(self, id):
         """Remove uma linha da tabela
 
+        No modo virtual a linha também sai dos dados do provedor, para não
+        voltar na próxima rolagem. Só linhas já carregadas (as visíveis e a
+        vizinhança) podem ser localizadas; para as demais, recarregue a tabela.
+
         Args:
             id: identificador da linha
         """
-        self.tree.delete(id)
+        if not self._virtual:
+            self.tree.delete(id)
+            return
+
+        removida = next(
+            (indice for indice, (iid, _) in self._cache.items() if iid == str(id)),
+            None,
+        )
+        if removida is None:
+            return
+
+        provedor = self._provedor
+
+        def sem_removida(inicio, quantidade):
+            if inicio + quantidade <= removida:
+                return provedor(inicio, quantidade)
+            if inicio >= removida:
+                return provedor(inicio + 1, quantidade)
+            linhas = provedor(inicio, quantidade + 1)
+            del linhas[removida - inicio:removida - inicio + 1]
+            return linhas
+
+        self._provedor = sem_removida
+        self._total_virtual -= 1
+        self._cache = {
+            indice - 1 if indice > removida else indice: linha
+            for indice, linha in self._cache.items()
+            if indice != removida
+        }
+        if self._selecionado == str(id):
+            self._selecionado = None
+        self._renderizar_virtual()
 
     def limpar(self):
         """Remove todas as linhas da tabela"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self._sair_modo_virtual()
+        # Uma única chamada ao Tk, em vez de uma por item
+        self.tree.delete(*self.tree.get_children())
+
+    def carregar(self, linhas):
+        """
+        Substitui todo o conteúdo da tabela de uma só vez
+
+        Listas maiores que LIMITE_MATERIALIZADO são exibidas no modo virtual.
+
+        Args:
+            linhas (list): Tuplas (id, valores), com os valores em dicionário
+                ou já na ordem das colunas
+        """
+        linhas = [(id, self._valores_lista(valores)) for id, valores in linhas]
+
+        if len(linhas) > self.LIMITE_MATERIALIZADO:
+            self.configurar_virtual(
+                len(linhas),
+                lambda inicio, quantidade: linhas[inicio:inicio + quantidade],
+            )
+            return
+
+        self.limpar()
+        for id, valores in linhas:
+            if id is None:
+                self.tree.insert("", tk.END, values=valores)
+            else:
+                self.tree.insert("", tk.END, iid=str(id), values=valores)
+
+    def configurar_virtual(self, total, provedor, buffer=50):
+        """
+        Ativa o modo virtual: só as linhas visíveis ficam na Treeview
+
+        Args:
+            total (int): Quantidade total de linhas
+            provedor (callable): Função (inicio, quantidade) que retorna uma
+                lista de tuplas (id, valores) a partir da linha `inicio`
+            buffer (int): Linhas buscadas além das visíveis, em cada sentido,
+                para que a rolagem não chame o provedor a cada passo
+        """
+        self.limpar()
+
+        self._virtual = True
+        self._provedor = provedor
+        self._total_virtual = total
+        self._buffer = buffer
+
+        # A barra de rolagem passa a representar o total, não os itens da Treeview
+        self.tree.configure(yscrollcommand="")
+        self.vsb.configure(command=self._rolar_virtual)
+
+        self._renderizar_virtual()
+
+    def _sair_modo_virtual(self):
+        if not self._virtual:
+            return
+
+        self._virtual = False
+        self._provedor = None
+        self._total_virtual = 0
+        self._inicio = 0
+        self._cache = {}
+        self._selecionado = None
+
+        self.vsb.configure(command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.vsb.set)
+
+    def _linhas_visiveis(self):
+        """Quantidade de linhas que cabem na área visível da Treeview"""
+        altura_linha = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        altura = self.tree.winfo_height()
+        if altura <= 1:
+            # Ainda não exibida: usa a altura configurada da Treeview
+            return int(self.tree.cget("height")) or 10
+
+        # Desconta o cabeçalho, que tem aproximadamente a altura de uma linha
+        return max(1, altura // altura_linha - 1)
+
+    def _garantir_cache(self, inicio, fim):
+        """Busca no provedor as linhas de [inicio, fim) que ainda não estão em cache"""
+        faltantes = [i for i in range(inicio, fim) if i not in self._cache]
+        if faltantes:
+            primeiro = max(0, faltantes[0] - self._buffer)
+            ultimo = min(self._total_virtual, faltantes[-1] + 1 + self._buffer)
+
+            linhas = self._provedor(primeiro, ultimo - primeiro)
+            for deslocamento, (id, valores) in enumerate(linhas):
+                indice = primeiro + deslocamento
+                iid = str(id) if id is not None else f"_linha{indice}"
+                self._cache[indice] = (iid, self._valores_lista(valores))
+
+            # Mantém em memória só a vizinhança da janela atual
+            margem = 4 * self._buffer
+            self._cache = {
+                i: linha
+                for i, linha in self._cache.items()
+                if inicio - margem <= i < fim + margem
+            }
+
+    def _renderizar_virtual(self):
+        """Substitui os itens da Treeview pelas linhas da janela atual"""
+        selecao = self.tree.selection()
+        if selecao:
+            self._selecionado = selecao[0]
+
+        visiveis = self._linhas_visiveis()
+        self._inicio = max(0, min(self._inicio, self._total_virtual - visiveis))
+        fim = min(self._total_virtual, self._inicio + visiveis + 1)
+
+        self._garantir_cache(self._inicio, fim)
+
+        self.tree.delete(*self.tree.get_children())
+        for indice in range(self._inicio, fim):
+            linha = self._cache.get(indice)
+            if linha is None:
+                # O provedor retornou menos linhas que o total informado
+                break
+            iid, valores = linha
+            self.tree.insert("", tk.END, iid=iid, values=valores)
+
+        if self._selecionado is not None and self.tree.exists(self._selecionado):
+            self.tree.selection_set(self._selecionado)
+            self.tree.focus(self._selecionado)
+
+        if self._total_virtual:
+            self.vsb.set(self._inicio / self._total_virtual, fim / self._total_virtual)
+        else:
+            self.vsb.set(0, 1)
+
+    def _rolar_virtual(self, acao, quantidade, unidade=None):
+        """Comando da barra de rolagem no modo virtual"""
+        if acao == "moveto":
+            self._inicio = int(float(quantidade) * self._total_virtual)
+        elif acao == "scroll":
+            passo = self._linhas_visiveis() if unidade == "pages" else 1
+            self._inicio += int(quantidade) * passo
+        self._renderizar_virtual()
+
+    def _roda_virtual(self, event):
+        if not self._virtual:
+            return None
+
+        passo = -3 if event.num == 4 or event.delta > 0 else 3
+        self._inicio += passo
+        self._renderizar_virtual()
+        return "break"
+
+    def _tecla_virtual(self, passo):
+        """Move a seleção pelo teclado, rolando a janela quando necessário"""
+        if not self._virtual or not self._total_virtual:
+            return None
+
+        itens = self.tree.get_children()
+        foco = self.tree.focus()
+        posicao = itens.index(foco) if foco in itens else 0
+        indice = max(0, min(self._total_virtual - 1, self._inicio + posicao + passo))
+
+        visiveis = self._linhas_visiveis()
+        if indice < self._inicio:
+            self._inicio = indice
+        elif indice >= self._inicio + visiveis:
+            self._inicio = indice - visiveis + 1
+
+        self._selecionado = None
+        self._renderizar_virtual()
+
+        linha = self._cache.get(indice)
+        if linha is not None:
+            self._selecionado = linha[0]
+            self.tree.selection_set(linha[0])
+            self.tree.focus(linha[0])
+            self.tree.see(linha[0])
+        return "break"
+
+    def _redimensionar_virtual(self, event=None):
+        if self._virtual:
+            self._renderizar_virtual()
 
     def obter_selecao(self):
         """Retorna o id da linha selecionada ou None"""
         selecao = self.tree.selection()
         if selecao:
             return selecao[0]
+        if self._virtual:
+            # A linha selecionada pode estar fora da janela exibida
+            return self._selecionado
         return None
 
     def obter_valores_selecao(self):
         """Retorna os valores da linha selecionada ou None"""
         id = self.obter_selecao()
         if id:
+            if self._virtual and not self.tree.exists(id):
+                for id_linha, valores in self._cache.values():
+                    if id_linha == id:
+                        return dict(zip(self.colunas, valores))
+                return None
             valores = self.tree.item(id, "values")
             return dict(zip(self.colunas, valores))
         return None
@@ -875,9 +1142,7 @@ def formatar_valor_brl(entry, event=None):
     valor = float(texto) / 100
 
     # Formata como moeda brasileira
-    texto_formatado = (
-        f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-    )
+    texto_formatado = formatar_moeda(valor)
 
     # Atualiza o campo
     entry.delete(0, tk.END)
@@ -959,6 +1224,6 @@ def formatar_valor_brl_numerico(valor):
     try:
         if valor is None:
             return ""
-        return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        return formatar_moeda(float(valor))
     except:
         return ""
@@ -2,6 +2,8 @@
 import re
 from datetime import datetime
 
+from utils.projecao import formatar_moeda
+
 
 def validar_cpf(cpf):
     """
@@ -205,15 +207,7 @@ def formatar_valor_monetario(valor, simbolo="R$"):
     Returns:
         str: Valor formatado
     """
-    try:
-        valor_float = float(valor)
-        return (
-            f"{simbolo} {valor_float:,.2f}".replace(",", "X")
-            .replace(".", ",")
-            .replace("X", ".")
-        )
-    except (ValueError, TypeError):
-        return f"{simbolo} 0,00"
+    return formatar_moeda(valor, simbolo)
 
 
 def calcular_total_contrato(
@@ -2,7 +2,7 @@
 import tkinter as tk
 from tkinter import ttk
 
-from controllers.contrato_pf_controller import buscar_contrato_por_id, atualizar_total_contrato
+from controllers.contrato_pf_controller import buscar_contrato_por_id
 from controllers.aditivo_pf_controller import adicionar_aditivo
 from utils.ui_utils import (
     FormularioBase,
@@ -804,9 +804,6 @@ class AditivoPFForm(ttk.Frame):
                 responsavel=None,  # Campo removido
             )
 
-            # Atualizar o total do contrato
-            atualizar_total_contrato(self.id_contrato)
-
             mostrar_mensagem(
                 "Sucesso", "Aditivo adicionado com sucesso!", tipo="sucesso"
             )
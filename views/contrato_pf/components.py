@@ -1,9 +1,14 @@
 # Components for ContratoPF views
 import tkinter as tk
 from tkinter import ttk
-from datetime import datetime
 
-from controllers.pessoa_fisica_controller import listar_pessoas, buscar_pessoa_por_id
+from controllers.pessoa_fisica_controller import (
+    buscar_pessoa_por_id,
+    carregar_indice_pessoas,
+    pesquisar_pessoas,
+    pessoas_indexadas,
+    rotulo_pessoa,
+)
 from controllers.produto_pf_controller import (
     listar_produtos_por_contrato,
     buscar_produto_por_id,
@@ -14,7 +19,6 @@ from controllers.aditivo_pf_controller import (
     adicionar_aditivo,
     excluir_aditivo,
 )
-from controllers.contrato_pf_controller import atualizar_total_contrato
 from utils.ui_utils import (
     FormularioBase,
     TabelaBase,
@@ -25,10 +29,78 @@ from utils.ui_utils import (
     validar_numerico,
     converter_valor_brl_para_float,
 )
+from utils.projecao import (
+    Projecao,
+    STATUS_PRODUTO,
+    TIPO_ADITIVO,
+    formatar_data_br,
+    formatar_moeda,
+    ou,
+    rotulo,
+)
+from utils.tarefas import executar
+
+# Campos buscados para as tabelas de produtos e aditivos do contrato
+CAMPOS_TABELA_PRODUTOS = (
+    "id",
+    "numero",
+    "titulo",
+    "data_programada",
+    "data_entrega",
+    "status",
+    "valor",
+)
+CAMPOS_TABELA_ADITIVOS = (
+    "id",
+    "tipo_aditivo",
+    "data_entrada",
+    "vigencia_final",
+    "nova_remuneracao",
+    "valor_total_aditivo",
+)
+
+# Linhas da tabela de produtos do contrato, na ordem de CAMPOS_TABELA_PRODUTOS
+PROJECAO_PRODUTOS = Projecao(
+    [
+        ("id", None),
+        ("numero", None),
+        ("titulo", None),
+        ("data_programada", formatar_data_br),
+        ("data_entrega", ou("-", formatar_data_br)),
+        ("status", rotulo(STATUS_PRODUTO)),
+        ("valor", formatar_moeda),
+    ]
+)
+
+# Linhas da tabela de aditivos do contrato, na ordem de CAMPOS_TABELA_ADITIVOS
+PROJECAO_ADITIVOS = Projecao(
+    [
+        ("id", None),
+        ("tipo_aditivo", rotulo(TIPO_ADITIVO)),
+        ("data_entrada", formatar_data_br),
+        ("vigencia_final", formatar_data_br),
+        ("nova_remuneracao", ou("", formatar_moeda)),
+        ("valor_total_aditivo", ou("", formatar_moeda)),
+    ]
+)
+
+
+# Teclas que não alteram o texto do combobox (não disparam nova pesquisa)
+_TECLAS_NAVEGACAO = {"Up", "Down", "Left", "Right", "Return", "Escape", "Tab"}
+
+
+def _pesquisar_rotulos(texto):
+    """Pesquisa no índice de pessoas e retorna (rótulo, id) de cada resultado"""
+    return [(rotulo_pessoa(id_pessoa), id_pessoa) for id_pessoa in pesquisar_pessoas(texto)]
 
 
 class PessoaFisicaSelector:
-    """Componente para seleção de pessoa física"""
+    """
+    Componente para seleção de pessoa física
+
+    As opções do combobox são pesquisadas no índice de pessoas enquanto o
+    usuário digita, em vez de carregar todas as pessoas de uma vez.
+    """
 
     def __init__(self, master, initial_value=None, initial_id=None):
         """
@@ -38,7 +110,7 @@ class PessoaFisicaSelector:
             initial_id: ID inicial da pessoa selecionada
         """
         self.master = master
-        self.pessoas_map = {}  # Mapeamento de nomes para IDs
+        self.pessoas_map = {}  # Mapeamento de rótulos (nome e CPF) para IDs
 
         # Frame para a seleção da pessoa
         self.frame = ttk.Frame(master)
@@ -76,6 +148,7 @@ class PessoaFisicaSelector:
 
         # Vincular evento de seleção do combobox
         self.pessoa_combobox.bind("<<ComboboxSelected>>", self.selecionar_pessoa)
+        self.pessoa_combobox.bind("<KeyRelease>", self.pesquisar_pessoas)
 
         # Mostrar os dados da pessoa selecionada
         self.frame_info = ttk.Frame(master)
@@ -106,26 +179,37 @@ class PessoaFisicaSelector:
             self.pessoa_combobox.set(valor)
 
     def carregar_pessoas(self):
-        """Carrega a lista de pessoas físicas para o combobox"""
-        try:
-            pessoas = listar_pessoas()
-            nomes_pessoas = [pessoa[1] for pessoa in pessoas]
-            self.pessoa_combobox["values"] = nomes_pessoas
-
-            # Mapeamento de nomes para IDs
-            self.pessoas_map = {pessoa[1]: pessoa[0] for pessoa in pessoas}
-            
-            # Se houver um ID selecionado, garantir que o nome correspondente esteja nas opções
-            id_selecionado = self.id_pessoa_selecionada.get()
-            if id_selecionado:
-                pessoa = buscar_pessoa_por_id(id_selecionado)
-                if pessoa and pessoa[1] not in nomes_pessoas:
-                    nomes_atualizados = nomes_pessoas + [pessoa[1]]
-                    self.pessoa_combobox["values"] = nomes_atualizados
-                    self.pessoas_map[pessoa[1]] = pessoa[0]
-
-        except Exception as e:
-            print(f"Erro ao carregar pessoas: {e}")
+        """Prepara o combobox e carrega o índice de pessoas em segundo plano"""
+        # Se houver um ID selecionado, garantir que o nome correspondente esteja nas opções
+        id_selecionado = self.id_pessoa_selecionada.get()
+        if id_selecionado:
+            nome = self.pessoa_var.get()
+            if nome:
+                self.pessoas_map[nome] = int(id_selecionado)
+                self.pessoa_combobox["values"] = [nome]
+
+        executar(self.frame, carregar_indice_pessoas)
+
+    def pesquisar_pessoas(self, event=None):
+        """Atualiza as opções do combobox conforme o texto digitado"""
+        if event is not None and event.keysym in _TECLAS_NAVEGACAO:
+            return
+
+        texto = self.pessoa_var.get()
+        if texto in self.pessoas_map:
+            return
+
+        executar(
+            self.frame,
+            _pesquisar_rotulos,
+            texto,
+            ao_concluir=self._exibir_opcoes,
+            canal=("pesquisa_pessoa", id(self)),
+        )
+
+    def _exibir_opcoes(self, resultados):
+        self.pessoas_map = dict(resultados)
+        self.pessoa_combobox["values"] = [rotulo for rotulo, _ in resultados]
 
     def buscar_pessoa(self):
         """Abre uma janela para buscar pessoa física"""
@@ -170,28 +254,21 @@ class PessoaFisicaSelector:
 
         # Função para carregar dados na tabela
         def carregar_dados(filtro=None):
-            tabela.limpar()
-
-            pessoas = listar_pessoas()
-
-            for pessoa in pessoas:
-                # Se tiver filtro, verifica se pessoa contém o texto do filtro
-                if filtro:
-                    texto_filtro = filtro.lower()
-                    texto_pessoa = " ".join(
-                        str(campo).lower() for campo in pessoa if campo
-                    )
-                    if texto_filtro not in texto_pessoa:
-                        continue
+            # Sem filtro, lista todas; com filtro, os primeiros resultados do índice
+            ids = pesquisar_pessoas(filtro or "", limite=200 if filtro else None)
 
+            linhas = []
+            for pessoa in pessoas_indexadas(ids):
                 valores = {
-                    "id": pessoa[0],
-                    "nome_completo": pessoa[1],
-                    "cpf": pessoa[2] or "",
-                    "email": pessoa[3] or "",
-                    "telefone": pessoa[4] or "",
+                    "id": pessoa.id,
+                    "nome_completo": pessoa.nome_completo,
+                    "cpf": pessoa.cpf or "",
+                    "email": pessoa.email or "",
+                    "telefone": pessoa.telefone or "",
                 }
-                tabela.adicionar_linha(valores, str(pessoa[0]))
+                linhas.append((pessoa.id, valores))
+
+            tabela.carregar(linhas)
 
         # Carregar dados iniciais
         carregar_dados()
@@ -216,8 +293,10 @@ class PessoaFisicaSelector:
                 pessoa = buscar_pessoa_por_id(id_selecao)
                 if pessoa:
                     # Atualizar o combobox e o campo oculto
-                    self.pessoa_var.set(pessoa[1])
-                    self.id_pessoa_selecionada.set(str(pessoa[0]))
+                    rotulo = rotulo_pessoa(pessoa.id) or pessoa.nome_completo
+                    self.pessoas_map[rotulo] = pessoa.id
+                    self.pessoa_var.set(rotulo)
+                    self.id_pessoa_selecionada.set(str(pessoa.id))
                     self.atualizar_info_pessoa(pessoa)
                     janela.destroy()
             else:
@@ -236,10 +315,10 @@ class PessoaFisicaSelector:
 
     def selecionar_pessoa(self, event=None):
         """Callback quando uma pessoa é selecionada no combobox"""
-        nome_pessoa = self.pessoa_var.get()
+        rotulo = self.pessoa_var.get()
 
-        if nome_pessoa in self.pessoas_map:
-            id_pessoa = self.pessoas_map[nome_pessoa]
+        if rotulo in self.pessoas_map:
+            id_pessoa = self.pessoas_map[rotulo]
             self.id_pessoa_selecionada.set(str(id_pessoa))
 
             # Buscar dados completos da pessoa
@@ -255,8 +334,8 @@ class PessoaFisicaSelector:
             )
             return
 
-        cpf = pessoa[2] or "Não informado"
-        email = pessoa[3] or "Não informado"
+        cpf = pessoa.cpf or "Não informado"
+        email = pessoa.email or "Não informado"
 
         info_text = f"CPF: {cpf} | E-mail: {email}"
         self.info_pessoa_label.config(text=info_text, foreground="black")
@@ -368,70 +447,9 @@ class ProdutosTable:
         self.tabela.limpar()
 
         # Obter produtos do contrato
-        produtos = listar_produtos_por_contrato(self.id_contrato)
-
-        for produto in produtos:
-            # Extrair dados do produto
-            id_produto = produto[0]
-            numero = produto[2]
-            titulo = produto[7]
-            data_programada = produto[3]
-            data_entrega = produto[5]
-            status = produto[6]
-            valor = produto[8]
-
-            # Formatar datas
-            data_programada_formatada = data_programada
-            if data_programada:
-                try:
-                    data_programada_formatada = datetime.strptime(
-                        data_programada, "%Y-%m-%d"
-                    ).strftime("%d/%m/%Y")
-                except ValueError:
-                    pass
-
-            data_entrega_formatada = data_entrega or "-"
-            if data_entrega:
-                try:
-                    data_entrega_formatada = datetime.strptime(
-                        data_entrega, "%Y-%m-%d"
-                    ).strftime("%d/%m/%Y")
-                except ValueError:
-                    pass
-
-            # Formatar valor monetário
-            try:
-                if valor:
-                    valor_formatado = (
-                        f"R$ {float(valor):,.2f}".replace(",", "X")
-                        .replace(".", ",")
-                        .replace("X", ".")
-                    )
-                else:
-                    valor_formatado = "R$ 0,00"
-            except (ValueError, TypeError):
-                valor_formatado = "R$ 0,00"
-
-            # Traduzir status para exibição
-            status_map = {
-                "programado": "Programado",
-                "em_execucao": "Em Execução",
-                "entregue": "Entregue",
-                "cancelado": "Cancelado",
-            }
-            status_exibicao = status_map.get(status, status)
-
-            # Criar um dicionário com os valores do produto
-            valores = {
-                "id": id_produto,
-                "numero": numero,
-                "titulo": titulo,
-                "data_programada": data_programada_formatada,
-                "data_entrega": data_entrega_formatada,
-                "status": status_exibicao,
-                "valor": valor_formatado,
-            }
+        produtos = listar_produtos_por_contrato(self.id_contrato, CAMPOS_TABELA_PRODUTOS)
 
+        for id_produto, valores in PROJECAO_PRODUTOS.linhas(produtos):
             self.tabela.adicionar_linha(valores, str(id_produto))
 
     def adicionar_produto(self):
@@ -695,63 +713,9 @@ class AditivosTable:
         self.tabela.limpar()
 
         # Obter aditivos do contrato
-        aditivos = listar_aditivos_por_contrato(self.id_contrato)
-
-        for aditivo in aditivos:
-            # Extrair dados do aditivo
-            id_aditivo = aditivo[0]
-            tipo_aditivo = aditivo[2]
-            data_entrada = aditivo[4]
-            nova_vigencia_final = aditivo[14]
-            nova_remuneracao = aditivo[17]
-            valor_total_aditivo = aditivo[20]
-
-            # Formatar valores monetários
-            try:
-                if nova_remuneracao:
-                    nova_remuneracao_formatada = (
-                        f"R$ {float(nova_remuneracao):,.2f}".replace(",", "X")
-                        .replace(".", ",")
-                        .replace("X", ".")
-                    )
-                else:
-                    nova_remuneracao_formatada = ""
-
-                if valor_total_aditivo:
-                    valor_total_formatado = (
-                        f"R$ {float(valor_total_aditivo):,.2f}".replace(",", "X")
-                        .replace(".", ",")
-                        .replace("X", ".")
-                    )
-                else:
-                    valor_total_formatado = ""
-            except (ValueError, TypeError):
-                nova_remuneracao_formatada = ""
-                valor_total_formatado = ""
-
-            # Traduzir tipo de aditivo para exibição
-            tipo_aditivo_exibicao = {
-                "prorrogacao": "TEMPO",
-                "reajuste": "VALOR", 
-                "ambos": "TEMPO E VALOR",
-                "tempo": "TEMPO",
-                "valor": "VALOR",
-                "tempo e valor": "TEMPO E VALOR",
-                "TEMPO": "TEMPO",
-                "VALOR": "VALOR",
-                "TEMPO E VALOR": "TEMPO E VALOR",
-            }.get(tipo_aditivo, tipo_aditivo)
-
-            # Criar um dicionário com os valores do aditivo
-            valores = {
-                "id": id_aditivo,
-                "tipo_aditivo": tipo_aditivo_exibicao,
-                "data_entrada": data_entrada,
-                "nova_vigencia_final": nova_vigencia_final,
-                "nova_remuneracao": nova_remuneracao_formatada,
-                "valor_total_aditivo": valor_total_formatado,
-            }
+        aditivos = listar_aditivos_por_contrato(self.id_contrato, CAMPOS_TABELA_ADITIVOS)
 
+        for id_aditivo, valores in PROJECAO_ADITIVOS.linhas(aditivos):
             self.tabela.adicionar_linha(valores, str(id_aditivo))
 
     def adicionar_aditivo(self):
@@ -834,11 +798,9 @@ class AditivosTable:
             "Confirmação", "Deseja realmente excluir este aditivo?", tipo="pergunta"
         ):
             try:
+                # O total do contrato é recalculado na mesma transação
                 excluir_aditivo(id_selecao)
-                
-                # Atualizar o total do contrato após exclusão do aditivo
-                atualizar_total_contrato(self.id_contrato)
-                
+
                 mostrar_mensagem(
                     "Sucesso", "Aditivo excluído com sucesso!", tipo="sucesso"
                 )
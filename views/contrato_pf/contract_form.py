@@ -6,6 +6,7 @@ from datetime import datetime
 from controllers.contrato_pf_controller import (
     adicionar_contrato,
     buscar_contrato_por_id,
+    buscar_observacoes_contrato,
     editar_contrato,
     atualizar_total_contrato,
 )
@@ -16,7 +17,7 @@ from controllers.demanda_controller import (
     editar_demanda,
     listar_demandas,
 )
-from models.db_manager_access import get_lists_data
+from models.database import get_lists_data
 from utils.ui_utils import (
     FormularioBase,
     criar_botao,
@@ -28,6 +29,7 @@ from utils.ui_utils import (
     validar_numerico,
     converter_valor_brl_para_float,
 )
+from utils.projecao import formatar_data_br
 from utils.validator import (
     validar_data,
     validar_periodo,
@@ -476,7 +478,13 @@ class ContratoPFForm(ttk.Frame):
         )
 
         # Observações
-        observacoes_padrao = self.contrato[23] if self.contrato and len(self.contrato) > 23 else ""
+        observacoes_padrao = ""
+        if self.contrato:
+            if hasattr(self.contrato, "observacoes"):
+                observacoes_padrao = self.contrato.observacoes or ""
+            else:
+                # Registro parcial de uma listagem: o campo memo é buscado agora
+                observacoes_padrao = buscar_observacoes_contrato(self.id_contrato)
         self.form_contrato.adicionar_campo(
             "observacoes", "Observações", tipo="texto_longo", padrao=observacoes_padrao
         )
@@ -528,7 +536,7 @@ class ContratoPFForm(ttk.Frame):
                 # Atualizar outros campos relevantes
                 self.form_contrato.campos["vigencia_final"]["widget"].delete(0, tk.END)
                 self.form_contrato.campos["vigencia_final"]["widget"].insert(
-                    0, contrato[15]
+                    0, formatar_data_br(contrato[15])
                 )
 
                 self.form_contrato.campos["meses"]["widget"].delete(0, tk.END)
@@ -555,7 +563,7 @@ class ContratoPFForm(ttk.Frame):
             
             self.form_contrato.campos["vigencia_final"]["widget"].delete(0, tk.END)
             self.form_contrato.campos["vigencia_final"]["widget"].insert(
-                0, nova_vigencia_final
+                0, formatar_data_br(nova_vigencia_final)
             )
 
             # Atualizar meses (somar os novos meses)
@@ -3,7 +3,7 @@ import tkinter as tk
 from tkinter import ttk
 
 from controllers.contrato_pf_controller import (
-    listar_contratos,
+    ConsultaContratos,
     buscar_contrato_por_id,
     excluir_contrato,
 )
@@ -14,9 +14,42 @@ from utils.ui_utils import (
     Estilos,
     formatar_data,
     formatar_valor_brl,
+    converter_valor_brl_para_float,
 )
+from utils.projecao import Projecao, STATUS_CONTRATO, formatar_data_br, formatar_moeda, ou, rotulo
+from utils.tarefas import executar
 from views.contrato_pf.contract_form import ContratoPFForm
 
+# Quantidade de contratos buscados por página da listagem
+TAMANHO_PAGINA = 200
+
+# Campos buscados para a listagem (as demais colunas, como observacoes, só
+# são carregadas quando o contrato é aberto)
+CAMPOS_GRADE = (
+    "id",
+    "nome_completo",
+    "modalidade",
+    "numero_contrato",
+    "vigencia_inicial",
+    "vigencia_final",
+    "status_contrato",
+    "total_contrato",
+)
+
+# Linhas da grade formatadas (mantidas entre recargas e páginas)
+PROJECAO_GRADE = Projecao(
+    [
+        ("id", None),
+        ("nome_completo", ou("N/A")),
+        ("modalidade", None),
+        ("numero_contrato", None),
+        ("vigencia_inicial", formatar_data_br),
+        ("vigencia_final", formatar_data_br),
+        ("status_contrato", rotulo(STATUS_CONTRATO)),
+        ("total_contrato", formatar_moeda),
+    ]
+)
+
 
 class ContratoPFView:
     """Tela principal de listagem e gestão de contratos de pessoa física"""
@@ -253,6 +286,25 @@ class ContratoPFView:
             self.tabela.tree.column(col, anchor=tk.W)  # W = West (esquerda)
             self.tabela.tree.heading(col, anchor=tk.W)  # Alinha os cabeçalhos à esquerda também
 
+        # Navegação entre páginas
+        frame_paginacao = ttk.Frame(self.frame)
+        frame_paginacao.pack(fill=tk.X, pady=(5, 0))
+
+        self.btn_proxima = ttk.Button(
+            frame_paginacao, text="Próxima ▶", command=self.proxima_pagina
+        )
+        self.btn_proxima.pack(side=tk.RIGHT)
+        self.lbl_pagina = ttk.Label(frame_paginacao, text="")
+        self.lbl_pagina.pack(side=tk.RIGHT, padx=10)
+        self.btn_anterior = ttk.Button(
+            frame_paginacao, text="◀ Anterior", command=self.pagina_anterior
+        )
+        self.btn_anterior.pack(side=tk.RIGHT)
+
+        self.consulta = ConsultaContratos()
+        self.pagina_atual = 0
+        self.total_contratos = 0
+
         # Frame de botões de ação
         frame_acoes = ttk.Frame(self.frame)
         frame_acoes.pack(fill=tk.X, pady=(10, 0))
@@ -275,105 +327,83 @@ class ContratoPFView:
 
     def carregar_dados(self, filtro=None, filtro_modalidade=None, filtro_status=None, 
                       filtro_vigencia_inicial=None, filtro_vigencia_final=None, filtro_valor_minimo=None):
-        """Carrega os dados dos contratos na tabela"""
-        self.tabela.limpar()
-
-        # Obter contratos e ordenar por ID
-        contratos = listar_contratos()
-        contratos.sort(key=lambda x: int(x[0]) if x[0] else 0)  # Ordenar por ID (primeiro campo)
-
-        for contrato in contratos:
-            # Aplicar filtros
-            if filtro:
-                texto_filtro = filtro.lower()
-                texto_contrato = " ".join(
-                    str(campo).lower() for campo in contrato if campo
-                )
-                if texto_filtro not in texto_contrato:
-                    continue
-
-            if filtro_modalidade and filtro_modalidade != "Todos":
-                if contrato[11] != filtro_modalidade:
-                    continue
-
-            if filtro_status and filtro_status != "Todos":
-                if contrato[17] != filtro_status:
-                    continue
-                    
-            # Filtro por vigência inicial
-            if filtro_vigencia_inicial:
-                try:
-                    # Converter para formato de comparação (YYYY-MM-DD)
-                    partes = filtro_vigencia_inicial.split('/')
-                    if len(partes) == 3:
-                        data_filtro = f"{partes[2]}-{partes[1]}-{partes[0]}"
-                        if contrato[14] < data_filtro:
-                            continue
-                except (ValueError, IndexError):
-                    pass
-                    
-            # Filtro por vigência final
-            if filtro_vigencia_final:
-                try:
-                    # Converter para formato de comparação (YYYY-MM-DD)
-                    partes = filtro_vigencia_final.split('/')
-                    if len(partes) == 3:
-                        data_filtro = f"{partes[2]}-{partes[1]}-{partes[0]}"
-                        if contrato[15] > data_filtro:
-                            continue
-                except (ValueError, IndexError):
-                    pass
-                    
-            # Filtro por valor mínimo
-            if filtro_valor_minimo:
-                try:
-                    # Converter valor do filtro para float
-                    from utils.ui_utils import converter_valor_brl_para_float
-                    valor_min = converter_valor_brl_para_float(filtro_valor_minimo)
-                    valor_contrato = float(contrato[22]) if contrato[22] else 0.0
-                    if valor_contrato < valor_min:
-                        continue
-                except (ValueError, TypeError):
-                    pass
-
-            # Status para exibição
-            status_map = {
-                "pendente_assinatura": "Pendente Assinatura",
-                "cancelado": "Cancelado",
-                "concluido": "Concluído",
-                "em_tramitacao": "Em Tramitação",
-                "aguardando_autorizacao": "Aguardando Autorização",
-                "nao_autorizado": "Não Autorizado",
-                "rescindido": "Rescindido",
-                "vigente": "Vigente",
-            }
-            status_exibicao = status_map.get(contrato[17], contrato[17])
-
-            # Formatação de valor monetário
-            try:
-                valor_total = float(contrato[22]) if contrato[22] else 0.0
-                valor_formatado = (
-                    f"R$ {valor_total:,.2f}".replace(",", "X")
-                    .replace(".", ",")
-                    .replace("X", ".")
-                )
-            except (ValueError, TypeError):
-                valor_formatado = "R$ 0,00"
-
-            # Nome da pessoa física
-            nome_pessoa = contrato[-1] if len(contrato) > 23 else "N/A"
-
-            valores = {
-                "id": contrato[0],
-                "nome_completo": nome_pessoa,
-                "modalidade": contrato[11],
-                "numero_contrato": contrato[13],
-                "vigencia_inicial": contrato[14],
-                "vigencia_final": contrato[15],
-                "status_contrato": status_exibicao,
-                "total_contrato": valor_formatado,
-            }
-            self.tabela.adicionar_linha(valores, str(contrato[0]))
+        """Aplica os filtros no banco e exibe a primeira página de contratos"""
+        valor_minimo = None
+        if filtro_valor_minimo:
+            valor_minimo = converter_valor_brl_para_float(filtro_valor_minimo)
+
+        try:
+            self.consulta = (
+                ConsultaContratos()
+                .texto(filtro)
+                .modalidade(filtro_modalidade)
+                .status(filtro_status)
+                .vigencia(filtro_vigencia_inicial, filtro_vigencia_final)
+                .valor_minimo(valor_minimo)
+            )
+        except ValueError as e:
+            mostrar_mensagem("Filtro inválido", str(e), tipo="erro")
+            return
+        # Sem total conhecido, a próxima busca também conta os contratos
+        self.total_contratos = None
+        self._buscar_pagina(0)
+
+    def exibir_pagina(self, numero):
+        """Busca e exibe somente a página solicitada da consulta atual"""
+        self._buscar_pagina(numero)
+
+    def _buscar_pagina(self, numero):
+        """Busca a página em segundo plano; pesquisas mais novas descartam as anteriores"""
+        executar(
+            self.frame,
+            self._consultar_pagina,
+            self.consulta,
+            numero,
+            self.total_contratos,
+            ao_concluir=self._exibir_resultado,
+            canal=(id(self), "listagem"),
+            indicador=self.tabela,
+        )
+
+    @staticmethod
+    def _consultar_pagina(consulta, numero, total=None):
+        """Executado fora da thread do Tk: consulta e formata a página"""
+        if total is None:
+            total = consulta.contar()
+
+        total_paginas = max(1, -(-total // TAMANHO_PAGINA))
+        numero = min(max(0, numero), total_paginas - 1)
+
+        linhas = PROJECAO_GRADE.linhas(
+            consulta.pagina(numero, TAMANHO_PAGINA, CAMPOS_GRADE)
+        )
+
+        return total, numero, total_paginas, linhas
+
+    def _exibir_resultado(self, resultado):
+        """Exibe na tabela a página consultada por _consultar_pagina"""
+        self.total_contratos, self.pagina_atual, total_paginas, linhas = resultado
+
+        self.tabela.carregar(linhas)
+
+        self.lbl_pagina.config(
+            text=f"Página {self.pagina_atual + 1} de {total_paginas} "
+            f"({self.total_contratos} contratos)"
+        )
+        self.btn_anterior.config(
+            state=tk.NORMAL if self.pagina_atual > 0 else tk.DISABLED
+        )
+        self.btn_proxima.config(
+            state=tk.NORMAL if self.pagina_atual < total_paginas - 1 else tk.DISABLED
+        )
+
+    def proxima_pagina(self):
+        """Exibe a próxima página de contratos"""
+        self.exibir_pagina(self.pagina_atual + 1)
+
+    def pagina_anterior(self):
+        """Exibe a página anterior de contratos"""
+        self.exibir_pagina(self.pagina_atual - 1)
 
     def toggle_filtros(self):
         """Mostra ou oculta o painel de filtros"""
@@ -568,7 +598,7 @@ class ContratoPFView:
             mostrar_mensagem("Erro", "Contrato não encontrado.", tipo="erro")
             return
 
-        modalidade = contrato[11]
+        modalidade = contrato.modalidade
         if modalidade == "CLT":
             mostrar_mensagem(
                 "Atenção",
@@ -582,7 +612,7 @@ class ContratoPFView:
 
         # Criar uma janela modal para visualização
         janela = tk.Toplevel(self.master)
-        janela.title(f"Produtos do Contrato {contrato[13]}")
+        janela.title(f"Produtos do Contrato {contrato.numero_contrato}")
         janela.transient(self.master)
         janela.grab_set()
 
@@ -3,12 +3,40 @@ import tkinter as tk
 from tkinter import ttk
 from utils.ui_utils import Estilos, TabelaBase, Menu, mostrar_mensagem, criar_botao
 from utils.session import Session
-from controllers.pessoa_fisica_controller import listar_pessoas
-from controllers.contrato_pf_controller import listar_contratos
-from controllers.produto_pf_controller import listar_produtos
-from views.pessoa_fisica_view import PessoaFisicaView
-from views.contrato_pf_view import ContratoPFView
-from views.produto_pf_view import ProdutoPFView
+from utils.logger import descarregar_logs
+from utils.tarefas import executar
+from utils.projecao import (
+    Projecao,
+    STATUS_CONTRATO,
+    STATUS_PRODUTO,
+    formatar_moeda,
+    ou,
+    rotulo,
+)
+from controllers.dashboard_controller import obter_estatisticas
+
+# Linhas das tabelas de registros recentes (tuplas de obter_estatisticas)
+PROJECAO_CONTRATOS_RECENTES = Projecao(
+    [
+        (0, None),
+        (1, ou("N/A")),
+        (2, None),
+        (3, rotulo(STATUS_CONTRATO)),
+        (4, formatar_moeda),
+    ],
+    chave=0,
+)
+
+PROJECAO_PRODUTOS_RECENTES = Projecao(
+    [
+        (0, None),
+        (1, ou("N/A")),
+        (2, None),
+        (3, rotulo(STATUS_PRODUTO)),
+        (4, formatar_moeda),
+    ],
+    chave=0,
+)
 
 
 class DashboardView:
@@ -88,26 +116,60 @@ class DashboardView:
         frame_resumo = ttk.Frame(self.frame_conteudo)
         frame_resumo.pack(fill=tk.X, pady=(0, 20))
 
-        # Cria cards com estatísticas
-        try:
-            # Frame para organizar os cards em linha
-            frame_cards = ttk.Frame(frame_resumo)
-            frame_cards.pack(fill=tk.X)
-            
-            self.criar_card_estatistica(
-                frame_cards, "Pessoas Físicas", len(listar_pessoas()), "#388E3C"
-            )
-            self.criar_card_estatistica(
-                frame_cards, "Contratos", len(listar_contratos()), "#1976D2"
-            )
-            self.criar_card_estatistica(
-                frame_cards, "Produtos", len(listar_produtos()), "#D32F2F"
-            )
-        except Exception as e:
+        # Frame para organizar os cards em linha
+        frame_cards = ttk.Frame(frame_resumo)
+        frame_cards.pack(fill=tk.X)
+
+        # As estatísticas são consultadas em segundo plano
+        lbl_carregando = ttk.Label(frame_cards, text="Carregando...")
+        lbl_carregando.pack(anchor=tk.W)
+
+        def exibir(estatisticas):
+            lbl_carregando.destroy()
+            self.exibir_estatisticas(frame_cards, estatisticas)
+
+        def falhar(e):
             # Se as tabelas ainda não existirem ou houver outro erro
-            self.criar_card_estatistica(frame_cards, "Pessoas Físicas", 0, "#388E3C")
-            self.criar_card_estatistica(frame_cards, "Contratos", 0, "#1976D2")
-            self.criar_card_estatistica(frame_cards, "Produtos", 0, "#D32F2F")
+            print(f"Erro ao obter estatísticas: {e}")
+            exibir(
+                {
+                    "pessoas": 0,
+                    "contratos": 0,
+                    "produtos": 0,
+                    "contratos_recentes": [],
+                    "produtos_recentes": [],
+                }
+            )
+
+        executar(
+            frame_cards,
+            obter_estatisticas,
+            ao_concluir=exibir,
+            ao_falhar=falhar,
+            canal=(id(self), "estatisticas"),
+        )
+
+        # Informações do usuário logado
+        usuario = Session.get_user()
+        if usuario:
+            frame_usuario = ttk.Frame(self.frame_conteudo)
+            frame_usuario.pack(side=tk.BOTTOM, fill=tk.X, pady=(10, 0))
+
+            ttk.Label(
+                frame_usuario, text=f"Usuário logado: {usuario[1]}", style="TLabel"
+            ).pack(side=tk.RIGHT)
+
+    def exibir_estatisticas(self, frame_cards, estatisticas):
+        """Preenche os cards e as tabelas de atividade recente do dashboard"""
+        self.criar_card_estatistica(
+            frame_cards, "Pessoas Físicas", estatisticas["pessoas"], "#388E3C"
+        )
+        self.criar_card_estatistica(
+            frame_cards, "Contratos", estatisticas["contratos"], "#1976D2"
+        )
+        self.criar_card_estatistica(
+            frame_cards, "Produtos", estatisticas["produtos"], "#D32F2F"
+        )
 
         # Frame com tabelas de atividade recente
         frame_atividade = ttk.Frame(self.frame_conteudo)
@@ -121,20 +183,14 @@ class DashboardView:
         frame_col2.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(5, 0))
 
         # Contratos recentes
-        self.criar_tabela_contratos_recentes(frame_col1)
+        self.criar_tabela_contratos_recentes(
+            frame_col1, estatisticas["contratos_recentes"]
+        )
 
         # Produtos recentes
-        self.criar_tabela_produtos_recentes(frame_col2)
-
-        # Informações do usuário logado
-        usuario = Session.get_user()
-        if usuario:
-            frame_usuario = ttk.Frame(self.frame_conteudo)
-            frame_usuario.pack(fill=tk.X, pady=(10, 0))
-
-            ttk.Label(
-                frame_usuario, text=f"Usuário logado: {usuario[1]}", style="TLabel"
-            ).pack(side=tk.RIGHT)
+        self.criar_tabela_produtos_recentes(
+            frame_col2, estatisticas["produtos_recentes"]
+        )
 
     def criar_card_estatistica(self, master, titulo, valor, cor):
         """Cria um card com estatística"""
@@ -151,8 +207,14 @@ class DashboardView:
             pady=(5, 15)
         )
 
-    def criar_tabela_contratos_recentes(self, master):
-        """Cria tabela com contratos recentes"""
+    def criar_tabela_contratos_recentes(self, master, contratos):
+        """
+        Cria tabela com contratos recentes
+
+        Args:
+            master: widget pai
+            contratos (list): Tuplas (id, nome, modalidade, status, total)
+        """
         frame = ttk.Frame(master)
         frame.pack(fill=tk.BOTH, expand=True)
 
@@ -179,57 +241,21 @@ class DashboardView:
         tabela = TabelaBase(frame, colunas, titulos)
         tabela.pack(fill=tk.BOTH, expand=True)
 
-        try:
-            # Carregar dados (limitado aos 5 mais recentes)
-            contratos = listar_contratos()
-            for i, contrato in enumerate(
-                contratos[:5] if len(contratos) >= 5 else contratos
-            ):
-                try:
-                    # Formatar valor monetário
-                    valor_total = float(contrato[22]) if contrato[22] else 0.0
-                    valor_formatado = (
-                        f"R$ {valor_total:,.2f}".replace(",", "X")
-                        .replace(".", ",")
-                        .replace("X", ".")
-                    )
-
-                    # Extrair nome da pessoa
-                    nome_completo = contrato[-1] if len(contrato) > 23 else "N/A"
-
-                    # Status para exibição
-                    status_map = {
-                        "pendente_assinatura": "Pendente Assinatura",
-                        "cancelado": "Cancelado",
-                        "concluido": "Concluído",
-                        "em_tramitacao": "Em Tramitação",
-                        "aguardando_autorizacao": "Aguardando Autorização",
-                        "nao_autorizado": "Não Autorizado",
-                        "rescindido": "Rescindido",
-                        "vigente": "Vigente",
-                    }
-                    status_exibicao = status_map.get(contrato[17], contrato[17])
-
-                    valores = {
-                        "id": contrato[0],
-                        "nome_completo": nome_completo,
-                        "modalidade": contrato[11],
-                        "status_contrato": status_exibicao,
-                        "total_contrato": valor_formatado,
-                    }
-                    tabela.adicionar_linha(valores)
-                except Exception as e:
-                    print(f"Erro ao processar contrato: {e}")
-        except Exception as e:
-            print(f"Erro ao listar contratos: {e}")
+        tabela.carregar(PROJECAO_CONTRATOS_RECENTES.linhas(contratos))
 
         # Botão para ver todos
         criar_botao(frame, "Ver Todos", self.mostrar_contratos, "Secundario").pack(
             anchor=tk.E, pady=(5, 0)
         )
 
-    def criar_tabela_produtos_recentes(self, master):
-        """Cria tabela com produtos recentes"""
+    def criar_tabela_produtos_recentes(self, master, produtos):
+        """
+        Cria tabela com produtos recentes
+
+        Args:
+            master: widget pai
+            produtos (list): Tuplas (id, nome do contratado, título, status, valor)
+        """
         frame = ttk.Frame(master)
         frame.pack(fill=tk.BOTH, expand=True)
 
@@ -250,51 +276,7 @@ class DashboardView:
         tabela = TabelaBase(frame, colunas, titulos)
         tabela.pack(fill=tk.BOTH, expand=True)
 
-        try:
-            # Carregar dados (limitado aos 5 mais recentes)
-            produtos = listar_produtos()
-            for i, produto in enumerate(
-                produtos[:5] if len(produtos) >= 5 else produtos
-            ):
-                try:
-                    # Formatar valor monetário
-                    try:
-                        # Valor está no índice 8 (9ª coluna da tabela produto_pf)
-                        valor = float(produto[8]) if produto[8] else 0.0
-                        valor_formatado = (
-                            f"R$ {valor:,.2f}".replace(",", "X")
-                            .replace(".", ",")
-                            .replace("X", ".")
-                        )
-                    except (ValueError, IndexError):
-                        # Se não conseguir converter para float ou o índice não existir
-                        valor_formatado = "R$ 0,00"
-                        print(f"Erro ao processar valor do produto: {produto}")
-
-                    # Extrair nome da pessoa
-                    nome_completo = produto[-1] if len(produto) > 8 else "N/A"
-
-                    # Status para exibição
-                    status_map = {
-                        "programado": "Programado",
-                        "em_execucao": "Em Execução",
-                        "entregue": "Entregue",
-                        "cancelado": "Cancelado",
-                    }
-                    status_exibicao = status_map.get(produto[6], produto[6])
-
-                    valores = {
-                        "id": produto[0],
-                        "nome_completo": nome_completo,
-                        "titulo": produto[7],  # Título está no índice 7 (8ª coluna da tabela produto_pf)
-                        "status": status_exibicao,
-                        "valor": valor_formatado,
-                    }
-                    tabela.adicionar_linha(valores)
-                except Exception as e:
-                    print(f"Erro ao processar produto: {e}")
-        except Exception as e:
-            print(f"Erro ao listar produtos: {e}")
+        tabela.carregar(PROJECAO_PRODUTOS_RECENTES.linhas(produtos))
 
         # Botão para ver produtos através dos contratos
         criar_botao(frame, "Ver Contratos", self.mostrar_contratos, "Secundario").pack(
@@ -303,16 +285,23 @@ class DashboardView:
 
     def mostrar_pessoas_fisicas(self):
         """Abre a tela de gestão de pessoas físicas"""
+        # Os módulos das telas são importados na primeira navegação
+        from views.pessoa_fisica_view import PessoaFisicaView
+
         self.limpar_conteudo()
         PessoaFisicaView(self.frame_conteudo)
 
     def mostrar_contratos(self):
         """Abre a tela de gestão de contratos"""
+        from views.contrato_pf_view import ContratoPFView
+
         self.limpar_conteudo()
         ContratoPFView(self.frame_conteudo)
 
     def mostrar_produtos(self):
         """Abre a tela de gestão de produtos"""
+        from views.produto_pf_view import ProdutoPFView
+
         self.limpar_conteudo()
         ProdutoPFView(self.frame_conteudo)
 
@@ -332,4 +321,6 @@ class DashboardView:
             "Confirmação", "Deseja realmente sair da aplicação?", tipo="pergunta"
         ):
             Session.logout()
+            # Grava os logs ainda na fila antes de fechar
+            descarregar_logs()
             self.master.destroy()
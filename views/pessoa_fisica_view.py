@@ -11,6 +11,8 @@ from controllers.pessoa_fisica_controller import (
     excluir_pessoa_fisica,
 )
 from controllers.contrato_pf_controller import listar_contratos_por_pessoa
+from utils.projecao import Projecao, STATUS_CONTRATO, formatar_data_br, formatar_moeda, rotulo
+from utils.tarefas import executar
 from utils.ui_utils import (
     FormularioBase,
     TabelaBase,
@@ -22,6 +24,19 @@ from utils.ui_utils import (
     validar_numerico,
 )
 
+# Linhas da tabela de contratos de uma pessoa
+PROJECAO_CONTRATOS_PESSOA = Projecao(
+    [
+        ("id", None),
+        ("modalidade", None),
+        ("numero_contrato", None),
+        ("vigencia_inicial", formatar_data_br),
+        ("vigencia_final", formatar_data_br),
+        ("status_contrato", rotulo(STATUS_CONTRATO)),
+        ("total_contrato", formatar_moeda),
+    ]
+)
+
 
 class PessoaFisicaForm(FormularioBase):
     """Formulário para cadastro e edição de pessoas físicas"""
@@ -205,24 +220,38 @@ class PessoaFisicaView:
         self.carregar_dados()
 
     def carregar_dados(self, filtro=None):
-        """Carrega os dados das pessoas na tabela"""
-        self.tabela.limpar()
+        """Carrega os dados das pessoas na tabela (consulta em segundo plano)"""
+        executar(
+            self.frame,
+            self._buscar_pessoas,
+            filtro,
+            ao_concluir=self.tabela.carregar,
+            canal=(id(self), "listagem"),
+            indicador=self.tabela,
+        )
 
+    @staticmethod
+    def _buscar_pessoas(filtro=None):
+        """Executado fora da thread do Tk: consulta as pessoas e monta as linhas"""
         if filtro:
             pessoas = buscar_pessoas(filtro)
         else:
             pessoas = listar_pessoas()
 
-        for pessoa in pessoas:
-            valores = {
-                "id": pessoa[0],
-                "nome_completo": pessoa[1],
-                "cpf": pessoa[2] or "",
-                "email": pessoa[3] or "",
-                "telefone": pessoa[4] or "",
-                "data_cadastro": pessoa[5] or "",
-            }
-            self.tabela.adicionar_linha(valores, str(pessoa[0]))
+        return [
+            (
+                pessoa[0],
+                {
+                    "id": pessoa[0],
+                    "nome_completo": pessoa[1],
+                    "cpf": pessoa[2] or "",
+                    "email": pessoa[3] or "",
+                    "telefone": pessoa[4] or "",
+                    "data_cadastro": pessoa[5] or "",
+                },
+            )
+            for pessoa in pessoas
+        ]
 
     def pesquisar(self):
         """Filtra as pessoas conforme o texto de pesquisa"""
@@ -374,8 +403,19 @@ class PessoaFisicaView:
             mostrar_mensagem("Erro", "Pessoa não encontrada.", tipo="erro")
             return
 
+        # Colunas da tabela de contratos (também a projeção buscada)
+        colunas = [
+            "id",
+            "modalidade",
+            "numero_contrato",
+            "vigencia_inicial",
+            "vigencia_final",
+            "status_contrato",
+            "total_contrato",
+        ]
+
         # Busca os contratos da pessoa
-        contratos = listar_contratos_por_pessoa(id_selecao)
+        contratos = listar_contratos_por_pessoa(id_selecao, colunas)
 
         # Cria uma janela modal para exibir os contratos
         janela = tk.Toplevel(self.master)
@@ -407,16 +447,6 @@ class PessoaFisicaView:
             )
             return
 
-        # Tabela de contratos
-        colunas = [
-            "id",
-            "modalidade",
-            "numero_contrato",
-            "vigencia_inicial",
-            "vigencia_final",
-            "status_contrato",
-            "total_contrato",
-        ]
         titulos = {
             "id": "ID",
             "modalidade": "Modalidade",
@@ -431,41 +461,7 @@ class PessoaFisicaView:
         tabela.pack(fill=tk.BOTH, expand=True)
 
         # Carregar os contratos na tabela
-        for contrato in contratos:
-            # Status para exibição
-            status_map = {
-                "pendente_assinatura": "Pendente Assinatura",
-                "cancelado": "Cancelado",
-                "concluido": "Concluído",
-                "em_tramitacao": "Em Tramitação",
-                "aguardando_autorizacao": "Aguardando Autorização",
-                "nao_autorizado": "Não Autorizado",
-                "rescindido": "Rescindido",
-                "vigente": "Vigente",
-            }
-            status_exibicao = status_map.get(contrato[17], contrato[17])
-
-            # Formatação de valor monetário
-            try:
-                valor_total = float(contrato[22]) if contrato[22] else 0.0
-                valor_formatado = (
-                    f"R$ {valor_total:,.2f}".replace(",", "X")
-                    .replace(".", ",")
-                    .replace("X", ".")
-                )
-            except (ValueError, TypeError):
-                valor_formatado = "R$ 0,00"
-
-            valores = {
-                "id": contrato[0],
-                "modalidade": contrato[11],
-                "numero_contrato": contrato[13],
-                "vigencia_inicial": contrato[14],
-                "vigencia_final": contrato[15],
-                "status_contrato": status_exibicao,
-                "total_contrato": valor_formatado,
-            }
-            tabela.adicionar_linha(valores, str(contrato[0]))
+        tabela.carregar(PROJECAO_CONTRATOS_PESSOA.linhas(contratos))
 
         # Botão para fechar
         criar_botao(frame, "Fechar", janela.destroy, "Primario", 15).pack(
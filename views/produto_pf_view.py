@@ -13,8 +13,19 @@ from controllers.produto_pf_controller import (
     excluir_produto,
     obter_proximo_numero_produto,
     obter_instrumentos,
+    validar_periodo,
 )
 from controllers.contrato_pf_controller import listar_contratos, buscar_contrato_por_id
+from utils.projecao import (
+    Projecao,
+    STATUS_CONTRATO,
+    STATUS_PRODUTO,
+    formatar_data_br,
+    formatar_moeda,
+    ou,
+    rotulo,
+)
+from utils.tarefas import executar
 from utils.ui_utils import (
     FormularioBase,
     TabelaBase,
@@ -28,6 +39,55 @@ from utils.ui_utils import (
     converter_valor_brl_para_float,
 )
 
+# Campos buscados para a listagem de produtos (projeção de listar_produtos);
+# os três últimos não são exibidos, mas entram na pesquisa por texto
+CAMPOS_GRADE_PRODUTOS = (
+    "id",
+    "id_contrato",
+    "numero",
+    "titulo",
+    "data_programada",
+    "data_entrega",
+    "status",
+    "valor",
+    "instrumento",
+    "numero_contrato",
+    "nome_completo",
+)
+
+# Campos de contrato usados na seleção do contrato do produto
+CAMPOS_SELECAO_CONTRATO = (
+    "id",
+    "nome_completo",
+    "modalidade",
+    "numero_contrato",
+    "status_contrato",
+)
+
+# Linhas formatadas da listagem de produtos e da seleção de contrato
+PROJECAO_GRADE_PRODUTOS = Projecao(
+    [
+        ("id", None),
+        ("id_contrato", None),
+        ("numero", None),
+        ("titulo", None),
+        ("data_programada", formatar_data_br),
+        ("data_entrega", ou("-", formatar_data_br)),
+        ("status", rotulo(STATUS_PRODUTO)),
+        ("valor", formatar_moeda),
+    ]
+)
+
+PROJECAO_SELECAO_CONTRATO = Projecao(
+    [
+        ("id", None),
+        ("nome_completo", None),
+        ("modalidade", None),
+        ("numero_contrato", None),
+        ("status_contrato", rotulo(STATUS_CONTRATO)),
+    ]
+)
+
 
 class ProdutoPFForm(FormularioBase):
     """Formulário para cadastro e edição de produtos de contratos PF"""
@@ -192,18 +252,11 @@ class ProdutoPFForm(FormularioBase):
 
         # Status do produto
         status_opcoes = ["programado", "em_execucao", "entregue", "cancelado"]
-        status_map = {
-            "programado": "Programado",
-            "em_execucao": "Em Execução",
-            "entregue": "Entregue",
-            "cancelado": "Cancelado",
-        }
-
-        status_exibicao = [status_map.get(status, status) for status in status_opcoes]
+        status_exibicao = [STATUS_PRODUTO.get(status, status) for status in status_opcoes]
 
         # Status padrão
         status_padrao = (
-            status_map.get(produto[6], "Programado") if produto else "Programado"
+            STATUS_PRODUTO.get(produto[6], "Programado") if produto else "Programado"
         )
 
         self.adicionar_campo(
@@ -217,7 +270,7 @@ class ProdutoPFForm(FormularioBase):
 
         # Mapear status de exibição de volta para valores reais
         self.status_map_reverso = {
-            exibicao: real for real, exibicao in status_map.items()
+            exibicao: real for real, exibicao in STATUS_PRODUTO.items()
         }
 
         self.adicionar_campo(
@@ -257,13 +310,13 @@ class ProdutoPFForm(FormularioBase):
     def carregar_contratos(self):
         """Carrega a lista de contratos para o combobox"""
         try:
-            contratos = listar_contratos()
+            contratos = listar_contratos(CAMPOS_SELECAO_CONTRATO)
 
             # Filtrar apenas contratos de modalidade elegível para produtos
             contratos_filtrados = []
             for contrato in contratos:
-                modalidade = contrato[11]
-                status_contrato = contrato[17]
+                modalidade = contrato.modalidade
+                status_contrato = contrato.status_contrato
                 # Adicionar verificação de status ativo
                 if modalidade in ["BOLSA", "PRODUTO", "RPA"] and status_contrato in [
                     "vigente",
@@ -274,8 +327,8 @@ class ProdutoPFForm(FormularioBase):
             # Formatar para exibição
             contratos_exibicao = []
             for contrato in contratos_filtrados:
-                numero_contrato = contrato[13]
-                nome_pessoa = contrato[-1]
+                numero_contrato = contrato.numero_contrato
+                nome_pessoa = contrato.nome_completo
                 contratos_exibicao.append(f"{numero_contrato} - {nome_pessoa}")
 
             self.contrato_combobox["values"] = contratos_exibicao
@@ -283,7 +336,7 @@ class ProdutoPFForm(FormularioBase):
             # Mapeamento para recuperar o ID
             self.contratos_map = {}
             for i, contrato in enumerate(contratos_filtrados):
-                self.contratos_map[contratos_exibicao[i]] = contrato[0]
+                self.contratos_map[contratos_exibicao[i]] = contrato.id
 
         except Exception as e:
             print(f"Erro ao carregar contratos: {e}")
@@ -338,14 +391,13 @@ class ProdutoPFForm(FormularioBase):
 
         # Função para carregar dados na tabela
         def carregar_dados(filtro=None):
-            tabela.limpar()
-
             try:
-                contratos = listar_contratos()
+                contratos = listar_contratos(CAMPOS_SELECAO_CONTRATO)
 
+                linhas = []
                 for contrato in contratos:
                     # Filtrar apenas contratos de modalidade elegível para produtos
-                    modalidade = contrato[11]
+                    modalidade = contrato.modalidade
                     if modalidade not in ["BOLSA", "PRODUTO", "RPA"]:
                         continue
 
@@ -358,30 +410,9 @@ class ProdutoPFForm(FormularioBase):
                         if texto_filtro not in texto_contrato:
                             continue
 
-                    # Status para exibição
-                    status_map = {
-                        "pendente_assinatura": "Pendente Assinatura",
-                        "cancelado": "Cancelado",
-                        "concluido": "Concluído",
-                        "em_tramitacao": "Em Tramitação",
-                        "aguardando_autorizacao": "Aguardando Autorização",
-                        "nao_autorizado": "Não Autorizado",
-                        "rescindido": "Rescindido",
-                        "vigente": "Vigente",
-                    }
-                    status_exibicao = status_map.get(contrato[17], contrato[17])
-
-                    # Nome da pessoa física
-                    nome_pessoa = contrato[-1]
-
-                    valores = {
-                        "id": contrato[0],
-                        "nome_completo": nome_pessoa,
-                        "modalidade": contrato[11],
-                        "numero_contrato": contrato[13],
-                        "status_contrato": status_exibicao,
-                    }
-                    tabela.adicionar_linha(valores, str(contrato[0]))
+                    linhas.append(PROJECAO_SELECAO_CONTRATO.linha(contrato))
+
+                tabela.carregar(linhas)
             except Exception as e:
                 print(f"Erro ao carregar dados: {e}")
                 mostrar_mensagem("Erro", f"Erro ao carregar dados: {e}", tipo="erro")
@@ -461,18 +492,7 @@ class ProdutoPFForm(FormularioBase):
 
         modalidade = contrato[11]
 
-        # Status para exibição
-        status_map = {
-            "pendente_assinatura": "Pendente Assinatura",
-            "cancelado": "Cancelado",
-            "concluido": "Concluído",
-            "em_tramitacao": "Em Tramitação",
-            "aguardando_autorizacao": "Aguardando Autorização",
-            "nao_autorizado": "Não Autorizado",
-            "rescindido": "Rescindido",
-            "vigente": "Vigente",
-        }
-        status_exibicao = status_map.get(contrato[17], contrato[17])
+        status_exibicao = STATUS_CONTRATO.get(contrato[17], contrato[17])
 
         info_text = f"Modalidade: {modalidade} | Status: {status_exibicao} | Vigência: {contrato[14]} a {contrato[15]}"
         self.info_contrato_label.config(text=info_text, foreground="black")
@@ -566,9 +586,11 @@ class ProdutoPFForm(FormularioBase):
                     "Sucesso", "Produto atualizado com sucesso!", tipo="sucesso"
                 )
             else:  # Novo cadastro
+                # O número exibido é só uma prévia; o definitivo é reservado
+                # ao gravar, para que dois cadastros simultâneos não o repitam
                 adicionar_produto(
                     self.id_contrato_selecionado,
-                    valores["numero"],
+                    None,
                     valores["data_programada"],
                     valores["instrumento"],
                     valores["data_entrega"],
@@ -761,120 +783,79 @@ class ProdutoPFView:
     def carregar_dados(
         self, filtro=None, filtro_status=None, data_inicio=None, data_fim=None
     ):
-        """Carrega os dados dos produtos na tabela"""
+        """Carrega os dados dos produtos na tabela (consulta em segundo plano)"""
         self.tabela.limpar()
 
-        try:
-            # Carregar produtos (filtrados por contrato se especificado)
-            if self.id_contrato:
-                produtos = listar_produtos_por_contrato(self.id_contrato)
-            else:
-                produtos = listar_produtos()
+        executar(
+            self.frame,
+            self._buscar_produtos,
+            self.id_contrato,
+            filtro,
+            filtro_status,
+            data_inicio,
+            data_fim,
+            ao_concluir=self._exibir_produtos,
+            canal=(id(self), "listagem"),
+            indicador=self.tabela,
+        )
 
-            for produto in produtos:
-                # Aplicar filtros de texto
-                if filtro:
-                    texto_filtro = filtro.lower()
-                    texto_produto = " ".join(
-                        str(campo).lower() for campo in produto if campo
-                    )
-                    if texto_filtro not in texto_produto:
-                        continue
+    @staticmethod
+    def _buscar_produtos(
+        id_contrato, filtro=None, filtro_status=None, data_inicio=None, data_fim=None
+    ):
+        """Executado fora da thread do Tk: consulta e filtra os produtos"""
+        # Carregar produtos (filtrados por contrato se especificado); o
+        # período da data programada é filtrado no banco
+        periodo = (data_inicio, data_fim) if data_inicio or data_fim else None
+        if id_contrato:
+            produtos = listar_produtos_por_contrato(
+                id_contrato, CAMPOS_GRADE_PRODUTOS, programada=periodo
+            )
+        else:
+            produtos = listar_produtos(CAMPOS_GRADE_PRODUTOS, programada=periodo)
+
+        produtos_filtrados = []
+        for produto in produtos:
+            # Aplicar filtros de texto
+            if filtro:
+                texto_filtro = filtro.lower()
+                texto_produto = " ".join(
+                    str(campo).lower() for campo in produto if campo
+                )
+                if texto_filtro not in texto_produto:
+                    continue
 
-                # Status para exibição
-                status_map = {
-                    "programado": "Programado",
-                    "em_execucao": "Em Execução",
-                    "entregue": "Entregue",
-                    "cancelado": "Cancelado",
-                }
-                status_exibicao = status_map.get(produto[5], produto[5])
-
-                # Filtrar por status
-                if filtro_status and filtro_status != "Todos":
-                    if status_exibicao != filtro_status:
-                        continue
+            # Filtrar por status
+            if filtro_status and filtro_status != "Todos":
+                status_exibicao = STATUS_PRODUTO.get(
+                    produto.status, produto.status
+                )
+                if status_exibicao != filtro_status:
+                    continue
+
+            produtos_filtrados.append(produto)
+
+        return produtos_filtrados
+
+    def _exibir_produtos(self, produtos_filtrados):
+        """Exibe os produtos retornados por _buscar_produtos"""
+        # Só as linhas visíveis são formatadas e inseridas na Treeview
+        self.tabela.configurar_virtual(
+            len(produtos_filtrados),
+            lambda inicio, quantidade: [
+                self._linha_produto(produto)
+                for produto in produtos_filtrados[inicio:inicio + quantidade]
+            ],
+        )
 
-                # Filtrar por data
-                if data_inicio or data_fim:
-                    try:
-                        data_produto = (
-                            datetime.strptime(produto[3], "%Y-%m-%d").date()
-                            if produto[3]
-                            else None
-                        )
-                        if data_produto:
-                            if data_inicio:
-                                data_ini = datetime.strptime(
-                                    data_inicio, "%d/%m/%Y"
-                                ).date()
-                                if data_produto < data_ini:
-                                    continue
-                            if data_fim:
-                                data_final = datetime.strptime(
-                                    data_fim, "%d/%m/%Y"
-                                ).date()
-                                if data_produto > data_final:
-                                    continue
-                    except ValueError:
-                        # Se houver erro na conversão de data, ignora o filtro de data
-                        pass
-
-                # Formatação de valor monetário
-                try:
-                    valor = float(produto[7]) if produto[7] else 0.0
-                    valor_formatado = (
-                        f"R$ {valor:,.2f}".replace(",", "X")
-                        .replace(".", ",")
-                        .replace("X", ".")
-                    )
-                except (ValueError, TypeError):
-                    valor_formatado = "R$ 0,00"
-
-                # Formatação de data
-                data_programada_formatada = produto[3]
-                if produto[3]:
-                    try:
-                        data_programada_formatada = datetime.strptime(
-                            produto[3], "%Y-%m-%d"
-                        ).strftime("%d/%m/%Y")
-                    except ValueError:
-                        pass
-
-                data_entrega_formatada = produto[4] or "-"
-                if produto[4]:
-                    try:
-                        data_entrega_formatada = datetime.strptime(
-                            produto[4], "%Y-%m-%d"
-                        ).strftime("%d/%m/%Y")
-                    except ValueError:
-                        pass
-
-                valores = {
-                    "id": produto[0],
-                    "id_contrato": produto[1],
-                    "numero": produto[2],
-                    "titulo": produto[6],
-                    "data_programada": data_programada_formatada,
-                    "data_entrega": data_entrega_formatada,
-                    "status": status_exibicao,
-                    "valor": valor_formatado,
-                }
-                self.tabela.adicionar_linha(valores, str(produto[0]))
-        except Exception as e:
-            print(f"Erro ao carregar dados: {e}")
-            mostrar_mensagem("Erro", f"Erro ao carregar dados: {e}", tipo="erro")
+    @staticmethod
+    def _linha_produto(produto):
+        """Formata um produto para exibição na tabela"""
+        return PROJECAO_GRADE_PRODUTOS.linha(produto)
 
     def pesquisar(self):
         """Filtra os produtos conforme o texto de pesquisa"""
-        texto = self.pesquisa_entry.get().strip()
-        status = (
-            self.filtro_status.get() if self.filtro_status.get() != "Todos" else None
-        )
-        data_inicio = self.data_inicio_entry.get().strip() or None
-        data_fim = self.data_fim_entry.get().strip() or None
-
-        self.carregar_dados(texto, status, data_inicio, data_fim)
+        self.aplicar_filtros()
 
     def limpar_pesquisa(self):
         """Limpa os campos de pesquisa e recarrega todos os dados"""
@@ -893,6 +874,14 @@ class ProdutoPFView:
         data_inicio = self.data_inicio_entry.get().strip() or None
         data_fim = self.data_fim_entry.get().strip() or None
 
+        # As datas são conferidas aqui, na thread do Tk: um erro na consulta
+        # em segundo plano deixaria só a tabela vazia
+        try:
+            validar_periodo(data_inicio, data_fim)
+        except ValueError as e:
+            mostrar_mensagem("Filtro inválido", str(e), tipo="erro")
+            return
+
         self.carregar_dados(texto, status, data_inicio, data_fim)
 
     def ver_todos(self):